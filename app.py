@@ -1,49 +1,295 @@
 # app.py
 
 import os
-import json
+import threading
+import time
 
+import pandas as pd
 import streamlit as st
-from dotenv import load_dotenv
-import google.generativeai as genai
 
-from util import (
-    extract_text_from_uploaded_file,
+from screener import metrics
+from screener.batch import rank_resumes
+from screener.cascade import Cascade
+from screener.cache import MISSING, CacheStats, LRUCache
+from screener.clients import current_backend, get_model
+from screener.config import MODEL_NAME, get_api_key
+from screener.dedupe import NearDuplicateIndex
+from screener.guardrails import GUARDRAILS_VERSION
+from screener.jobs import CANCELLED, DONE, FAILED, JobManager, run_sections_job
+from screener.llm_prompts import DEFAULT_DEPTH, DEPTHS, PROMPT_VERSION, depth_sections, prompt_version
+from screener.pipeline import ModelOutputError, finalize_section, iter_raw_sections
+from screener.results import ScreenResult
+from screener.segments import SEGMENT_CACHE, keyword_segments, segment_resume
+from screener.usage import TokenUsage
+from screener.util import (
+    extract_text_from_bytes,
     compute_ats_keyword_analysis,
+    content_hash,
 )
-from guardrails import apply_guardrails
-from llm_prompts import SYSTEM_PROMPT
+from screener.workers import set_page_pool, shared_pool
 
 
 # =========================
-# 1. Environment + Model
+# 1. Environment
 # =========================
 
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
+# The screening core configures Gemini lazily; fail fast here so the UI
+# reports a missing key before anyone uploads files.
+if current_backend() == "gemini" and not get_api_key():
     raise RuntimeError("GEMINI_API_KEY not found in environment. Check your .env file.")
 
-genai.configure(api_key=GEMINI_API_KEY)
 
-MODEL_NAME = "gemini-3-flash-preview"
+@st.cache_resource(show_spinner=False)
+def shared_model(model_name: str, backend: str):
+    """
+    One model client per server process, shared by every session and rerun.
+    The core's registry returns the same object to pipeline calls.
+    """
+    return get_model(model_name, backend)
+
+
+@st.cache_resource(show_spinner=False)
+def metrics_server(port: int):
+    """
+    Prometheus /metrics for this server process (stage latencies, model
+    calls, cache hit rates), when SCREENER_METRICS_PORT is set.
+    """
+    return metrics.start_metrics_server(port)
+
+
+if os.getenv("SCREENER_METRICS_PORT"):
+    metrics_server(int(os.environ["SCREENER_METRICS_PORT"]))
 
 
 # =========================
-# 2. Streamlit UI
+# 2. Stage Caches
+# =========================
+#
+# Every widget interaction reruns this script. Each stage of the Analyze flow
+# is memoized by content hashes (plus prompt/guardrail versions for model
+# output), so reruns and repeated views never redo work. All caches are
+# bounded and shared by every session of this server process.
+
+@st.cache_resource(show_spinner=False)
+def stage_caches() -> dict:
+    caches = {
+        "extract": CacheStats(),
+        "ats": CacheStats(),
+        "model": LRUCache(max_entries=256),
+        "guardrails": LRUCache(max_entries=256),
+        "segments": SEGMENT_CACHE,
+    }
+    metrics.REGISTRY.register_collector("app_caches", "Stage cache counters.", lambda: metrics.cache_samples(caches))
+    return caches
+
+
+# Set to False by a cached function body, which only runs on a miss.
+# Streamlit runs each session's script on its own thread.
+_stage_hit = threading.local()
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _cached_extract(file_hash: str, mime_type: str, _data: bytes) -> str:
+    _stage_hit.value = False
+    with metrics.span("extract"):
+        return extract_text_from_bytes(_data, mime_type)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_ats(jd_hash: str, resume_hash: str, fuzzy: bool, _jd_text: str, _resume_text: str) -> dict:
+    _stage_hit.value = False
+    with metrics.span("ats"):
+        ats = compute_ats_keyword_analysis(_jd_text, _resume_text, fuzzy)
+    ats["keyword_segments"] = keyword_segments(ats["resume_keywords"], segment_resume(_resume_text))
+    return ats
+
+
+def extract_uploaded(uploaded_file) -> str:
+    data = uploaded_file.getvalue()
+    _stage_hit.value = True
+    text = _cached_extract(content_hash(data), uploaded_file.type, data)
+    stage_caches()["extract"].record(_stage_hit.value)
+    return text
+
+
+def ats_analysis(jd_text: str, resume_text: str, fuzzy: bool = False) -> dict:
+    _stage_hit.value = True
+    ats = _cached_ats(content_hash(jd_text), content_hash(resume_text), fuzzy, jd_text, resume_text)
+    stage_caches()["ats"].record(_stage_hit.value)
+    return ats
+
+
+def iter_cached_sections(
+    caches: dict,
+    jd_text: str,
+    resume_text: str,
+    fanout: bool,
+    usage=None,
+    focused=False,
+    depth=DEFAULT_DEPTH,
+    raw_outputs=None,
+):
+    """
+    Same contract as pipeline.iter_sections, served from the stage caches
+    where possible. Only sections without a cached model output are sent to
+    the model (and counted in usage). Safe to run on a job worker thread:
+    the caches are passed in rather than looked up through Streamlit.
+
+    Guarded outputs are cached as compact ScreenResult objects and yielded
+    as read-only views, which the render functions read like dicts.
+    raw_outputs, if given, collects each section's model output before
+    guardrails, so it can be guarded again for a near-duplicate resume.
+    """
+    base_key = (
+        content_hash(jd_text),
+        content_hash(resume_text),
+        fanout,
+        prompt_version(focused, depth),
+        MODEL_NAME,
+        current_backend(),
+    )
+
+    def finalized(section: str, raw_output: dict) -> dict:
+        key = base_key + (section, GUARDRAILS_VERSION)
+        result = caches["guardrails"].get(key)
+        if result is MISSING:
+            result = ScreenResult.from_dict(finalize_section(jd_text, resume_text, section, raw_output))
+            caches["guardrails"].put(key, result)
+        return result.view()
+
+    pending = []
+    for section in depth_sections(depth):
+        raw_output = caches["model"].get(base_key + (section,))
+        if raw_output is MISSING:
+            pending.append(section)
+        else:
+            if raw_outputs is not None:
+                raw_outputs[section] = raw_output
+            yield section, finalized(section, raw_output), None
+
+    if not pending:
+        return
+
+    for section, raw_output, error in iter_raw_sections(
+        jd_text, resume_text, fanout=fanout, sections=pending, usage=usage, focused=focused, depth=depth
+    ):
+        if error is not None:
+            yield section, None, error
+            continue
+        caches["model"].put(base_key + (section,), raw_output)
+        if raw_outputs is not None:
+            raw_outputs[section] = raw_output
+        yield section, finalized(section, raw_output), None
+
+
+@st.cache_resource(show_spinner=False)
+def job_manager() -> JobManager:
+    """
+    One background worker pool per server process. Sessions keep their own
+    job ids in st.session_state["job_ids"].
+    """
+    return JobManager(max_workers=4)
+
+
+def submit_analysis(jd_text: str, resume_text: str, label: str, ats: dict):
+    """
+    Queues an LLM analysis on the shared job pool and returns the Job.
+    """
+    usage = TokenUsage()
+    raw_outputs = {}
+    return job_manager().submit(
+        run_sections_job,
+        iter_cached_sections(
+            stage_caches(),
+            jd_text,
+            resume_text,
+            fanout_mode,
+            usage=usage,
+            focused=focused_mode,
+            depth=depth_mode,
+            raw_outputs=raw_outputs,
+        ),
+        label=label,
+        total_steps=len(depth_sections(depth_mode)),
+        meta={
+            "ats": ats,
+            "fanout": fanout_mode,
+            "focused": focused_mode,
+            "depth": depth_mode,
+            "usage": usage,
+            "raw_outputs": raw_outputs,
+        },
+    )
+
+
+def extraction_pool():
+    """
+    Process pool for batch extraction + ATS scoring, shared by all sessions.
+    Started on first use (workers.shared_pool), which also replaces a pool
+    that broke; it is also the page pool for uploaded PDFs of many pages.
+    """
+    return shared_pool(os.cpu_count())
+
+
+# Nothing starts until a batch is ranked or a large PDF is split.
+set_page_pool(extraction_pool, os.cpu_count() or 1)
+
+
+@st.cache_data(max_entries=16, show_spinner="Extracting and scoring resumes…")
+def _cached_ranking(jd_hash: str, file_hashes: tuple, fuzzy: bool, _jd_text: str, _documents: list) -> list:
+    return rank_resumes(_jd_text, _documents, executor=extraction_pool(), fuzzy_ats=fuzzy)
+
+
+# =========================
+# 3. Streamlit UI
 # =========================
 
 st.set_page_config(page_title="Candidate Screener", layout="wide")
 st.title("Candidate Screener")
 
+shared_model(MODEL_NAME, current_backend())
+
+fanout_mode = st.sidebar.checkbox(
+    "Fan-out mode",
+    value=False,
+    help="Split the analysis into concurrent section calls and show each section as soon as it finishes.",
+)
+
+focused_mode = st.sidebar.checkbox(
+    "Focused prompts",
+    value=False,
+    help="Send each analysis prompt only the resume sections it needs (no contact details; "
+    "rewrite suggestions see only summary and experience). Uses fewer input tokens.",
+)
+
+depth_mode = st.sidebar.selectbox(
+    "Analysis depth",
+    DEPTHS,
+    index=DEPTHS.index(DEFAULT_DEPTH),
+    help="triage: scores only. standard: scores, summary, recommendation, risk flags, gaps and questions. "
+    "full: everything, including rewrite suggestions. Shallower tiers use fewer output tokens.",
+)
+
+fuzzy_mode = st.sidebar.checkbox(
+    "Fuzzy keyword matching",
+    value=False,
+    help="Count stems, abbreviations and typos of JD keywords as ATS matches "
+    "(\"managed\" for \"management\", \"k8s\" for \"kubernetes\").",
+)
+
+batch_mode = st.sidebar.checkbox(
+    "Batch mode (multiple resumes)",
+    value=False,
+    help="Upload many resumes, rank them by ATS match, and run the AI analysis for the top candidates.",
+)
+
 # ---- Job Description Input ----
 st.subheader("1. Job Description")
 
 jd_file = st.file_uploader("Upload Job Description (TXT or PDF)", type=["txt", "pdf"])
 
 if jd_file:
-    jd_text = extract_text_from_uploaded_file(jd_file)
+    jd_text = extract_uploaded(jd_file)
     if not jd_text.strip():
         st.warning("Could not extract text from the uploaded Job Description file.")
         jd_text = st.text_area("Or paste Job Description here", height=200)
@@ -51,42 +297,33 @@ else:
     jd_text = st.text_area("Paste Job Description", height=200)
 
 # ---- Resume upload ----
-st.subheader("2. Resume")
+if batch_mode:
+    st.subheader("2. Resumes")
 
-resume_file = st.file_uploader("Upload Resume (PDF, TXT, or DOCX)", type=["pdf", "txt", "docx"])
+    resume_files = st.file_uploader(
+        "Upload Resumes (PDF, TXT, or DOCX)",
+        type=["pdf", "txt", "docx"],
+        accept_multiple_files=True,
+    )
+    top_n = int(st.number_input("Run AI analysis for the top N candidates", min_value=1, max_value=50, value=5))
+    min_ats = int(st.slider("Minimum ATS match % for AI analysis", min_value=0, max_value=100, value=0))
 
-if not resume_file:
-    resume_text = st.text_area("Or paste Resume", height=200)
 else:
-    resume_text = ""  # will be filled on Analyze
+    st.subheader("2. Resume")
 
+    resume_file = st.file_uploader("Upload Resume (PDF, TXT, or DOCX)", type=["pdf", "txt", "docx"])
 
-# =========================
-# 3. Analyze Button
-# =========================
-
-if st.button("Analyze"):
-
-    if not jd_text.strip():
-        st.warning("Please provide a Job Description.")
-        st.stop()
-
-    if resume_file:
-        resume_text = extract_text_from_uploaded_file(resume_file)
-        if not resume_text.strip():
-            st.error("Could not extract text from resume file.")
-            st.stop()
+    if not resume_file:
+        resume_text = st.text_area("Or paste Resume", height=200)
     else:
-        if not resume_text.strip():
-            st.warning("Please provide a Resume (upload or paste).")
-            st.stop()
+        resume_text = ""  # will be filled on Analyze
 
-    # --------------------------
-    # 3.1 ATS Keyword Analysis
-    # --------------------------
-    st.markdown("## 1. ATS Keyword Match Analysis")
 
-    ats = compute_ats_keyword_analysis(jd_text, resume_text)
+# =========================
+# 4. Rendering
+# =========================
+
+def render_ats(ats: dict):
     ats_score = ats.get("match_score", 0)
 
     if ats_score >= 70:
@@ -116,57 +353,19 @@ if st.button("Analyze"):
     else:
         st.write("None — all JD keywords are present in the resume.")
 
-    st.markdown("---")
-
-    # --------------------------
-    # 3.2 LLM-Based Resume Analysis
-    # --------------------------
-    st.markdown("## 2. LLM-Based Resume Analysis")
-
-    prompt = f"""
-Job Description:
-{jd_text}
-
-Resume:
-{resume_text}
-
-Return JSON only.
-"""
-
-    try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        response = model.generate_content(
-            SYSTEM_PROMPT + "\n\n" + prompt,
-            generation_config={
-                "temperature": 0,
-                "max_output_tokens": 4096
-            }
-        )
-        raw_output = (response.text or "").strip()
-    except Exception as e:
-        st.error(f"Gemini API error: {e}")
-        st.stop()
-
-    # Parse JSON
-    try:
-        model_output = json.loads(raw_output)
-    except Exception:
-        st.error("Model returned invalid JSON.")
-        st.text(raw_output)
-        st.stop()
+    variants = ats.get("variant_matches")
+    if variants:
+        st.markdown("### Matched as Variants")
+        st.write(", ".join(f"{keyword} ({token})" for keyword, token in variants.items()))
 
-    # Apply guardrails
-    model_output = apply_guardrails(jd_text, resume_text, model_output)
+    segment_hits = ats.get("keyword_segments")
+    if segment_hits:
+        st.markdown("### Where Keywords Appear")
+        for segment, keywords in segment_hits.items():
+            st.write(f"**{segment.title()}:** {', '.join(keywords)}")
 
-    analysis = model_output.get("analysis", {}) or {}
-    validation_questions = model_output.get("validation_questions", []) or []
-    gap_analysis = model_output.get("gap_analysis", {}) or {}
-    rewrite_suggestions = model_output.get("resume_rewrite_suggestions", []) or []
-    gap_text = model_output.get("gap_analysis_text", "")
 
-    # --------------------------
-    # 2.1 Match Analysis Metrics
-    # --------------------------
+def render_analysis(analysis: dict):
     st.subheader("Match Analysis")
 
     overall_score = int(analysis.get("overall_score", 0) or 0)
@@ -182,10 +381,15 @@ Return JSON only.
     cols[3].metric("Impact", impact_score)
     cols[4].metric("Leadership", leadership_score)
 
-    st.write("**Summary:**", analysis.get("summary", ""))
-    st.write("**Recommendation:**", analysis.get("recommendation", ""))
-    st.write("**Importance of Gaps:**", analysis.get("importance_of_gaps", ""))
-    st.write("**Potential Areas of Enhancement:**", analysis.get("resume_enhancement", ""))
+    # Shallower analysis depths leave some of these out.
+    for label, field in (
+        ("Summary", "summary"),
+        ("Recommendation", "recommendation"),
+        ("Importance of Gaps", "importance_of_gaps"),
+        ("Potential Areas of Enhancement", "resume_enhancement"),
+    ):
+        if analysis.get(field):
+            st.write(f"**{label}:**", analysis[field])
 
     risk_flags = analysis.get("risk_flags", []) or []
     if risk_flags:
@@ -193,9 +397,8 @@ Return JSON only.
         for flag in risk_flags:
             st.write(f"- {flag}")
 
-    # --------------------------
-    # 2.2 Gap Analysis
-    # --------------------------
+
+def render_gap_analysis(gap_analysis: dict, gap_text: str):
     st.subheader("Gap Analysis")
 
     if any(gap_analysis.values()):
@@ -249,9 +452,8 @@ Return JSON only.
     else:
         st.write("_No structured gaps identified._")
 
-    # --------------------------
-    # 2.3 Resume Rewrite Suggestions
-    # --------------------------
+
+def render_rewrite_suggestions(rewrite_suggestions: list):
     st.subheader("Resume Rewrite Suggestions")
 
     if rewrite_suggestions:
@@ -269,9 +471,8 @@ Return JSON only.
     else:
         st.write("_No high-confidence rewrite suggestions generated._")
 
-    # --------------------------
-    # 2.4 Validation Questions
-    # --------------------------
+
+def render_validation_questions(validation_questions: list):
     st.subheader("Validation Questions (Phone Screen)")
 
     if validation_questions:
@@ -279,4 +480,276 @@ Return JSON only.
             st.markdown(f"**Q{i}.** {q}")
     else:
         st.write("_No validation questions generated._")
-        
+
+
+def render_section(section: str, model_output: dict):
+    """
+    Renders the part of a (guarded) model output owned by one fan-out section.
+    """
+    if section == "scores":
+        render_analysis(model_output.get("analysis", {}) or {})
+    elif section == "gaps":
+        render_gap_analysis(
+            model_output.get("gap_analysis", {}) or {},
+            model_output.get("gap_analysis_text", ""),
+        )
+    elif section == "rewrites":
+        render_rewrite_suggestions(model_output.get("resume_rewrite_suggestions", []) or [])
+    elif section == "questions":
+        render_validation_questions(model_output.get("validation_questions", []) or [])
+
+
+# =========================
+# 5. Analyze Button
+# =========================
+
+# Analysis runs as a background job; the script only validates inputs,
+# submits, and returns, so the page stays interactive. Several analyses
+# can be queued at once.
+if not batch_mode and st.button("Analyze"):
+
+    if not jd_text.strip():
+        st.warning("Please provide a Job Description.")
+        st.stop()
+
+    if resume_file:
+        resume_text = extract_uploaded(resume_file)
+        if not resume_text.strip():
+            st.error("Could not extract text from resume file.")
+            st.stop()
+    else:
+        if not resume_text.strip():
+            st.warning("Please provide a Resume (upload or paste).")
+            st.stop()
+
+    job = submit_analysis(
+        jd_text,
+        resume_text,
+        label=f"{resume_file.name if resume_file else 'Pasted resume'} · {time.strftime('%H:%M:%S')}",
+        ats=ats_analysis(jd_text, resume_text, fuzzy_mode),
+    )
+    st.session_state.setdefault("job_ids", []).append(job.id)
+
+
+# =========================
+# 6. Analyses (polled)
+# =========================
+
+def render_job(job, sections=None):
+    """
+    Renders one job: ATS results straight away, then each LLM section as
+    soon as the job has it. `sections` replaces the job's own finished
+    sections (job.partial), e.g. with a near-duplicate's.
+    """
+    sections = job.partial if sections is None else sections
+    if not job.finished:
+        st.progress(job.progress, text=f"{job.status} · {job.completed_steps}/{job.total_steps} sections")
+        if job.cancel_requested:
+            st.caption("Cancelling after the current model call…")
+        elif st.button("Cancel", key=f"cancel-{job.id}"):
+            job_manager().cancel(job.id)
+            st.rerun(scope="fragment")
+    elif job.status == FAILED:
+        error = job.error
+        if isinstance(error, ModelOutputError):
+            st.error("Model returned invalid JSON.")
+            st.text(error.raw_text)
+        else:
+            st.error(f"Gemini API error: {error}")
+    elif job.status == CANCELLED:
+        st.warning("Cancelled.")
+
+    st.markdown("## 1. ATS Keyword Match Analysis")
+    render_ats(job.meta["ats"])
+    st.markdown("---")
+
+    st.markdown("## 2. LLM-Based Resume Analysis")
+    for section in depth_sections(job.meta.get("depth", DEFAULT_DEPTH)):
+        if section in sections:
+            render_section(section, sections[section])
+        elif section in job.errors and job.meta["fanout"]:
+            error = job.errors[section]
+            if isinstance(error, ModelOutputError):
+                st.error(f"Model returned invalid JSON ({section}).")
+                st.text(error.raw_text)
+            else:
+                st.error(f"Gemini API error ({section}): {error}")
+        elif not job.finished:
+            st.caption(f"Waiting for {section}…")
+
+    usage = job.meta["usage"].as_dict()
+    if usage["calls"]:
+        st.caption(
+            f"{usage['calls']} model call{'s' if usage['calls'] != 1 else ''} · {usage['prompt_tokens']} prompt + {usage['output_tokens']} output tokens"
+            f"{' (estimated)' if usage['estimated'] else ''} · ~${usage['cost_usd']:.4f}"
+        )
+    elif job.finished:
+        st.caption("Served from cache: no model calls.")
+
+
+@st.fragment(run_every=1.0)
+def analyses_panel():
+    # Re-runs on its own every second, so progress and partial results
+    # appear without a full-page rerun. Rendering only reads job state.
+    jobs = job_manager().jobs(st.session_state.get("job_ids", []))
+    if not jobs:
+        return
+
+    st.markdown("---")
+    header, clear = st.columns([4, 1])
+    header.subheader("Analyses")
+    if clear.button("Clear finished"):
+        st.session_state["job_ids"] = [job.id for job in jobs if not job.finished]
+        st.rerun(scope="fragment")
+
+    for i, job in enumerate(reversed(jobs)):
+        status = "✅" if job.status == DONE else "⏳" if not job.finished else "⚠️"
+        with st.expander(f"{status} {job.label} — {job.status}", expanded=i == 0):
+            render_job(job)
+
+
+if not batch_mode:
+    analyses_panel()
+
+
+# =========================
+# 7. Batch Leaderboard
+# =========================
+
+def job_sections(row: dict, state: dict, job) -> dict:
+    """
+    The job's finished sections for a leaderboard row. A near-duplicate
+    shares its original's job, whose outputs were guarded against the
+    original's resume, so its sections are guarded again against its own
+    text (once each, kept in state).
+    """
+    if row["resume_hash"] not in state["duplicates"]:
+        return job.partial
+    sections = state.setdefault("reguarded", {}).setdefault(row["resume_hash"], {})
+    for section, raw_output in list(job.meta["raw_outputs"].items()):
+        if section not in sections:
+            guarded = finalize_section(jd_text, row["text"], section, raw_output)
+            sections[section] = ScreenResult.from_dict(guarded).view()
+    return sections
+
+
+def leaderboard_frame(rows: list, state: dict) -> pd.DataFrame:
+    """
+    One row per candidate: ATS results straight away, AI scores as soon as
+    the candidate's job has its scores section.
+    """
+    records = []
+    for rank, row in enumerate(rows, start=1):
+        ats = row["ats"]
+        job = job_manager().get(state["job_ids"].get(row["resume_hash"], ""))
+        scores = (job_sections(row, state, job).get("scores") or {}).get("analysis", {}) if job else {}
+        status = job.status if job else ("no text" if not row["text"].strip() else "")
+        if row["resume_hash"] in state["duplicates"]:
+            status += f" · duplicate of {state['duplicates'][row['resume_hash']]}"
+        records.append({
+            "Rank": rank,
+            "Candidate": row["name"],
+            "Score": row["scores"]["combined"],
+            "ATS %": ats["match_score"],
+            "Dictionary %": row["scores"]["dictionary"],
+            "Matched": f"{len(ats['resume_keywords'])}/{len(ats['jd_keywords'])}",
+            "Missing keywords": ", ".join(ats["missing_keywords"][:5]),
+            "AI status": status,
+            "Overall": scores.get("overall_score"),
+            "Skills": scores.get("skills_score"),
+            "Experience": scores.get("experience_score"),
+            "Impact": scores.get("impact_score"),
+            "Leadership": scores.get("leadership_score"),
+            "Recommendation": scores.get("recommendation", ""),
+        })
+    return pd.DataFrame.from_records(records)
+
+
+@st.fragment(run_every=1.0)
+def batch_leaderboard(rows: list, state: dict):
+    # Columns are sortable in the UI; rows fill in as AI results arrive.
+    st.dataframe(leaderboard_frame(rows, state), hide_index=True, use_container_width=True)
+
+    job_ids = state["job_ids"]
+    analysed = [row for row in rows if row["resume_hash"] in job_ids]
+    if analysed:
+        choice = st.selectbox("Show full analysis for", [row["name"] for row in analysed])
+        row = next(row for row in analysed if row["name"] == choice)
+        if row["resume_hash"] in state["duplicates"]:
+            st.caption(
+                f"Near-duplicate resume: showing the analysis of {state['duplicates'][row['resume_hash']]}, "
+                "with guardrails applied to this resume."
+            )
+        job = job_manager().get(job_ids[row["resume_hash"]])
+        if job is not None:
+            render_job(job, job_sections(row, state, job))
+
+
+if batch_mode:
+    st.markdown("---")
+    st.subheader("Candidate Leaderboard")
+
+    if not jd_text.strip() or not resume_files:
+        st.info("Provide a Job Description and upload resumes to build the leaderboard.")
+    else:
+        documents = [(f.name, f.type, f.getvalue()) for f in resume_files]
+        jd_hash = content_hash(jd_text)
+        rows = _cached_ranking(jd_hash, tuple(content_hash(d[2]) for d in documents), fuzzy_mode, jd_text, documents)
+
+        # State per (JD, mode toggles): job ids keyed by resume hash, so
+        # re-ranking or re-clicking never queues the same candidate twice, and
+        # a MinHash index of submitted resumes, so near-duplicates (re-applies,
+        # agency resubmissions) share the earlier job instead of a new call; their
+        # sections are guarded against their own text when shown (job_sections).
+        batch_state = st.session_state.setdefault("batch_jobs", {})
+        state = batch_state.setdefault(
+            f"{jd_hash}:{fanout_mode}:{focused_mode}:{fuzzy_mode}:{depth_mode}",
+            {"job_ids": {}, "duplicates": {}, "index": NearDuplicateIndex(threshold=0.85)},
+        )
+        job_ids = state["job_ids"]
+
+        if st.button(f"Analyze top {top_n}"):
+            # Cheap scores gate the model: only candidates above the ATS
+            # threshold and within the top N by combined score are analysed.
+            cascade = Cascade(min_ats=min_ats, top_k=top_n)
+            candidates = [row for row in rows if row["text"].strip()]
+            cascade.set_top_k_ids(cascade.rank_top_k((row["resume_hash"], row["scores"]) for row in candidates))
+            admitted = [row for row in candidates if cascade.admit(row["resume_hash"], row["scores"])]
+            state["cascade"] = cascade.report.as_dict()
+
+            for row in admitted:
+                if row["resume_hash"] in job_ids:
+                    continue
+                match = state["index"].query(row["signature"])
+                if match is not None:
+                    original_hash, original_name = match[2]
+                    job_ids[row["resume_hash"]] = job_ids[original_hash]
+                    state["duplicates"][row["resume_hash"]] = f"{original_name} ({match[1]:.0%})"
+                    continue
+                job = submit_analysis(jd_text, row["text"], label=row["name"], ats=row["ats"])
+                job_ids[row["resume_hash"]] = job.id
+                state["index"].add(row["resume_hash"], row["signature"], (row["resume_hash"], row["name"]))
+
+        if state.get("cascade"):
+            report = state["cascade"]
+            st.caption(
+                f"Cascade: {report['model_calls']} of {report['candidates']} candidates sent to the model, "
+                f"{report['model_calls_saved']} model calls saved."
+            )
+            histograms = report["histograms"]["combined"]
+            st.bar_chart(pd.DataFrame({"admitted": histograms["admitted"], "rejected": histograms["rejected"]}))
+
+        batch_leaderboard(rows, state)
+
+
+# =========================
+# 8. Debug Panel
+# =========================
+
+with st.sidebar.expander("Debug: cache hit rates"):
+    caches = stage_caches()
+    st.table([{"stage": name, **cache.as_dict()} for name, cache in caches.items()])
+    st.caption(f"Prompt {PROMPT_VERSION} · Guardrails v{GUARDRAILS_VERSION}")
+
+with st.sidebar.expander("Debug: stage timings"):
+    st.table(metrics.stage_summary())
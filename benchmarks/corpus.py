@@ -0,0 +1,267 @@
+"""
+corpus.py
+
+Seeded generator for synthetic benchmark inputs: job descriptions, resumes
+(as text, PDF or DOCX bytes) and schema-valid model outputs. The same seed
+and sizes always give byte-identical documents, so timings from different
+commits are comparable.
+
+PDF and DOCX files are written with the standard library only (a minimal
+Helvetica text PDF and a bare WordprocessingML zip), so the corpus can be
+generated without pypdf or python-docx installed.
+
+Usage:
+    python -m benchmarks.corpus --out corpus/ [--seed 7] [--count 50] [--formats txt,pdf,docx]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import zipfile
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from screener.ats_dictionary import ACTION_VERBS, CERTIFICATIONS, SENIORITY, SKILLS, TOOLS
+from screener.llm_prompts import empty_output
+from screener.util import MIME_TYPES
+
+FILLER = [
+    "cross-functional", "stakeholders", "customers", "quarterly", "roadmap", "platform", "reliability",
+    "onboarding", "migration", "throughput", "latency", "cost", "revenue", "pipeline", "reporting",
+    "compliance", "automation", "dashboards", "incidents", "releases", "vendors", "budget", "team",
+]
+
+
+# ============================================================
+# 1. Text
+# ============================================================
+
+def make_jd(rng: random.Random, n_requirements: int = 12) -> Dict[str, Any]:
+    """
+    A job description with a title, n_requirements required terms and a few
+    nice-to-haves. Returns {"text", "required"}.
+    """
+    required = rng.sample(SKILLS + TOOLS, n_requirements)
+    nice = rng.sample(CERTIFICATIONS + TOOLS, 4)
+    title = f"{rng.choice(SENIORITY).title()} {rng.choice(['Engineer', 'Analyst', 'Manager', 'Consultant'])}"
+
+    lines = [title, "", "About the role"]
+    lines.append(" ".join(rng.choice(FILLER) for _ in range(30)) + ".")
+    lines += ["", "Requirements"]
+    lines += [f"- {rng.randint(2, 8)}+ years of {term}" for term in required]
+    lines += ["", "Nice to have"]
+    lines += [f"- {term}" for term in nice]
+    return {"text": "\n".join(lines), "required": required}
+
+
+def make_resume(rng: random.Random, jd: Dict[str, Any], overlap: float = 0.6, roles: int = 4, bullets: int = 5) -> str:
+    """
+    A resume covering roughly `overlap` of the JD's required terms, with
+    `roles` positions of `bullets` lines each. Size scales with roles * bullets.
+    """
+    covered = [term for term in jd["required"] if rng.random() < overlap]
+    extra = rng.sample(SKILLS + TOOLS, 6)
+    terms = covered + extra
+
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "", "Summary"]
+    lines.append(f"Professional with experience in {', '.join(terms[:5])}.")
+    lines += ["", "Experience"]
+    for r in range(roles):
+        lines.append(f"{rng.choice(SENIORITY).title()} role, Company {r + 1} ({2024 - 3 * r - 3}-{2024 - 3 * r})")
+        for _ in range(bullets):
+            term = rng.choice(terms)
+            lines.append(
+                f"- {rng.choice(ACTION_VERBS).capitalize()} {term} work for {rng.choice(FILLER)} "
+                f"{rng.choice(FILLER)}, improving {rng.choice(FILLER)} by {rng.randint(5, 60)}%"
+            )
+    lines += ["", "Skills", ", ".join(terms)]
+    return "\n".join(lines)
+
+
+def make_model_output(rng: random.Random, resume_text: str, gaps: int = 3, rewrites: int = 3, questions: int = 3) -> Dict[str, Any]:
+    """
+    A schema-valid raw model output whose rewrite originals are real resume
+    lines, so guardrails take their normal (matching) path.
+    """
+    output = empty_output()
+    for field in ["overall_score", "skills_score", "experience_score", "impact_score", "leadership_score"]:
+        output["analysis"][field] = rng.randint(30, 95)
+    output["analysis"]["summary"] = "Candidate shows relevant experience for the role."
+    output["analysis"]["recommendation"] = "Proceed to phone screen."
+    output["analysis"]["risk_flags"] = [f"Limited evidence of {rng.choice(SKILLS)}."]
+
+    output["gap_analysis"]["priority_gaps"] = [f"No evidence of {rng.choice(TOOLS)}." for _ in range(gaps)]
+    output["gap_analysis"]["missing_skills"] = rng.sample(SKILLS, gaps)
+    output["gap_analysis_text"] = " ".join(output["gap_analysis"]["priority_gaps"])
+
+    lines = [line.lstrip("- ").strip() for line in resume_text.split("\n") if line.startswith("- ")]
+    output["resume_rewrite_suggestions"] = [
+        {"original": line, "suggestion": line + " across three teams", "confidence": 0.85}
+        for line in rng.sample(lines, min(rewrites, len(lines)))
+    ]
+    output["validation_questions"] = [f"Describe a project where you used {rng.choice(SKILLS)}." for _ in range(questions)]
+    return output
+
+
+# ============================================================
+# 2. Files
+# ============================================================
+
+def _pdf_string(line: str) -> str:
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """
+    Minimal multi-page PDF with one Helvetica text line per input line.
+    """
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects: List[bytes] = []
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for pid, page in zip(page_ids, pages):
+        body = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        body += [f"({_pdf_string(line)}) Tj T*" for line in page]
+        body.append("ET")
+        stream = "\n".join(body).encode("latin-1")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % i + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+_DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+_DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def to_docx(text: str) -> bytes:
+    """
+    Minimal .docx with one paragraph per input line.
+    """
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+        # Fixed timestamps keep the bytes identical across runs.
+        for name, data in [("[Content_Types].xml", _DOCX_CONTENT_TYPES), ("_rels/.rels", _DOCX_RELS), ("word/document.xml", document)]:
+            z.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data)
+    return out.getvalue()
+
+
+RENDERERS = {
+    "txt": lambda text: text.encode("utf-8"),
+    "pdf": to_pdf,
+    "docx": to_docx,
+}
+
+
+# ============================================================
+# 3. Corpus
+# ============================================================
+
+def generate_corpus(
+    seed: int = 7,
+    count: int = 50,
+    formats: Optional[List[str]] = None,
+    roles: int = 4,
+    bullets: int = 5,
+    n_requirements: int = 12,
+) -> List[Dict[str, Any]]:
+    """
+    Returns `count` cases, each {"id", "jd_text", "resume_text", "format",
+    "resume_bytes", "mime_type", "raw_output"}. Formats rotate through
+    `formats` (default txt, pdf, docx).
+    """
+    formats = formats or ["txt", "pdf", "docx"]
+    rng = random.Random(seed)
+    jd = make_jd(rng, n_requirements)
+
+    cases = []
+    for i in range(count):
+        resume_text = make_resume(rng, jd, overlap=rng.uniform(0.2, 0.9), roles=roles, bullets=bullets)
+        fmt = formats[i % len(formats)]
+        cases.append({
+            "id": f"case-{i:04d}",
+            "jd_text": jd["text"],
+            "resume_text": resume_text,
+            "format": fmt,
+            "resume_bytes": RENDERERS[fmt](resume_text),
+            "mime_type": MIME_TYPES[f".{fmt}"],
+            "raw_output": make_model_output(rng, resume_text),
+        })
+    return cases
+
+
+def write_corpus(cases: List[Dict[str, Any]], out_dir: str) -> str:
+    """
+    Writes resume files, the JD and a records.jsonl (batch.py record format)
+    under out_dir; returns the JSONL path.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jd_path = os.path.join(out_dir, "jd.txt")
+    with open(jd_path, "w", encoding="utf-8") as f:
+        f.write(cases[0]["jd_text"] if cases else "")
+
+    records_path = os.path.join(out_dir, "records.jsonl")
+    with open(records_path, "w", encoding="utf-8") as records:
+        for case in cases:
+            path = os.path.join(out_dir, f"{case['id']}.{case['format']}")
+            with open(path, "wb") as f:
+                f.write(case["resume_bytes"])
+            records.write(json.dumps({"id": case["id"], "jd_path": jd_path, "resume_path": path}) + "\n")
+    return records_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic JD/resume corpus.")
+    parser.add_argument("--out", required=True, help="Output directory.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--formats", default="txt,pdf,docx")
+    parser.add_argument("--roles", type=int, default=4, help="Positions per resume.")
+    parser.add_argument("--bullets", type=int, default=5, help="Lines per position.")
+    args = parser.parse_args()
+
+    cases = generate_corpus(args.seed, args.count, args.formats.split(","), args.roles, args.bullets)
+    print(write_corpus(cases, args.out))
+
+
+if __name__ == "__main__":
+    main()
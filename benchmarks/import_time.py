@@ -0,0 +1,68 @@
+"""
+import_time.py
+
+Benchmarks cold-start cost of the headless screening core.
+
+Each measurement runs in a fresh interpreter so module caches do not leak
+between runs. Reports the median wall time of importing the core and running
+one ATS scoring call, and checks that no heavy dependency was imported.
+
+Usage:
+    python -m benchmarks.import_time [--runs 10]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["streamlit", "pypdf", "docx", "google.generativeai"]
+
+SNIPPET = """
+import json, sys, time
+t0 = time.perf_counter()
+from screener.util import compute_ats_keyword_analysis
+t1 = time.perf_counter()
+compute_ats_keyword_analysis("python sql python sql data data", "python data")
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_ats_ms": (t2 - t1) * 1000,
+    "heavy_loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", SNIPPET],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        samples.append(json.loads(out.stdout))
+
+    return {
+        "runs": runs,
+        "import_ms_median": statistics.median(s["import_ms"] for s in samples),
+        "first_ats_ms_median": statistics.median(s["first_ats_ms"] for s in samples),
+        "heavy_loaded": sorted({m for s in samples for m in s["heavy_loaded"]}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(json.dumps(result, indent=2))
+    if result["heavy_loaded"]:
+        sys.exit(f"heavy modules imported eagerly: {result['heavy_loaded']}")
+
+
+if __name__ == "__main__":
+    main()
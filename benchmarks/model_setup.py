@@ -0,0 +1,73 @@
+"""
+model_setup.py
+
+Measures per-call model setup overhead against the stub backend:
+- cold: a new model object per call (the old behaviour of app.py/pipeline.py)
+- pooled: the shared object from screener.clients.get_model()
+
+Both paths run the same stub generate_content call, so the difference is
+the setup cost the registry removes. With --backend gemini (and an API
+key) the cold path also includes GenerativeModel construction.
+
+Usage:
+    python -m benchmarks.model_setup [--calls 2000] [--threads 8]
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from screener.clients import create_model, get_model, reset_clients
+from screener.config import MODEL_NAME, generation_config
+from screener.llm_prompts import build_prompt
+
+PROMPT = build_prompt("Python, SQL and Kubernetes required.", "Built Python services on Kubernetes for five years.")
+
+
+def _cold_call(backend: str) -> None:
+    create_model(MODEL_NAME, backend).generate_content(PROMPT, generation_config=generation_config())
+
+
+def _pooled_call(backend: str) -> None:
+    get_model(MODEL_NAME, backend).generate_content(PROMPT, generation_config=generation_config())
+
+
+def _run(fn, backend: str, calls: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads <= 1:
+        for _ in range(calls):
+            fn(backend)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(fn, [backend] * calls))
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def measure(backend: str, calls: int, threads: int) -> dict:
+    reset_clients()
+    get_model(MODEL_NAME, backend)  # warm the registry once, as the app does at startup
+
+    cold_us = _run(_cold_call, backend, calls, threads)
+    pooled_us = _run(_pooled_call, backend, calls, threads)
+    return {
+        "backend": backend,
+        "calls": calls,
+        "threads": threads,
+        "cold_us_per_call": cold_us,
+        "pooled_us_per_call": pooled_us,
+        "setup_overhead_us": cold_us - pooled_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-call model setup overhead.")
+    parser.add_argument("--backend", default="stub")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.backend, args.calls, args.threads), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+pdf_pages.py
+
+Single-document latency of page-parallel PDF extraction
+(screener.workers.extract_pdf_parallel) against serial extraction, for
+one large PDF built from corpus resumes:
+- serial_ms: util.extract_text_from_path with no page pool
+- parallel_ms: per pool size, the same file split across a warm pool
+  (warmed up first, so pool startup is not counted), from its path
+  (memory-mapped) and from its bytes (spilled to a temporary file)
+- speedup over serial, and whether the text is identical
+
+Speedup is bounded by the machine's cores; "cpus" is in the report.
+
+Usage:
+    python -m benchmarks.pdf_pages [--pages 200] [--workers 1,2,4] [--rounds 3]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import generate_corpus, to_pdf
+
+
+def _time_ms(fn: Callable[[], Any], rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 1)
+
+
+def large_pdf(pages: int, seed: int) -> bytes:
+    lines: List[str] = []
+    for case in generate_corpus(seed=seed, count=max(1, pages // 2), formats=["txt"]):
+        lines.extend(case["resume_text"].split("\n"))
+    while len(lines) < pages * 50:
+        lines.extend(lines)
+    return to_pdf("\n".join(lines[: pages * 50]), lines_per_page=50)
+
+
+def measure(pages: int, worker_counts: List[int], rounds: int, seed: int) -> Dict[str, Any]:
+    from screener.util import extract_text_from_path
+    from screener.workers import extract_pdf_parallel, warm_pool
+
+    data = large_pdf(pages, seed)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+    try:
+        expected = extract_text_from_path(f.name)
+        report: Dict[str, Any] = {
+            "pages": pages,
+            "pdf_kb": round(len(data) / 1024, 1),
+            "cpus": os.cpu_count(),
+            "serial_ms": _time_ms(lambda: extract_text_from_path(f.name), rounds),
+            "parallel": {},
+        }
+        for workers in worker_counts:
+            with warm_pool(workers) as pool:
+                from_path = extract_pdf_parallel(f.name, pool, workers)
+                from_bytes = extract_pdf_parallel(data, pool, workers)
+                path_ms = _time_ms(lambda: extract_pdf_parallel(f.name, pool, workers), rounds)
+                bytes_ms = _time_ms(lambda: extract_pdf_parallel(data, pool, workers), rounds)
+            report["parallel"][str(workers)] = {
+                "path_ms": path_ms,
+                "bytes_ms": bytes_ms,
+                "speedup": round(report["serial_ms"] / path_ms, 2),
+                "identical": from_path == expected and from_bytes == expected,
+            }
+        return report
+    finally:
+        os.unlink(f.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Page-parallel vs serial extraction of one large PDF.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated pool sizes (default: 1,2,4).")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    worker_counts = [int(n) for n in args.workers.split(",") if n.strip()]
+    print(json.dumps(measure(args.pages, worker_counts, args.rounds, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
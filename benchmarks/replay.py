@@ -0,0 +1,102 @@
+"""
+replay.py
+
+End-to-end throughput of batch screening with recorded model calls
+(screener.cassette), so runs are comparable between commits and machines
+without network:
+
+    # once, with network (or --source stub for a synthetic cassette)
+    python -m benchmarks.replay --cassette calls.jsonl.gz --record
+    # then, anywhere
+    python -m benchmarks.replay --cassette calls.jsonl.gz [--latency-scale 1.0]
+
+The corpus is seeded (corpus.py), so the same --seed/--count/--fanout/
+--focused produce the same prompts, and a recorded cassette answers every
+call. Reports records per second, per-record latency (p50/p95) and model
+calls, failed records and cassette misses. --latency-scale 0 removes the
+recorded model latency and measures everything around the model.
+
+Usage:
+    python -m benchmarks.replay --cassette FILE [--record [--source gemini]]
+        [--count 30] [--concurrency 4] [--fanout] [--focused] [--latency-scale 1.0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+from benchmarks.corpus import generate_corpus
+
+
+def run(records: List[Dict[str, Any]], concurrency: int, fanout: bool, focused: bool) -> Dict[str, Any]:
+    from functools import partial
+
+    from screener.batch import screen_record, stream_screen
+    from screener.cassette import CassetteMiss
+    from screener.metrics import MODEL_CALLS
+
+    screen = partial(screen_record, fanout=fanout, focused=focused)
+    calls_before = MODEL_CALLS.value(status="ok") + MODEL_CALLS.value(status="error")
+    start = time.perf_counter()
+    results = list(stream_screen(records, screen, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    calls = MODEL_CALLS.value(status="ok") + MODEL_CALLS.value(status="error") - calls_before
+
+    latencies = sorted(result["elapsed_ms"] for result in results)
+    misses = sum(1 for result in results if CassetteMiss.__name__ in str(result.get("error", "")))
+    return {
+        "records": len(results),
+        "failed": sum(1 for result in results if result["status"] != "ok"),
+        "cassette_misses": misses,
+        "model_calls": calls,
+        "wall_s": round(elapsed, 3),
+        "records_per_s": round(len(results) / elapsed, 2) if elapsed else None,
+        "record_ms": {
+            "p50": round(statistics.median(latencies), 2) if latencies else None,
+            "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch screening throughput against a recorded cassette.")
+    parser.add_argument("--cassette", required=True, help="Cassette file (.jsonl, or .jsonl.gz for gzip).")
+    parser.add_argument("--record", action="store_true", help="Record the corpus's calls instead of replaying.")
+    parser.add_argument("--source", default="gemini", help="Backend to record from (default: gemini).")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on recorded latencies.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--count", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fanout", action="store_true")
+    parser.add_argument("--focused", action="store_true")
+    args = parser.parse_args()
+
+    from screener.cassette import CASSETTE_ENV, LATENCY_SCALE_ENV, RECORD_BACKEND_ENV, open_cassette
+    from screener.clients import BACKEND_ENV, reset_clients
+
+    os.environ[CASSETTE_ENV] = args.cassette
+    os.environ[BACKEND_ENV] = "record" if args.record else "replay"
+    os.environ[RECORD_BACKEND_ENV] = args.source
+    os.environ[LATENCY_SCALE_ENV] = str(args.latency_scale)
+    reset_clients()
+
+    cases = generate_corpus(seed=args.seed, count=args.count, formats=["txt"])
+    records = [{"id": case["id"], "jd_text": case["jd_text"], "resume_text": case["resume_text"]} for case in cases]
+    report = {
+        "mode": os.environ[BACKEND_ENV],
+        "cassette_calls": len(open_cassette()),
+        "latency_scale": None if args.record else args.latency_scale,
+        "fanout": args.fanout,
+        "focused": args.focused,
+        "concurrency": args.concurrency,
+    }
+    report.update(run(records, args.concurrency, args.fanout, args.focused))
+    report["cassette_calls_after"] = len(open_cassette())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+result_types.py
+
+Compares the dict output representation with results.ScreenResult over a
+batch of candidates (default 10,000) built from the synthetic corpus:
+- build: parsed model JSON -> sanitized result (the pipeline's
+  sanitization step for dicts, ScreenResult.from_dict for objects)
+- memory: tracemalloc bytes retained per result with the whole batch held
+- read: a render-style pass over every section (dict access vs view())
+- to_dict: converting objects back to the plain output shape
+
+Every candidate is parsed from its own JSON text, so no strings are shared
+between results, as in a real batch.
+
+Usage:
+    python -m benchmarks.result_types [--count 10000] [--distinct 200] [--rounds 3]
+"""
+
+import argparse
+import copy
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import generate_corpus
+from screener.pipeline import _sanitize_output, finalize_output
+from screener.results import ScreenResult
+from screener.util import compute_ats_keyword_analysis
+
+
+def _texts(count: int, distinct: int, seed: int) -> List[str]:
+    cases = generate_corpus(seed=seed, count=distinct, formats=["txt"])
+    outputs = []
+    for case in cases:
+        output = finalize_output(case["jd_text"], case["resume_text"], copy.deepcopy(case["raw_output"]))
+        output["ats_keyword_analysis"] = compute_ats_keyword_analysis(case["jd_text"], case["resume_text"])
+        outputs.append(json.dumps(output))
+    return [outputs[i % len(outputs)] for i in range(count)]
+
+
+def _read(output) -> int:
+    analysis = output["analysis"]
+    total = analysis["overall_score"] + analysis["skills_score"] + analysis["experience_score"]
+    total += len(analysis.get("summary", "")) + len(analysis.get("risk_flags", []) or [])
+    gaps = output.get("gap_analysis", {}) or {}
+    total += sum(len(items) for items in gaps.values())
+    for item in output.get("resume_rewrite_suggestions", []) or []:
+        total += len(item.get("original", "")) + int(float(item.get("confidence", 0.0)))
+    total += len(output.get("validation_questions", []) or [])
+    return total + len(output["ats_keyword_analysis"]["missing_keywords"])
+
+
+def _best(fn: Callable[[], Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _retained_bytes(build: Callable[[Dict[str, Any]], Any], texts: List[str]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build(json.loads(text)) for text in texts]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / len(texts)
+
+
+def measure(count: int, distinct: int, rounds: int, seed: int) -> Dict[str, Any]:
+    texts = _texts(count, distinct, seed)
+    parsed = [json.loads(text) for text in texts]
+
+    dicts = [_sanitize_output(raw) for raw in parsed]
+    objects = [ScreenResult.from_dict(raw) for raw in parsed]
+    views = [result.view() for result in objects]
+    assert all(obj.to_dict() == d for obj, d in zip(objects, dicts))
+
+    n = len(texts)
+    results = {
+        "dict": {
+            "build_us": _best(lambda: [_sanitize_output(raw) for raw in parsed], rounds) / n * 1e6,
+            "bytes_per_result": _retained_bytes(_sanitize_output, texts),
+            "read_us": _best(lambda: [_read(d) for d in dicts], rounds) / n * 1e6,
+        },
+        "slotted": {
+            "build_us": _best(lambda: [ScreenResult.from_dict(raw) for raw in parsed], rounds) / n * 1e6,
+            "bytes_per_result": _retained_bytes(ScreenResult.from_dict, texts),
+            "read_us": _best(lambda: [_read(v) for v in views], rounds) / n * 1e6,
+            "to_dict_us": _best(lambda: [obj.to_dict() for obj in objects], rounds) / n * 1e6,
+        },
+    }
+    for stats in results.values():
+        for key, value in stats.items():
+            stats[key] = round(value, 2) if key.endswith("_us") else round(value)
+    results["memory_ratio"] = round(results["slotted"]["bytes_per_result"] / results["dict"]["bytes_per_result"], 3)
+    results["build_ratio"] = round(results["slotted"]["build_us"] / results["dict"]["build_us"], 3)
+    results["count"] = n
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dict vs slotted result memory and construction time.")
+    parser.add_argument("--count", type=int, default=10000, help="Results in the batch (default: 10000).")
+    parser.add_argument("--distinct", type=int, default=200, help="Distinct corpus outputs to cycle through.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.count, args.distinct, args.rounds, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+segments.py
+
+Resume segmentation (screener.segments) on the synthetic corpus:
+- segment_us: split_segments on a cold cache, and a cached segment_resume
+- keyword_segments_us: per-segment ATS hits for one candidate
+- prompt tokens per analysis, whole resume vs focused prompts, single
+  call and fan-out (estimated, len/4)
+
+Corpus resumes have a one-line contact block and no education or
+certifications, which focused prompts save the most on. The "full_layout"
+rows add a typical contact block and those sections to each resume.
+
+Usage:
+    python -m benchmarks.segments [--count 200] [--rounds 5]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import generate_corpus
+from screener.llm_prompts import SECTION_ORDER, build_prompt, build_section_prompt
+from screener.segments import SEGMENT_CACHE, keyword_segments, segment_resume, split_segments
+from screener.usage import estimate_tokens
+from screener.util import compute_ats_keyword_analysis
+
+CONTACT = [
+    "jordan.candidate@example.com | +1 555 010 2030",
+    "linkedin.com/in/jordan-candidate | github.com/jordan-candidate",
+    "Portland, OR (open to remote)",
+]
+TAIL = [
+    "",
+    "Education",
+    "M.S. Computer Science, State University (2012-2014)",
+    "B.S. Mathematics, State College (2008-2012), magna cum laude",
+    "",
+    "Certifications",
+    "AWS Certified Solutions Architect - Associate (2021)",
+    "Certified Kubernetes Administrator (2022)",
+    "",
+    "Languages",
+    "English (native), Spanish (professional working proficiency)",
+]
+
+
+def full_layout(resume_text: str) -> str:
+    first, rest = resume_text.split("\n", 1)
+    return "\n".join([first] + CONTACT + [rest] + TAIL)
+
+
+def _time_us(fn: Callable[[], None], rounds: int, items: int) -> float:
+    fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) / items * 1e6)
+    return round(statistics.median(samples), 2)
+
+
+def _prompt_tokens(cases: List[Dict[str, Any]], resumes: List[str]) -> Dict[str, Any]:
+    totals = {"single": [0, 0], "fanout": [0, 0]}
+    for case, resume in zip(cases, resumes):
+        jd = case["jd_text"]
+        for i, focused in enumerate((False, True)):
+            totals["single"][i] += estimate_tokens(build_prompt(jd, resume, focused))
+            totals["fanout"][i] += sum(
+                estimate_tokens(build_section_prompt(section, jd, resume, focused)) for section in SECTION_ORDER
+            )
+    report = {}
+    for mode, (whole, focused) in totals.items():
+        report[mode] = {
+            "whole_tokens": round(whole / len(cases)),
+            "focused_tokens": round(focused / len(cases)),
+            "saved_pct": round(100 * (whole - focused) / whole, 1),
+        }
+    return report
+
+
+def measure(count: int, rounds: int, seed: int) -> Dict[str, Any]:
+    cases = generate_corpus(seed=seed, count=count, formats=["txt"])
+    layouts = {
+        "corpus": [case["resume_text"] for case in cases],
+        "full_layout": [full_layout(case["resume_text"]) for case in cases],
+    }
+    ats = [compute_ats_keyword_analysis(case["jd_text"], case["resume_text"]) for case in cases]
+
+    def split_all() -> None:
+        for resume in layouts["full_layout"]:
+            split_segments(resume)
+
+    def cached_all() -> None:
+        for resume in layouts["full_layout"]:
+            segment_resume(resume)
+
+    def hits_all() -> None:
+        for case, result in zip(cases, ats):
+            keyword_segments(result["resume_keywords"], segment_resume(case["resume_text"]))
+
+    SEGMENT_CACHE.clear()
+    report: Dict[str, Any] = {
+        "count": count,
+        "segment_us": {
+            "split": _time_us(split_all, rounds, count),
+            "cached": _time_us(cached_all, rounds, count),
+        },
+        "keyword_segments_us": _time_us(hits_all, rounds, count),
+    }
+    for name, resumes in layouts.items():
+        report[name] = _prompt_tokens(cases, resumes)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resume segmentation cost and focused-prompt token savings.")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.count, args.rounds, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
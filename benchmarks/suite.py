@@ -0,0 +1,259 @@
+"""
+suite.py
+
+Reproducible per-stage and end-to-end benchmarks over a seeded synthetic
+corpus (see corpus.py), with JSON results that can be compared between
+commits.
+
+Stages:
+- extract_txt / extract_pdf / extract_docx   file bytes -> text (skipped if the parser is missing)
+- ats            compute_ats_keyword_analysis
+- cheap_scores   cascade ATS + dictionary scoring
+- minhash        near-duplicate signature
+- prompt         build_prompt
+- parse          extract_json_from_model_text on a serialized model output
+- guardrails     apply_guardrails on a raw model output
+- finalize       finalize_output (the single-pass validator) into the full output shape
+- e2e_single     run_pipeline against the stub backend, one call
+- e2e_fanout     run_pipeline against the stub backend, section fan-out
+- batch          stream_screen over the whole corpus (concurrency 4)
+
+Every stage runs `rounds` passes over the corpus; results are microseconds
+per item (median, min and p95 over rounds).
+
+Usage:
+    python -m benchmarks.suite [--seed 7] [--count 30] [--rounds 5] [--out results.json]
+    python -m benchmarks.suite --compare baseline.json [--fail-above 1.10]
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import generate_corpus
+
+
+# ============================================================
+# 1. Stages
+# ============================================================
+
+def _extract_stage(cases: List[Dict[str, Any]], fmt: str) -> Optional[Callable[[], None]]:
+    from screener.util import extract_text_from_bytes
+
+    selected = [case for case in cases if case["format"] == fmt]
+    if not selected:
+        return None
+    if fmt != "txt":
+        try:
+            __import__({"pdf": "pypdf", "docx": "docx"}[fmt])
+        except ImportError:
+            return None
+
+    def run() -> None:
+        for case in selected:
+            extract_text_from_bytes(case["resume_bytes"], case["mime_type"])
+
+    run.items = len(selected)
+    return run
+
+
+def build_stages(cases: List[Dict[str, Any]]) -> Dict[str, Optional[Callable[[], None]]]:
+    """
+    Returns {name: run()} where each run() processes the corpus once; run.items
+    is the number of items per pass. Stages whose dependency is missing map to None.
+    """
+    from screener.batch import screen_record, stream_screen
+    from screener.cascade import cheap_scores
+    from screener.dedupe import minhash_signature
+    from screener.guardrails import apply_guardrails
+    from screener.llm_prompts import build_prompt
+    from screener.pipeline import finalize_output, run_pipeline
+    from screener.util import compute_ats_keyword_analysis, extract_json_from_model_text
+
+    serialized = [json.dumps(case["raw_output"]) for case in cases]
+    records = [{"id": case["id"], "jd_text": case["jd_text"], "resume_text": case["resume_text"]} for case in cases]
+
+    def each(fn: Callable[[Dict[str, Any]], Any]) -> Callable[[], None]:
+        def run() -> None:
+            for case in cases:
+                fn(case)
+
+        run.items = len(cases)
+        return run
+
+    def with_copies(fn: Callable[[Dict[str, Any], Dict[str, Any]], Any]) -> Callable[[], None]:
+        # Guardrails mutate their input, so each pass gets fresh copies made
+        # before the timer starts (see prepare()).
+        state: Dict[str, Any] = {}
+
+        def prepare() -> None:
+            state["raw"] = [copy.deepcopy(case["raw_output"]) for case in cases]
+
+        def run() -> None:
+            for case, raw in zip(cases, state["raw"]):
+                fn(case, raw)
+
+        run.items = len(cases)
+        run.prepare = prepare
+        return run
+
+    def parse() -> None:
+        for text in serialized:
+            extract_json_from_model_text(text)
+
+    parse.items = len(cases)
+
+    def batch() -> None:
+        for _ in stream_screen(records, screen_record, concurrency=4):
+            pass
+
+    batch.items = len(cases)
+
+    return {
+        "extract_txt": _extract_stage(cases, "txt"),
+        "extract_pdf": _extract_stage(cases, "pdf"),
+        "extract_docx": _extract_stage(cases, "docx"),
+        "ats": each(lambda c: compute_ats_keyword_analysis(c["jd_text"], c["resume_text"])),
+        "cheap_scores": each(lambda c: cheap_scores(c["jd_text"], c["resume_text"])),
+        "minhash": each(lambda c: minhash_signature(c["resume_text"])),
+        "prompt": each(lambda c: build_prompt(c["jd_text"], c["resume_text"])),
+        "parse": parse,
+        "guardrails": with_copies(lambda c, raw: apply_guardrails(c["jd_text"], c["resume_text"], raw)),
+        "finalize": with_copies(lambda c, raw: finalize_output(c["jd_text"], c["resume_text"], raw)),
+        "e2e_single": each(lambda c: run_pipeline(c["jd_text"], c["resume_text"], fanout=False)),
+        "e2e_fanout": each(lambda c: run_pipeline(c["jd_text"], c["resume_text"], fanout=True)),
+        "batch": batch,
+    }
+
+
+def time_stage(run: Callable[[], None], rounds: int) -> Dict[str, Any]:
+    prepare = getattr(run, "prepare", None)
+    if prepare:
+        prepare()
+    run()  # warm-up: imports, regex compilation, lazy caches
+
+    per_item = []
+    for _ in range(rounds):
+        if prepare:
+            prepare()
+        start = time.perf_counter()
+        run()
+        per_item.append((time.perf_counter() - start) / run.items * 1e6)
+
+    per_item.sort()
+    return {
+        "median_us": round(statistics.median(per_item), 2),
+        "min_us": round(per_item[0], 2),
+        "p95_us": round(per_item[min(len(per_item) - 1, int(0.95 * len(per_item)))], 2),
+        "items": run.items,
+        "rounds": rounds,
+    }
+
+
+# ============================================================
+# 2. Results
+# ============================================================
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run_suite(seed: int, count: int, rounds: int, roles: int, bullets: int, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    # End-to-end stages must never reach a real API.
+    os.environ["SCREENER_BACKEND"] = "stub"
+    os.environ.pop("SCREENER_STUB_LATENCY_MS", None)
+    from screener.clients import reset_clients
+
+    reset_clients()
+
+    cases = generate_corpus(seed=seed, count=count, roles=roles, bullets=bullets)
+    results: Dict[str, Any] = {}
+    for name, run in build_stages(cases).items():
+        if only and name not in only:
+            continue
+        if run is None:
+            results[name] = {"skipped": "no input or parser not installed"}
+            continue
+        results[name] = time_stage(run, rounds)
+        print(f"{name:14s} {results[name]['median_us']:>12.1f} us/item", file=sys.stderr)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "count": count,
+            "rounds": rounds,
+            "roles": roles,
+            "bullets": bullets,
+            "timestamp": round(time.time()),
+        },
+        "stages": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], fail_above: Optional[float] = None) -> int:
+    """
+    Prints median timings side by side with current/baseline ratios. Returns
+    1 if any stage's ratio exceeds fail_above, else 0.
+    """
+    if baseline["meta"].get("seed") != current["meta"]["seed"] or baseline["meta"].get("count") != current["meta"]["count"]:
+        print("warning: baseline was run with a different corpus (seed/count)", file=sys.stderr)
+
+    regressions = 0
+    print(f"{'stage':14s} {'baseline':>12s} {'current':>12s} {'ratio':>7s}")
+    for name, stats in current["stages"].items():
+        before = baseline["stages"].get(name, {})
+        if "median_us" not in stats or "median_us" not in before:
+            continue
+        ratio = stats["median_us"] / before["median_us"] if before["median_us"] else float("inf")
+        flag = ""
+        if fail_above and ratio > fail_above:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:14s} {before['median_us']:>12.1f} {stats['median_us']:>12.1f} {ratio:>7.2f}{flag}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-stage and end-to-end screening benchmarks.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--count", type=int, default=30, help="Resumes in the corpus (default: 30).")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed passes per stage (default: 5).")
+    parser.add_argument("--roles", type=int, default=4, help="Positions per resume (size knob).")
+    parser.add_argument("--bullets", type=int, default=5, help="Lines per position (size knob).")
+    parser.add_argument("--stages", help="Comma-separated subset of stages to run.")
+    parser.add_argument("--out", help="Write results JSON here (default: stdout).")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous results JSON.")
+    parser.add_argument("--fail-above", type=float, help="With --compare, exit 1 if any stage is slower by this ratio.")
+    args = parser.parse_args()
+
+    results = run_suite(
+        args.seed, args.count, args.rounds, args.roles, args.bullets, args.stages.split(",") if args.stages else None
+    )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            sys.exit(compare(json.load(f), results, args.fail_above))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+validator.py
+
+Compares the single-pass validator (screener.validator.validate_output,
+now behind pipeline.finalize_output) with the chain it replaces
+(guardrails, then each sanitize_* function) on the synthetic corpus:
+- full: one full model output per candidate
+- sections: the four fan-out sections per candidate; the chain also pays
+  for the deep copy finalize_section needed before guardrails edited in place
+
+Outputs are checked to be identical before anything is timed. The chain's
+inputs are deep-copied outside the timed region.
+
+Usage:
+    python -m benchmarks.validator [--count 200] [--rounds 5]
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.corpus import generate_corpus
+from screener.llm_prompts import SECTION_ORDER, merge_section_outputs
+from screener.pipeline import finalize_output_chain
+from screener.validator import validate_output
+
+
+def _time(run: Callable[[], None], prepare: Callable[[], None], rounds: int, items: int) -> float:
+    prepare()
+    run()  # warm-up
+    samples = []
+    for _ in range(rounds):
+        prepare()
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) / items * 1e6)
+    return round(statistics.median(samples), 2)
+
+
+def measure(count: int, rounds: int, seed: int) -> Dict[str, Any]:
+    cases = generate_corpus(seed=seed, count=count, formats=["txt"])
+    sections = [
+        (case, merge_section_outputs({section: case["raw_output"]}))
+        for case in cases
+        for section in SECTION_ORDER
+    ]
+
+    for case in cases:
+        expected = finalize_output_chain(case["jd_text"], case["resume_text"], copy.deepcopy(case["raw_output"]))
+        assert validate_output(case["jd_text"], case["resume_text"], case["raw_output"]) == expected
+
+    state: Dict[str, List[Any]] = {}
+
+    def copies() -> None:
+        state["full"] = [copy.deepcopy(case["raw_output"]) for case in cases]
+
+    def nothing() -> None:
+        pass
+
+    def chain_full() -> None:
+        for case, raw in zip(cases, state["full"]):
+            finalize_output_chain(case["jd_text"], case["resume_text"], raw)
+
+    def validator_full() -> None:
+        for case in cases:
+            validate_output(case["jd_text"], case["resume_text"], case["raw_output"])
+
+    def chain_sections() -> None:
+        for case, owned in sections:
+            finalize_output_chain(case["jd_text"], case["resume_text"], copy.deepcopy(owned))
+
+    def validator_sections() -> None:
+        for case, owned in sections:
+            validate_output(case["jd_text"], case["resume_text"], owned)
+
+    full = {
+        "chain_us": _time(chain_full, copies, rounds, len(cases)),
+        "validator_us": _time(validator_full, nothing, rounds, len(cases)),
+    }
+    per_section = {
+        "chain_us": _time(chain_sections, nothing, rounds, len(sections)),
+        "validator_us": _time(validator_sections, nothing, rounds, len(sections)),
+    }
+    for stats in (full, per_section):
+        stats["speedup"] = round(stats["chain_us"] / stats["validator_us"], 2)
+    return {"count": count, "rounds": rounds, "full": full, "sections": per_section}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Single-pass validator vs the guardrails + sanitize chain.")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.count, args.rounds, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+variants.py
+
+Fuzzy ATS matching (screener.variants) on the synthetic corpus:
+- recall: each resume is rewritten with variants of its words (aliases
+  such as "k8s", inflections such as "managed" -> "management", and
+  adjacent-letter swaps in long words); reports how many JD keywords the
+  exact match loses and how many fuzzy matching recovers
+- latency: compute_ats_keyword_analysis per resume, exact vs fuzzy, with
+  the index's memo cold (first pass) and warm; and cascade.cheap_scores
+  (the per-resume first pass of a top-K cascade), exact vs fuzzy
+- index build time (ats_dictionary only, and with the corpus counts)
+
+Usage:
+    python -m benchmarks.variants [--count 200] [--rounds 5]
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Any, Callable, Dict
+
+from benchmarks.corpus import generate_corpus
+from screener.cascade import cheap_scores
+from screener.util import compute_ats_keyword_analysis
+from screener.variants import ALIASES, build_index, corpus_counts, default_index
+
+_INFLECTIONS = (("ing", "ed"), ("ed", "ing"), ("ment", "ed"), ("s", ""), ("e", "ing"))
+_REVERSE_ALIASES = {target: alias for alias, target in ALIASES.items()}
+
+
+def _variant(word: str, rng: random.Random) -> str:
+    lower = word.lower()
+    if lower in _REVERSE_ALIASES:
+        return _REVERSE_ALIASES[lower]
+    choice = rng.random()
+    if choice < 0.5:
+        for suffix, replacement in _INFLECTIONS:
+            if lower.endswith(suffix) and len(lower) > len(suffix) + 4:
+                return lower[: -len(suffix)] + replacement
+    if len(lower) >= 7:
+        i = rng.randrange(1, len(lower) - 2)
+        return lower[:i] + lower[i + 1] + lower[i] + lower[i + 2:]
+    return word
+
+
+def perturb(resume_text: str, rng: random.Random, rate: float = 0.3) -> str:
+    def replace(match: "re.Match[str]") -> str:
+        return _variant(match.group(0), rng) if rng.random() < rate else match.group(0)
+
+    return re.sub(r"[A-Za-z]{4,}", replace, resume_text)
+
+
+def _time_us(fn: Callable[[], None], rounds: int, items: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) / items * 1e6)
+    return round(statistics.median(samples), 2)
+
+
+def measure(count: int, rounds: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    cases = generate_corpus(seed=seed, count=count, formats=["txt"])
+    pairs = [(case["jd_text"], perturb(case["resume_text"], rng)) for case in cases]
+
+    lost = recovered = 0
+    for case, (jd_text, resume_text) in zip(cases, pairs):
+        original = set(compute_ats_keyword_analysis(jd_text, case["resume_text"])["resume_keywords"])
+        exact = set(compute_ats_keyword_analysis(jd_text, resume_text)["resume_keywords"])
+        fuzzy = compute_ats_keyword_analysis(jd_text, resume_text, fuzzy=True)
+        lost += len(original - exact)
+        recovered += len((original - exact) & set(fuzzy["variant_matches"]))
+
+    start = time.perf_counter()
+    build_index()
+    dictionary_ms = (time.perf_counter() - start) * 1000
+    counts = corpus_counts(text for pair in pairs for text in pair)
+    start = time.perf_counter()
+    build_index(counts)
+    corpus_ms = (time.perf_counter() - start) * 1000
+
+    def run(fuzzy: bool) -> Callable[[], None]:
+        def go() -> None:
+            for jd_text, resume_text in pairs:
+                compute_ats_keyword_analysis(jd_text, resume_text, fuzzy)
+        return go
+
+    def run_cheap(fuzzy: bool) -> Callable[[], None]:
+        def go() -> None:
+            for jd_text, resume_text in pairs:
+                cheap_scores(jd_text, resume_text, fuzzy_ats=fuzzy)
+        return go
+
+    index = default_index()
+    index._memo.clear()
+    start = time.perf_counter()
+    run(True)()
+    cold_us = (time.perf_counter() - start) / count * 1e6
+
+    return {
+        "count": count,
+        "keywords_lost_to_variants": lost,
+        "recovered_by_fuzzy": recovered,
+        "recall_pct": round(100 * recovered / lost, 1) if lost else None,
+        "ats_us": {
+            "exact": _time_us(run(False), rounds, count),
+            "fuzzy_cold": round(cold_us, 2),
+            "fuzzy_warm": _time_us(run(True), rounds, count),
+        },
+        "cheap_scores_us": {
+            "exact": _time_us(run_cheap(False), rounds, count),
+            "fuzzy": _time_us(run_cheap(True), rounds, count),
+        },
+        "index_build_ms": {"dictionary": round(dictionary_ms, 2), "with_corpus": round(corpus_ms, 2)},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fuzzy ATS keyword matching: recall and latency.")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(measure(args.count, args.rounds, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+workers.py
+
+Worker startup and memory of the pre-warmed extraction pool
+(screener.workers.warm_pool) against a cold spawn pool.
+
+Each mode runs in a fresh interpreter, so neither starts with anything
+imported or a forkserver running. Per mode, for a pool of --workers
+workers that each screen one corpus resume (PDF and DOCX alternating):
+- first_pool_ms: from creating the pool until every task is done; for the
+  warm pool this includes starting the forkserver and its preload
+- next_pool_ms: the same for a second pool in that process, which is what
+  every pool after the first costs
+- first_task_ms: median of each worker's first screen_document call,
+  including any imports it had to do
+- worker_mb: median per-worker rss, pss (shared pages split between the
+  processes sharing them) and private (pages no other process shares),
+  after the first task; Linux only
+
+Usage:
+    python -m benchmarks.workers [--workers 4] [--hold 0.2]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+MODES = ("cold", "warm")
+
+
+def _memory_mb() -> Dict[str, float]:
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return {}
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {"rss": fields.get("Rss", 0) / 1024, "pss": fields.get("Pss", 0) / 1024, "private": private / 1024}
+
+
+def probe(jd_text: str, document: Any, hold_s: float) -> Dict[str, Any]:
+    """
+    One worker task: screen a document, then report timing and memory.
+    Holding the worker for hold_s keeps the next task on another worker.
+    """
+    preloaded = "pypdf" in sys.modules
+    start = time.perf_counter()
+    from screener.batch import screen_document
+
+    screen_document(jd_text, document)
+    task_ms = (time.perf_counter() - start) * 1000
+    done_at = time.time()
+    memory = _memory_mb()
+    time.sleep(hold_s)
+    return {"pid": os.getpid(), "preloaded": preloaded, "task_ms": task_ms, "done_at": done_at, **memory}
+
+
+def _run_pool(mode: str, workers: int, documents: List[Any], jd_text: str, hold_s: float) -> Dict[str, Any]:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    from screener.workers import warm_pool
+
+    created = time.time()
+    if mode == "warm":
+        pool = warm_pool(workers)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+    with pool:
+        results = list(pool.map(probe, [jd_text] * workers, documents, [hold_s] * workers))
+
+    first: Dict[int, Dict[str, Any]] = {}
+    for result in results:
+        first.setdefault(result["pid"], result)
+    per_worker = list(first.values())
+    report: Dict[str, Any] = {
+        "pool_ms": round((max(r["done_at"] for r in results) - created) * 1000, 1),
+        "workers_seen": len(per_worker),
+        "preloaded_workers": sum(r["preloaded"] for r in per_worker),
+        "first_task_ms": round(statistics.median(r["task_ms"] for r in per_worker), 1),
+    }
+    if "rss" in per_worker[0]:
+        report["worker_mb"] = {
+            key: round(statistics.median(r[key] for r in per_worker), 1) for key in ("rss", "pss", "private")
+        }
+    return report
+
+
+def run_mode(mode: str, workers: int, hold_s: float, seed: int) -> Dict[str, Any]:
+    from benchmarks.corpus import generate_corpus
+
+    cases = generate_corpus(seed=seed, count=workers, formats=["pdf", "docx"])
+    documents = [(case["id"], case["mime_type"], case["resume_bytes"]) for case in cases]
+    jd_text = cases[0]["jd_text"]
+
+    first = _run_pool(mode, workers, documents, jd_text, hold_s)
+    second = _run_pool(mode, workers, documents, jd_text, hold_s)
+    return {
+        "first_pool_ms": first["pool_ms"],
+        "next_pool_ms": second["pool_ms"],
+        "workers_seen": first["workers_seen"],
+        "preloaded_workers": first["preloaded_workers"],
+        "first_task_ms": first["first_task_ms"],
+        "worker_mb": first.get("worker_mb"),
+    }
+
+
+def measure(workers: int, hold_s: float, seed: int) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"workers": workers, "cpus": os.cpu_count()}
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.workers", "--mode", mode,
+             "--workers", str(workers), "--hold", str(hold_s), "--seed", str(seed)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        report[mode] = json.loads(out.stdout)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-warmed vs cold worker pool startup and memory.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--hold", type=float, default=0.2, help="Seconds each task holds its worker (default: 0.2).")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.workers, args.hold, args.seed)))
+    else:
+        print(json.dumps(measure(args.workers, args.hold, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+screener
+
+Headless screening core used by the Streamlit app:
+- file extraction and ATS keyword analysis (util)
+- prompts and output schema (llm_prompts)
+- guardrails and sanitization
+- model orchestration (pipeline)
+
+Nothing here imports Streamlit. Public names are resolved lazily, and pypdf,
+python-docx and google.generativeai are imported on first use, so
+`from screener.util import compute_ats_keyword_analysis` stays cheap.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "ModelOutputError": "screener.pipeline",
+    "apply_guardrails": "screener.guardrails",
+    "call_model": "screener.pipeline",
+    "compute_ats_keyword_analysis": "screener.util",
+    "extract_text_from_uploaded_file": "screener.util",
+    "iter_sections": "screener.pipeline",
+    "run_pipeline": "screener.pipeline",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'screener' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
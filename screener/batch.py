@@ -0,0 +1,363 @@
+"""
+batch.py
+
+Batch screening helpers:
+- extract + ATS-score many resumes against one job description in parallel
+- rank candidates by cheap ATS/dictionary scores
+- stream JSONL screening records through the full pipeline
+
+Extraction (pypdf / python-docx) is CPU-bound pure Python, so ranking
+spreads documents over a pre-warmed process pool (workers.py). Streaming
+is dominated by model latency and uses a thread pool with a bounded
+number of records in flight.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from screener.cascade import Cascade, cheap_scores
+from screener.dedupe import DedupeCache, minhash_signature
+from screener.memory import MemoryCeiling
+from screener.metrics import RECORDS, span
+from screener.usage import BudgetExhausted, TokenBudget, TokenUsage, estimate_analysis_tokens
+from screener.util import (
+    compute_ats_keyword_analysis,
+    content_hash,
+    extract_text_from_bytes,
+    extract_text_from_path,
+)
+from screener.workers import warm_pool
+
+# (name, mime type, raw bytes)
+Document = Tuple[str, str, bytes]
+
+
+# ============================================================
+# 1. Ranking
+# ============================================================
+
+
+def new_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool for extraction. Workers are forked from a pre-warmed
+    forkserver (workers.warm_pool), so they start with the parsers and
+    matching tables loaded; safe to create from a multi-threaded host such
+    as the Streamlit server.
+    """
+    return warm_pool(max_workers)
+
+
+def screen_document(jd_text: str, document: Document, fuzzy_ats: bool = False) -> Dict[str, Any]:
+    """
+    Extracts one resume and scores it against the JD. Runs in a worker process.
+    """
+    name, mime_type, data = document
+    text = extract_text_from_bytes(data, mime_type)
+    ats = compute_ats_keyword_analysis(jd_text, text, fuzzy_ats)
+    return {
+        "name": name,
+        "resume_hash": content_hash(data),
+        "text": text,
+        "ats": ats,
+        "scores": cheap_scores(jd_text, text, ats),
+        "signature": minhash_signature(text),
+    }
+
+
+def rank_resumes(
+    jd_text: str,
+    documents: Sequence[Document],
+    executor: Optional[Executor] = None,
+    fuzzy_ats: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Extracts and scores every document in parallel and returns one row per
+    document, best combined ATS/dictionary score first. Rows whose text
+    could not be extracted sort last. fuzzy_ats also counts keyword
+    variants (variants.py) as ATS matches.
+    """
+    if not documents:
+        return []
+
+    own_executor = executor is None
+    if own_executor:
+        executor = new_process_pool(min(len(documents), os.cpu_count() or 1))
+    try:
+        rows = list(
+            executor.map(screen_document, [jd_text] * len(documents), documents, [fuzzy_ats] * len(documents))
+        )
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    rows.sort(key=lambda row: (bool(row["text"].strip()), row["scores"]["combined"]), reverse=True)
+    return rows
+
+
+# ============================================================
+# 2. Streaming records
+# ============================================================
+#
+# A record is one JSON object per line:
+#   {"id": "...", "jd_text" | "jd_path": "...", "resume_text" | "resume_path": "..."}
+# and produces one result line:
+#   {"id": "...", "status": "ok" | "error" | "skipped", "output": {...}, "error": "...", "elapsed_ms": ...}
+# "output" has the full pipeline shape, or only "ats_keyword_analysis" in
+# ATS-only mode or for candidates stopped by a cascade (which adds
+# "cascade"). Results reused from a near-duplicate resume also carry
+# "duplicate_of" (see dedupe.py); results that called the model carry
+# "usage". Every result with texts carries "requisition": the record's
+# optional "requisition" field, else a hash of its JD; usage reports and
+# columnar.py group by it. "skipped" means a token budget could not cover
+# the record.
+
+def read_jsonl(fp: IO[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yields records from a JSONL stream. Records without an id get
+    "line-<n>"; malformed lines become records carrying an "_invalid" message
+    so they still produce an error result.
+    """
+    for lineno, line in enumerate(fp, start=1):
+        record = _parse_line(line, lineno)
+        if record is not None:
+            yield record
+
+
+def _parse_line(line: str, lineno: int) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError("record is not a JSON object")
+    except ValueError as e:
+        return {"id": f"line-{lineno}", "_invalid": str(e)}
+    record.setdefault("id", f"line-{lineno}")
+    return record
+
+
+def read_jsonl_sorted(path: str, key: Callable[[Dict[str, Any]], Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the records of a JSONL file in key(record) order. Only (key,
+    offset, line number) per record is held: a first pass scores every
+    line, a second seeks back to each one in sorted order.
+    """
+    index = []
+    with open(path, "rb") as f:
+        lineno = 0
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            lineno += 1
+            record = _parse_line(line.decode("utf-8"), lineno)
+            if record is not None:
+                index.append((key(record), offset, lineno))
+
+    index.sort(key=lambda item: item[0])
+    with open(path, "rb") as f:
+        for _, offset, lineno in index:
+            f.seek(offset)
+            yield _parse_line(f.readline().decode("utf-8"), lineno)
+
+
+def write_jsonl(fp: IO[str], result: Dict[str, Any]) -> None:
+    fp.write(json.dumps(result, ensure_ascii=False) + "\n")
+    fp.flush()
+
+
+def load_record_text(record: Dict[str, Any], field: str) -> str:
+    """
+    Returns record["<field>_text"], or the extracted text of record["<field>_path"].
+    """
+    text = record.get(f"{field}_text")
+    if text is not None:
+        return str(text)
+    path = record.get(f"{field}_path")
+    if path:
+        return extract_text_from_path(str(path))
+    return ""
+
+
+def screen_record(
+    record: Dict[str, Any],
+    fanout: bool = False,
+    ats_only: bool = False,
+    dedupe: Optional[DedupeCache] = None,
+    cascade: Optional[Cascade] = None,
+    budget: Optional[TokenBudget] = None,
+    focused: bool = False,
+    fuzzy_ats: bool = False,
+    depth: str = "full",
+) -> Dict[str, Any]:
+    """
+    Screens one record end to end. Never raises; failures become an
+    error result carrying the record id.
+
+    Results that called the model carry "usage" (tokens, cost and the
+    requisition they count towards). With a TokenBudget, the analysis's
+    worst-case tokens are reserved first; a record the budget cannot cover
+    gets status "skipped".
+
+    With a Cascade, candidates that miss its thresholds or top-K cut get
+    only the ATS analysis plus a "cascade" entry, and no model call. With a
+    DedupeCache, a resume that nearly matches one already analysed for the
+    same JD reuses that analysis instead of calling the model. focused=True
+    sends the model only the resume segments each prompt needs; fuzzy_ats
+    counts keyword variants as ATS matches (variants.py); depth picks the
+    analysis tier (llm_prompts.DEPTHS).
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"id": record.get("id"), "status": "ok"}
+    try:
+        if "_invalid" in record:
+            raise ValueError(f"invalid JSON record: {record['_invalid']}")
+
+        with span("extract"):
+            jd_text = load_record_text(record, "jd")
+            resume_text = load_record_text(record, "resume")
+        if not jd_text.strip():
+            raise ValueError("missing job description text")
+        if not resume_text.strip():
+            raise ValueError("missing resume text")
+        result["requisition"] = str(record.get("requisition") or content_hash(jd_text)[:12])
+
+        outcome = _run_stages(
+            record, result, jd_text, resume_text, fanout, ats_only, dedupe, cascade, budget, focused, fuzzy_ats, depth
+        )
+    except BudgetExhausted as e:
+        result["status"] = "skipped"
+        result["error"] = f"token budget: {e}"
+        outcome = "budget_skipped"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        outcome = "error"
+    RECORDS.inc(outcome=outcome)
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def _run_stages(
+    record, result, jd_text, resume_text, fanout, ats_only, dedupe, cascade, budget, focused, fuzzy_ats, depth
+) -> str:
+    """
+    Fills result["output"] and returns which path produced it (the outcome
+    label of screener_records_total).
+    """
+    from screener.pipeline import run_pipeline
+
+    if ats_only:
+        with span("ats"):
+            result["output"] = {"ats_keyword_analysis": compute_ats_keyword_analysis(jd_text, resume_text, fuzzy_ats)}
+        return "ats_only"
+
+    if cascade is not None:
+        with span("cascade"):
+            ats = compute_ats_keyword_analysis(jd_text, resume_text, fuzzy_ats)
+            scores = cheap_scores(jd_text, resume_text, ats)
+            admitted = cascade.admit(record.get("id"), scores, record.get("label"))
+        result["cascade"] = {"scores": scores, "admitted": admitted}
+        if not admitted:
+            result["output"] = {"ats_keyword_analysis": ats}
+            return "cascade_rejected"
+
+    if dedupe is not None:
+        with span("dedupe"):
+            match = dedupe.lookup(jd_text, resume_text, depth, fanout, focused)
+            if match is not None:
+                result["output"], result["duplicate_of"] = dedupe.reuse(jd_text, resume_text, match, fuzzy_ats)
+        if match is not None:
+            return "duplicate"
+
+    reservation = 0
+    if budget is not None:
+        reservation = budget.reserve(estimate_analysis_tokens(jd_text, resume_text, fanout, focused, depth))
+    usage = TokenUsage()
+    try:
+        result["output"] = run_pipeline(
+            jd_text, resume_text, fanout=fanout, usage=usage, focused=focused, fuzzy_ats=fuzzy_ats, depth=depth
+        )
+    finally:
+        if budget is not None:
+            budget.settle(reservation, usage.total_tokens)
+        if usage.calls:
+            result["usage"] = usage.as_dict()
+            result["usage"]["requisition"] = result["requisition"]
+    if dedupe is not None:
+        dedupe.remember(jd_text, resume_text, record.get("id"), result["output"], depth, fanout, focused)
+    return "model"
+
+
+def estimate_record_tokens(
+    record: Dict[str, Any], fanout: bool = False, focused: bool = False, depth: str = "full"
+) -> int:
+    """
+    Worst-case model tokens for a record (0 if it cannot be screened), used
+    to order budgeted runs cheapest first.
+    """
+    try:
+        jd_text = load_record_text(record, "jd")
+        resume_text = load_record_text(record, "resume")
+    except Exception:
+        return 0
+    if "_invalid" in record or not jd_text.strip() or not resume_text.strip():
+        return 0
+    return estimate_analysis_tokens(jd_text, resume_text, fanout, focused, depth)
+
+
+def score_record(record: Dict[str, Any], fuzzy_ats: bool = False) -> Dict[str, Any]:
+    """
+    Cheap cascade scores for one record (first pass of a top-K cascade).
+    """
+    try:
+        jd_text = load_record_text(record, "jd")
+        resume_text = load_record_text(record, "resume")
+    except Exception:
+        return {"id": record.get("id"), "scores": None}
+    if "_invalid" in record or not jd_text.strip() or not resume_text.strip():
+        return {"id": record.get("id"), "scores": None}
+    return {"id": record.get("id"), "scores": cheap_scores(jd_text, resume_text, fuzzy_ats=fuzzy_ats)}
+
+
+def stream_screen(
+    records: Iterable[Dict[str, Any]],
+    screen: Callable[[Dict[str, Any]], Dict[str, Any]] = screen_record,
+    concurrency: int = 4,
+    ceiling: Optional[MemoryCeiling] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Runs screen() over records with at most `concurrency` records in flight
+    and yields results in completion order. Records are pulled from the
+    iterable only as slots free up, so memory does not grow with input size.
+
+    With a MemoryCeiling, a record is only admitted while RSS is under the
+    limit; above it, in-flight records drain to one at a time and the
+    ceiling's release callbacks run before the next record starts.
+    """
+    concurrency = max(1, concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="screener-batch") as executor:
+        pending = set()
+        for record in records:
+            limit = concurrency
+            if ceiling is not None and ceiling.over():
+                ceiling.relieve()
+                limit = 1
+            while len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(screen, record))
+            # Drop the loop's own reference so a finished record's text is
+            # freed as soon as its result has been yielded.
+            record = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,201 @@
+"""
+cascade.py
+
+ATS-gated screening cascade: cheap scoring first, the model only for
+promising candidates.
+
+Stage 1 (free): ATS keyword match (util.compute_ats_keyword_analysis) and a
+dictionary match over the skills, tools and certifications in
+ats_dictionary that the JD asks for.
+Stage 2 (gate): minimum-score thresholds, optionally followed by a top-K
+cutoff on the combined score.
+Stage 3 (expensive): the full model analysis for admitted candidates.
+
+CascadeReport counts the model calls saved and keeps score histograms of
+admitted vs. rejected candidates. When records carry a truthy/falsy
+"label" (e.g. recruiter decision), it also reports recall and a threshold
+sweep, so thresholds can be tuned against recall.
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from screener.ats_dictionary import CERTIFICATIONS, SKILLS, TOOLS
+
+_TOKEN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+
+def _normalize(text: str) -> str:
+    # Space-padded token stream, so phrases match on whole-token boundaries.
+    return " " + " ".join(_TOKEN.findall(text.lower())) + " "
+
+
+DICTIONARY_TERMS = tuple(sorted({_normalize(term) for term in SKILLS + TOOLS + CERTIFICATIONS}))
+
+
+# ============================================================
+# 1. Cheap scores
+# ============================================================
+
+def dictionary_match(jd_text: str, resume_text: str) -> Dict[str, Any]:
+    """
+    Dictionary terms requested by the JD and how many the resume contains.
+    Score is 0-100 (0 when the JD mentions no dictionary terms).
+    """
+    jd = _normalize(jd_text)
+    resume = _normalize(resume_text)
+    required = [term for term in DICTIONARY_TERMS if term in jd]
+    matched = [term for term in required if term in resume]
+    return {
+        "required_terms": [t.strip() for t in required],
+        "matched_terms": [t.strip() for t in matched],
+        "score": int(len(matched) / len(required) * 100) if required else 0,
+    }
+
+
+def cheap_scores(
+    jd_text: str,
+    resume_text: str,
+    ats: Optional[Dict[str, Any]] = None,
+    fuzzy_ats: bool = False,
+) -> Dict[str, int]:
+    from screener.util import compute_ats_keyword_analysis
+
+    ats = ats if ats is not None else compute_ats_keyword_analysis(jd_text, resume_text, fuzzy_ats)
+    dictionary = dictionary_match(jd_text, resume_text)
+    return {
+        "ats": int(ats.get("match_score", 0)),
+        "dictionary": dictionary["score"],
+        # The dictionary score carries more signal when the JD uses dictionary
+        # terms; fall back to ATS alone when it uses none.
+        "combined": (int(ats.get("match_score", 0)) + dictionary["score"]) // 2
+        if dictionary["required_terms"]
+        else int(ats.get("match_score", 0)),
+    }
+
+
+# ============================================================
+# 2. Report
+# ============================================================
+
+def _histogram(values: Iterable[int], width: int = 10) -> Dict[str, int]:
+    bins = {f"{lo}-{min(lo + width - 1, 100)}": 0 for lo in range(0, 101, width)}
+    for v in values:
+        lo = min(max(int(v), 0), 100) // width * width
+        bins[f"{lo}-{min(lo + width - 1, 100)}"] += 1
+    return bins
+
+
+class CascadeReport:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.admitted: List[Dict[str, Any]] = []
+        self.rejected: List[Dict[str, Any]] = []
+
+    def record(self, scores: Dict[str, int], admitted: bool, reason: str, label: Any = None) -> None:
+        entry = {"combined": scores["combined"], "ats": scores["ats"], "dictionary": scores["dictionary"], "reason": reason, "label": label}
+        with self._lock:
+            (self.admitted if admitted else self.rejected).append(entry)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            admitted, rejected = list(self.admitted), list(self.rejected)
+
+        report: Dict[str, Any] = {
+            "candidates": len(admitted) + len(rejected),
+            "model_calls": len(admitted),
+            "model_calls_saved": len(rejected),
+            "rejected_by": {},
+            "histograms": {},
+        }
+        for entry in rejected:
+            report["rejected_by"][entry["reason"]] = report["rejected_by"].get(entry["reason"], 0) + 1
+        for score in ("combined", "ats", "dictionary"):
+            report["histograms"][score] = {
+                "admitted": _histogram(e[score] for e in admitted),
+                "rejected": _histogram(e[score] for e in rejected),
+            }
+
+        labelled = [e for e in admitted + rejected if e["label"] is not None]
+        positives = [e for e in labelled if e["label"]]
+        if positives:
+            report["recall"] = round(sum(1 for e in admitted if e["label"]) / len(positives), 3)
+            report["threshold_sweep"] = [
+                {
+                    "min_combined": t,
+                    "pass_rate": round(sum(1 for e in labelled if e["combined"] >= t) / len(labelled), 3),
+                    "recall": round(sum(1 for e in positives if e["combined"] >= t) / len(positives), 3),
+                }
+                for t in range(0, 101, 10)
+            ]
+        return report
+
+
+# ============================================================
+# 3. Cascade
+# ============================================================
+
+class Cascade:
+    """
+    Gate in front of the model. admit() applies the thresholds; when top_k is
+    set, set_top_k_ids() must be given the ids that survived a first,
+    scores-only pass (see rank_top_k()).
+    """
+
+    def __init__(self, min_ats: int = 0, min_dictionary: int = 0, min_combined: int = 0, top_k: Optional[int] = None):
+        self.min_ats = min_ats
+        self.min_dictionary = min_dictionary
+        self.min_combined = min_combined
+        self.top_k = top_k
+        self.report = CascadeReport()
+        self._top_k_ids: Optional[Set[Any]] = None
+
+    def passes_thresholds(self, scores: Dict[str, int]) -> Optional[str]:
+        """
+        None when every threshold is met, else the name of the first one missed.
+        """
+        if scores["ats"] < self.min_ats:
+            return "min_ats"
+        if scores["dictionary"] < self.min_dictionary:
+            return "min_dictionary"
+        if scores["combined"] < self.min_combined:
+            return "min_combined"
+        return None
+
+    def set_top_k_ids(self, ids: Iterable[Any]) -> None:
+        self._top_k_ids = set(ids)
+
+    def admit(self, record_id: Any, scores: Dict[str, int], label: Any = None) -> bool:
+        reason = self.passes_thresholds(scores)
+        if reason is None and self._top_k_ids is not None and record_id not in self._top_k_ids:
+            reason = "top_k"
+        self.report.record(scores, reason is None, reason or "", label)
+        return reason is None
+
+    def replay(self, scores: Dict[str, int], admitted: bool, label: Any = None) -> None:
+        """
+        Records a decision made by an earlier run (e.g. a result served from
+        a checkpoint) in the report. Only threshold rejections are replayed:
+        top-K ones depend on the whole input set and are decided again.
+        """
+        self.report.record(scores, admitted, "" if admitted else self.passes_thresholds(scores) or "top_k", label)
+
+    def is_final(self, result: Dict[str, Any]) -> bool:
+        """
+        False for a screen_record result that met the thresholds but was
+        outside the top K: that depends on the whole input set, so it is
+        not worth keeping (e.g. in a checkpoint).
+        """
+        decision = result.get("cascade")
+        return not decision or decision["admitted"] or self.passes_thresholds(decision["scores"]) is not None
+
+    def rank_top_k(self, scored: Iterable[Any]) -> List[Any]:
+        """
+        Given (record_id, scores) pairs from a first pass, returns the ids of
+        the top_k candidates by combined score among those meeting the
+        thresholds. Only ids and scores are held, never texts.
+        """
+        passing = [(scores["combined"], record_id) for record_id, scores in scored if self.passes_thresholds(scores) is None]
+        passing.sort(key=lambda pair: pair[0], reverse=True)
+        return [record_id for _, record_id in passing[: self.top_k]]
@@ -0,0 +1,246 @@
+"""
+cassette.py
+
+Record/replay of model calls, for regression runs and throughput
+benchmarks with realistic model outputs on a machine without network:
+
+    SCREENER_BACKEND=record SCREENER_CASSETTE=calls.jsonl.gz python -m screener screen ...
+    SCREENER_BACKEND=replay SCREENER_CASSETTE=calls.jsonl.gz python -m screener screen ...
+
+record wraps the real backend (SCREENER_RECORD_BACKEND, default gemini)
+and appends every generate_content call to the cassette: the response
+text, its latency and the API-reported token counts, keyed by a hash of
+model name, prompt and generation config. Prompts are not stored.
+
+replay answers from the cassette only. Each call sleeps for its recorded
+latency times SCREENER_REPLAY_LATENCY_SCALE (default 1; 0 for none), and a
+call that was never recorded raises CassetteMiss. Responses and latencies
+depend only on the call, not on timing or thread order, so replayed runs
+are repeatable.
+
+Cassettes are JSON lines, gzip-compressed when the path ends in .gz.
+Recording into an existing cassette only adds calls it does not have yet;
+the first response recorded for a key is the one replayed.
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CASSETTE_ENV = "SCREENER_CASSETTE"
+RECORD_BACKEND_ENV = "SCREENER_RECORD_BACKEND"
+LATENCY_SCALE_ENV = "SCREENER_REPLAY_LATENCY_SCALE"
+FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+_cassettes: Dict[str, "Cassette"] = {}
+
+
+class CassetteMiss(LookupError):
+    """
+    A replayed call that is not in the cassette.
+    """
+
+
+def call_key(model_name: str, prompt: str, generation_config: Any = None) -> str:
+    config = json.dumps(generation_config, sort_keys=True, default=str)
+    data = "\0".join((model_name, prompt, config)).encode("utf-8", errors="surrogatepass")
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+# ============================================================
+# 1. Cassette file
+# ============================================================
+
+class Cassette:
+    """
+    Recorded calls by key, loaded from `path` when it exists. add() appends
+    each new call to the file as it is made, so an interrupted recording
+    keeps every call that finished. Thread-safe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with _open(self.path, "r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if "cassette" in entry:
+                        if entry["cassette"] != FORMAT_VERSION:
+                            raise ValueError(f"{self.path}: unsupported cassette format {entry['cassette']!r}")
+                        continue
+                    self.entries.setdefault(entry["key"], entry)
+        except EOFError:
+            # A gzip cassette whose recording was killed has no trailer;
+            # every line before that point is intact.
+            pass
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+    def add(self, entry: Dict[str, Any]) -> bool:
+        """
+        Stores and appends a call unless its key is already recorded.
+        Returns True if it was new.
+        """
+        with self._lock:
+            if entry["key"] in self.entries:
+                return False
+            self.entries[entry["key"]] = entry
+            if self._file is None:
+                self._file = _open(self.path, "a")
+                self._file.write(json.dumps({"cassette": FORMAT_VERSION}) + "\n")
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def open_cassette(path: Optional[str] = None) -> Cassette:
+    """
+    The process-wide Cassette for `path` (default: $SCREENER_CASSETTE),
+    shared by every model object that records into or replays from it.
+    """
+    path = path or os.getenv(CASSETTE_ENV)
+    if not path:
+        raise RuntimeError(f"Set {CASSETTE_ENV} to a cassette file for the record and replay backends.")
+    key = os.path.abspath(path)
+    with _lock:
+        cassette = _cassettes.get(key)
+        if cassette is None:
+            cassette = _cassettes[key] = Cassette(path)
+    return cassette
+
+
+@atexit.register
+def close_cassettes() -> None:
+    """
+    Closes every open cassette (writes the gzip trailer). Runs at exit.
+    """
+    with _lock:
+        cassettes = list(_cassettes.values())
+    for cassette in cassettes:
+        cassette.close()
+
+
+# ============================================================
+# 2. Backends
+# ============================================================
+
+class UsageMetadata:
+    __slots__ = ("prompt_token_count", "candidates_token_count")
+
+    def __init__(self, prompt_token_count: int, candidates_token_count: int):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+class CassetteResponse:
+    """
+    A replayed response: .text, and .usage_metadata when the recorded
+    response had API-reported token counts (so usage.TokenUsage counts the
+    same tokens as in the recorded run).
+    """
+
+    def __init__(self, text: str, usage_metadata: Optional[UsageMetadata] = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+def record_backend() -> str:
+    backend = os.getenv(RECORD_BACKEND_ENV, "gemini").strip().lower() or "gemini"
+    if backend in ("record", "replay"):
+        raise ValueError(f"{RECORD_BACKEND_ENV} must be a real backend, not {backend!r}")
+    return backend
+
+
+class RecordingModel:
+    """
+    Passes calls through to `inner` and records each response.
+    """
+
+    def __init__(self, inner: Any, cassette: Cassette, model_name: str):
+        self.inner = inner
+        self.cassette = cassette
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, generation_config: Any = None) -> Any:
+        start = time.perf_counter()
+        response = self.inner.generate_content(prompt, generation_config=generation_config)
+        latency_ms = (time.perf_counter() - start) * 1000
+        try:
+            text = response.text or ""
+        except Exception:
+            # Blocked or empty responses raise on .text; the caller sees
+            # that from the response itself, and nothing is recorded.
+            return response
+
+        entry: Dict[str, Any] = {
+            "key": call_key(self.model_name, prompt, generation_config),
+            "latency_ms": round(latency_ms, 1),
+            "text": text,
+        }
+        meta = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(meta, "prompt_token_count", None)
+        output_tokens = getattr(meta, "candidates_token_count", None)
+        if prompt_tokens and output_tokens is not None:
+            entry["prompt_tokens"] = prompt_tokens
+            entry["output_tokens"] = output_tokens
+        self.cassette.add(entry)
+        return response
+
+
+class ReplayModel:
+    """
+    Serves recorded responses; never touches the network.
+    """
+
+    def __init__(self, cassette: Cassette, model_name: str, latency_scale: Optional[float] = None):
+        self.cassette = cassette
+        self.model_name = model_name
+        if latency_scale is None:
+            latency_scale = float(os.getenv(LATENCY_SCALE_ENV, "1") or 0)
+        self.latency_scale = latency_scale
+
+    def generate_content(self, prompt: str, generation_config: Any = None) -> CassetteResponse:
+        key = call_key(self.model_name, prompt, generation_config)
+        entry = self.cassette.get(key)
+        if entry is None:
+            raise CassetteMiss(
+                f"no recorded call {key} in {self.cassette.path} "
+                f"(model {self.model_name}, prompt of {len(prompt)} chars)"
+            )
+        if self.latency_scale > 0:
+            time.sleep(entry.get("latency_ms", 0.0) * self.latency_scale / 1000.0)
+        usage = None
+        if "prompt_tokens" in entry:
+            usage = UsageMetadata(entry["prompt_tokens"], entry["output_tokens"])
+        return CassetteResponse(entry["text"], usage)
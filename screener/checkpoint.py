@@ -0,0 +1,177 @@
+"""
+checkpoint.py
+
+Durable per-item progress for batch runs, stored in a local SQLite file.
+
+Every record gets an idempotency key derived from the content hashes of its
+JD and resume plus everything else that changes the output (requisition,
+mode, backend, model, prompt and guardrail versions). A restarted run serves finished items from
+the checkpoint and only screens items that are new, failed or were still
+pending when the previous run died.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from screener.clients import current_backend
+from screener.config import MODEL_NAME
+from screener.guardrails import GUARDRAILS_VERSION
+from screener.llm_prompts import PROMPT_VERSION
+from screener.util import content_hash
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key        TEXT PRIMARY KEY,
+    record_id  TEXT,
+    status     TEXT NOT NULL,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    result     TEXT,
+    error      TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+# ============================================================
+# 1. Idempotency keys
+# ============================================================
+
+def field_hash(record: Dict[str, Any], field: str) -> str:
+    """
+    Content hash of record["<field>_text"], or of the raw bytes at
+    record["<field>_path"] (no extraction needed to decide whether to skip).
+    """
+    text = record.get(f"{field}_text")
+    if text is not None:
+        return content_hash(str(text))
+    path = record.get(f"{field}_path")
+    if path:
+        try:
+            with open(str(path), "rb") as f:
+                return content_hash(f.read())
+        except OSError:
+            return ""
+    return ""
+
+
+def record_key(record: Dict[str, Any], mode: str = "") -> str:
+    # The requisition is part of the stored result, and stub and replay
+    # results must never be served to a real run.
+    return content_hash(
+        "\0".join([
+            field_hash(record, "jd"),
+            field_hash(record, "resume"),
+            str(record.get("requisition") or ""),
+            mode,
+            current_backend(),
+            MODEL_NAME,
+            PROMPT_VERSION,
+            GUARDRAILS_VERSION,
+        ])
+    )
+
+
+# ============================================================
+# 2. Store
+# ============================================================
+
+class CheckpointStore:
+    """
+    SQLite-backed item log. Each state change is committed immediately (WAL
+    mode), so progress survives crashes, kills and sleep. One connection is
+    shared by the worker threads behind a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+
+    def get(self, key: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT status, attempts, result FROM items WHERE key = ?", (key,)
+            ).fetchone()
+
+    def mark_pending(self, key: str, record_id: Any) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO items (key, record_id, status, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at
+                """,
+                (key, str(record_id), PENDING, time.time()),
+            )
+
+    def save(self, key: str, result: Dict[str, Any]) -> None:
+        status = DONE if result.get("status") == "ok" else FAILED
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE items
+                SET status = ?, attempts = attempts + 1, result = ?, error = ?, updated_at = ?
+                WHERE key = ?
+                """,
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False) if status == DONE else None,
+                    result.get("error"),
+                    time.time(),
+                    key,
+                ),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def wrap(
+        self,
+        screen: Callable[[Dict[str, Any]], Dict[str, Any]],
+        mode: str = "",
+        keep: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Wraps a screen_record-style function: finished items are answered
+        from the checkpoint (under the current record id); everything else is
+        marked pending, screened, and its outcome recorded. Results that
+        keep() rejects stay pending, so the next run screens them again.
+        """
+
+        def checkpointed(record: Dict[str, Any]) -> Dict[str, Any]:
+            if "_invalid" in record:
+                return screen(record)
+
+            key = record_key(record, mode)
+            row = self.get(key)
+            if row is not None and row[0] == DONE:
+                with self._lock:
+                    self.skipped += 1
+                result = json.loads(row[2])
+                result["id"] = record.get("id")
+                result["from_checkpoint"] = True
+                return result
+
+            self.mark_pending(key, record.get("id"))
+            result = screen(record)
+            if keep is None or keep(result):
+                self.save(key, result)
+            return result
+
+        return checkpointed
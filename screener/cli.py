@@ -0,0 +1,687 @@
+"""
+cli.py
+
+Command-line entry point for headless screening:
+
+    python -m screener screen requests.jsonl -o results.jsonl --concurrency 8
+    python -m screener serve --port 8080
+    python -m screener queue enqueue jobs.db requests.jsonl
+    python -m screener queue work jobs.db --concurrency 8
+    python -m screener results build results.jsonl -o results.parquet
+    python -m screener results summary results.parquet
+    python -m screener variants build records.jsonl -o variants.json
+
+Reads JD/resume records from JSONL (or stdin with "-") and writes one
+result per record as JSONL, in completion order, with the input ids.
+See batch.py for the record format. With --checkpoint, progress is kept
+in SQLite so an interrupted run can simply be started again. The queue
+subcommands share one SQLite job file between any number of worker
+processes (see workqueue.py). The results subcommands convert JSONL
+results into a columnar store and query it (see columnar.py). variants
+build precomputes the keyword variant index for --fuzzy-ats from a corpus
+(see variants.py).
+"""
+
+import argparse
+import json
+import sys
+import time
+import warnings
+from concurrent.futures import Executor
+from functools import partial
+from typing import List, Optional
+
+from screener.batch import (
+    estimate_record_tokens,
+    read_jsonl,
+    read_jsonl_sorted,
+    score_record,
+    screen_record,
+    stream_screen,
+    write_jsonl,
+)
+from screener.cascade import Cascade
+from screener.checkpoint import CheckpointStore
+from screener.dedupe import DedupeCache
+from screener.llm_prompts import DEPTH_PROMPT_VERSION, DEPTHS, FOCUSED_PROMPT_VERSION
+from screener.metrics import MetricsFileWriter
+from screener.usage import TokenBudget, UsageReport
+
+
+# ============================================================
+# 1. screen
+# ============================================================
+
+class MemoryOptions:
+    """
+    --mem-profile and --max-memory-mb for a batch command. With a ceiling,
+    a --dedupe cache moves its stored analyses to a temporary spill file
+    the first time the limit is reached.
+    """
+
+    def __init__(self, args: argparse.Namespace, dedupe: Optional[DedupeCache]):
+        from screener.memory import DiskSpool, MemoryCeiling, MemoryProfiler
+
+        self.profile_path = args.mem_profile
+        self.profiler = MemoryProfiler().start() if args.mem_profile else None
+        self.ceiling = MemoryCeiling(args.max_memory_mb) if args.max_memory_mb else None
+        self.spool = None
+        if self.ceiling is not None and dedupe is not None:
+            def spill() -> None:
+                if self.spool is None:
+                    self.spool = DiskSpool()
+                    moved = dedupe.spill(self.spool)
+                    print(f"memory ceiling reached: moved {moved} dedupe entries to {self.spool.path}", file=sys.stderr)
+
+            self.ceiling.on_pressure(spill)
+
+    def close(self) -> None:
+        if self.profiler is not None:
+            self.profiler.write_report(self.profile_path)
+            self.profiler.stop()
+        if self.spool is not None:
+            self.spool.close()
+
+    def summary(self) -> str:
+        from screener.memory import peak_rss_bytes
+
+        text = f", peak RSS {peak_rss_bytes() / 2 ** 20:.0f} MB"
+        if self.ceiling is not None and self.ceiling.times_over:
+            text += f" (over the ceiling {self.ceiling.times_over} times)"
+        return text
+
+
+def build_cascade(args: argparse.Namespace) -> Optional[Cascade]:
+    if not (args.min_ats or args.min_dictionary or args.min_combined or args.top_k):
+        return None
+    if args.top_k and args.input == "-":
+        raise SystemExit("--top-k needs a file input: it makes a scores-only first pass over the records.")
+
+    cascade = Cascade(
+        min_ats=args.min_ats,
+        min_dictionary=args.min_dictionary,
+        min_combined=args.min_combined,
+        top_k=args.top_k,
+    )
+    if args.top_k:
+        score = partial(score_record, fuzzy_ats=args.fuzzy_ats)
+        with open(args.input, encoding="utf-8") as f:
+            scored = (
+                (item["id"], item["scores"])
+                for item in stream_screen(read_jsonl(f), score, concurrency=args.concurrency)
+                if item["scores"] is not None
+            )
+            cascade.set_top_k_ids(cascade.rank_top_k(scored))
+    return cascade
+
+
+def replay_cascade(screen, cascade: Cascade):
+    """
+    Adds the decisions of results served from a checkpoint to the cascade
+    report, which otherwise only sees the items screened in this run.
+    """
+
+    def replayed(record):
+        result = screen(record)
+        if result.get("from_checkpoint") and result.get("cascade"):
+            cascade.replay(result["cascade"]["scores"], result["cascade"]["admitted"], record.get("label"))
+        return result
+
+    return replayed
+
+
+def build_budget(args: argparse.Namespace) -> Optional[TokenBudget]:
+    if not (args.budget_tokens or args.budget_tokens_per_hour):
+        return None
+    if args.budget_order == "cheapest" and args.input == "-":
+        raise SystemExit("--budget-order cheapest needs a file input: it makes an estimating first pass.")
+    return TokenBudget(
+        per_run=args.budget_tokens,
+        per_hour=args.budget_tokens_per_hour,
+        max_wait_s=args.budget_max_wait,
+    )
+
+
+def start_page_pool(args: argparse.Namespace) -> Optional[Executor]:
+    """
+    --pdf-workers: a warm pool that the pages of large PDFs are split
+    across (see workers.set_page_pool). The caller shuts it down.
+    """
+    if args.pdf_workers < 2:
+        return None
+    from screener.workers import set_page_pool, warm_pool
+
+    pool = warm_pool(args.pdf_workers)
+    set_page_pool(pool, args.pdf_workers)
+    return pool
+
+
+def cmd_screen(args: argparse.Namespace) -> int:
+    dedupe = DedupeCache(threshold=args.dedupe) if args.dedupe else None
+    cascade = build_cascade(args)
+    budget = build_budget(args)
+    screen = partial(
+        screen_record,
+        fanout=args.fanout,
+        ats_only=args.ats_only,
+        dedupe=dedupe,
+        cascade=cascade,
+        budget=budget,
+        focused=args.focused,
+        fuzzy_ats=args.fuzzy_ats,
+        depth=args.depth,
+    )
+    usage = UsageReport()
+    columns = None
+    if args.columnar:
+        from screener.columnar import ResultColumns
+
+        columns = ResultColumns()
+
+    store = None
+    if args.checkpoint:
+        store = CheckpointStore(args.checkpoint)
+        mode = "ats" if args.ats_only else "fanout" if args.fanout else "single"
+        if args.focused and not args.ats_only:
+            mode += f":focused={FOCUSED_PROMPT_VERSION}"
+        if args.depth != "full" and not args.ats_only:
+            mode += f":depth={args.depth},{DEPTH_PROMPT_VERSION}"
+        if args.fuzzy_ats:
+            from screener.variants import default_index_source
+
+            mode += f":fuzzy-ats={default_index_source()}"
+        if args.dedupe and not args.ats_only:
+            # Reused analyses are stored like any other, so the threshold is too.
+            mode += f":dedupe={args.dedupe}"
+        if cascade is not None:
+            # Gated items are stored as finished, so the gate is part of the key.
+            mode += f":cascade={args.min_ats},{args.min_dictionary},{args.min_combined},{args.top_k}"
+        screen = store.wrap(screen, mode=mode, keep=cascade.is_final if cascade is not None else None)
+        if cascade is not None:
+            screen = replay_cascade(screen, cascade)
+        previous = store.counts()
+        if previous:
+            print(f"checkpoint {args.checkpoint}: {previous}", file=sys.stderr)
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    metrics_file = MetricsFileWriter(args.metrics_file) if args.metrics_file else None
+    memory = MemoryOptions(args, dedupe)
+    page_pool = start_page_pool(args)
+
+    if budget is not None and args.budget_order == "cheapest":
+        # Cheapest first: the most candidates fit in the budget.
+        records = read_jsonl_sorted(
+            args.input,
+            partial(estimate_record_tokens, fanout=args.fanout, focused=args.focused, depth=args.depth),
+        )
+    else:
+        records = read_jsonl(infile)
+
+    start = time.perf_counter()
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    try:
+        for result in stream_screen(records, screen, concurrency=args.concurrency, ceiling=memory.ceiling):
+            write_jsonl(outfile, result)
+            counts[result["status"]] += 1
+            usage.add(result)
+            if columns is not None:
+                columns.add(result)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+        if store is not None:
+            store.close()
+        if metrics_file is not None:
+            metrics_file.close()
+        memory.close()
+        if page_pool is not None:
+            page_pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    totals = usage.as_dict()["totals"]
+    print(
+        f"screened {total} records ({counts['ok']} ok, {counts['error']} errors"
+        + (f", {counts['skipped']} over the token budget" if counts["skipped"] else "")
+        + f") in {elapsed:.1f}s"
+        + f", {totals['prompt_tokens'] + totals['output_tokens']} tokens (~${totals['cost_usd']:.4f})"
+        + (f", {store.skipped} served from checkpoint" if store is not None else "")
+        + (f", {dedupe.hits} reused from near-duplicates" if dedupe is not None else "")
+        + (f", {cascade.report.as_dict()['model_calls_saved']} model calls saved by the cascade" if cascade is not None else "")
+        + memory.summary(),
+        file=sys.stderr,
+    )
+    if cascade is not None and args.cascade_report:
+        with open(args.cascade_report, "w", encoding="utf-8") as f:
+            json.dump(cascade.report.as_dict(), f, indent=2)
+    if args.usage_report:
+        report = usage.as_dict()
+        if budget is not None:
+            report["budget"] = budget.as_dict()
+        with open(args.usage_report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if columns is not None:
+        print(f"columnar results: {save_table(columns.table(), args.columnar)}", file=sys.stderr)
+    return 1 if counts["error"] else 0
+
+
+# ============================================================
+# 2. serve
+# ============================================================
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from screener.service import ScreeningService, make_server
+
+    dedupe = DedupeCache(threshold=args.dedupe) if args.dedupe else None
+    service = ScreeningService(max_workers=args.workers, max_queued=args.queue, dedupe=dedupe)
+    server = make_server(args.host, args.port, service)
+    print(f"screener listening on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.pool.shutdown()
+    return 0
+
+
+# ============================================================
+# 3. queue
+# ============================================================
+
+def cmd_queue_enqueue(args: argparse.Namespace) -> int:
+    from screener.workqueue import JobQueue
+
+    queue = JobQueue(args.db, wal=not args.no_wal)
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        counts = queue.enqueue(read_jsonl(infile), max_attempts=args.max_attempts)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        queue.close()
+    print(f"enqueued {counts['added']} jobs ({counts['skipped']} already queued)", file=sys.stderr)
+    return 0
+
+
+def cmd_queue_work(args: argparse.Namespace) -> int:
+    from screener.workqueue import JobQueue, default_worker_id, run_worker
+
+    dedupe = DedupeCache(threshold=args.dedupe) if args.dedupe else None
+    screen = partial(
+        screen_record,
+        fanout=args.fanout,
+        ats_only=args.ats_only,
+        dedupe=dedupe,
+        focused=args.focused,
+        fuzzy_ats=args.fuzzy_ats,
+        depth=args.depth,
+    )
+    worker_id = args.worker_id or default_worker_id()
+
+    queue = JobQueue(args.db, wal=not args.no_wal)
+    metrics_file = MetricsFileWriter(args.metrics_file) if args.metrics_file else None
+    memory = MemoryOptions(args, dedupe)
+    page_pool = start_page_pool(args)
+    start = time.perf_counter()
+    try:
+        totals = run_worker(
+            queue,
+            screen,
+            concurrency=args.concurrency,
+            worker_id=worker_id,
+            lease_s=args.lease,
+            wait=args.wait,
+            ceiling=memory.ceiling,
+        )
+        remaining = queue.counts()
+    finally:
+        queue.close()
+        if metrics_file is not None:
+            metrics_file.close()
+        memory.close()
+        if page_pool is not None:
+            page_pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"worker {worker_id}: {totals['done']} done, {totals['failed']} failed attempts, "
+        f"{totals['lost']} lost leases in {elapsed:.1f}s{memory.summary()}; queue {remaining}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def cmd_queue_stats(args: argparse.Namespace) -> int:
+    from screener.workqueue import JobQueue
+
+    queue = JobQueue(args.db, wal=not args.no_wal)
+    try:
+        print(json.dumps(queue.stats(), indent=2))
+    finally:
+        queue.close()
+    return 0
+
+
+def cmd_queue_export(args: argparse.Namespace) -> int:
+    from screener.workqueue import JobQueue
+
+    queue = JobQueue(args.db, wal=not args.no_wal)
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        n = queue.export(outfile, include_failed=not args.done_only)
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+        queue.close()
+    print(f"exported {n} results", file=sys.stderr)
+    return 0
+
+
+# ============================================================
+# 4. results
+# ============================================================
+
+def save_table(table, path: str) -> str:
+    """
+    ResultTable.save, with its warnings (e.g. the .npz fallback) shown as
+    one stderr line each.
+    """
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        path = table.save(path)
+    for warning in caught:
+        print(warning.message, file=sys.stderr)
+    return path
+
+
+def cmd_results_build(args: argparse.Namespace) -> int:
+    from screener.columnar import ResultColumns
+
+    columns = ResultColumns()
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        for result in read_jsonl(infile):
+            if "_invalid" not in result:
+                columns.add(result)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    table = columns.table()
+    path = save_table(table, args.output)
+    print(f"wrote {len(table)} results to {path} ({table.nbytes / 1024:.0f} KiB in memory)", file=sys.stderr)
+    return 0
+
+
+def cmd_results_summary(args: argparse.Namespace) -> int:
+    from screener.columnar import ResultTable
+
+    table = ResultTable.load(args.store)
+    rows = table.mask(status="ok", requisition=args.requisition)
+    summary = {
+        "results": len(table),
+        "requisitions": table.requisition_summary(),
+        "overall_score_histogram": table.score_histogram("overall_score", rows=rows),
+        "ats_match_histogram": table.score_histogram("ats_match", rows=rows),
+        "top_missing_keywords": table.keyword_counts("missing_keywords", top=args.top, rows=rows),
+        "top_missing_skills": table.keyword_counts("missing_skills", top=args.top, rows=rows),
+    }
+    if args.requisition is not None:
+        summary["requisitions"] = {args.requisition: summary["requisitions"].get(args.requisition)}
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+# ============================================================
+# 5. variants
+# ============================================================
+
+def cmd_variants_build(args: argparse.Namespace) -> int:
+    from screener.batch import load_record_text
+    from screener.variants import build_index, corpus_counts, dictionary_aliases, save_index
+
+    def texts(records):
+        for record in records:
+            if "_invalid" in record:
+                continue
+            for field in ("jd", "resume"):
+                try:
+                    yield load_record_text(record, field)
+                except Exception:
+                    continue
+
+    infile = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        counts = corpus_counts(texts(read_jsonl(infile)))
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    index = build_index(counts, min_count=args.min_count, typo_ratio=args.typo_ratio)
+    save_index(index, args.output)
+    known = set(index.vocabulary) | set(dictionary_aliases())
+    typos = sum(1 for word in index.table if word not in known)
+    print(
+        f"wrote {args.output}: {len(index.vocabulary)} words, {len(index.table)} variants "
+        f"({typos} misspellings) from {sum(counts.values())} tokens",
+        file=sys.stderr,
+    )
+    return 0
+
+
+# ============================================================
+# 6. Entry point
+# ============================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m screener", description="Headless candidate screening.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    screen = commands.add_parser("screen", help="Screen JD/resume records from JSONL.")
+    screen.add_argument("input", help="JSONL file of records, or - for stdin.")
+    screen.add_argument("-o", "--output", default="-", help="JSONL file for results (default: stdout).")
+    screen.add_argument("--concurrency", type=int, default=4, help="Records in flight at once (default: 4).")
+    screen.add_argument("--fanout", action="store_true", help="Use concurrent section calls per record.")
+    screen.add_argument("--focused", action="store_true", help="Send each prompt only the resume sections it needs.")
+    screen.add_argument("--ats-only", action="store_true", help="Skip the model; ATS keyword analysis only.")
+    screen.add_argument(
+        "--depth",
+        choices=DEPTHS,
+        default="full",
+        help="Analysis depth: triage (scores only), standard (no narratives or rewrites) or full (default).",
+    )
+    screen.add_argument(
+        "--fuzzy-ats",
+        action="store_true",
+        help="Count stems, abbreviations and typos of JD keywords as ATS matches "
+        "(index from $SCREENER_VARIANTS, else ats_dictionary).",
+    )
+    screen.add_argument(
+        "--dedupe",
+        type=float,
+        nargs="?",
+        const=0.85,
+        metavar="THRESHOLD",
+        help="Reuse the analysis of an earlier near-duplicate resume for the same JD "
+        "(estimated Jaccard similarity, default 0.85).",
+    )
+    screen.add_argument("--min-ats", type=int, default=0, help="Cascade: minimum ATS match %% for a model call.")
+    screen.add_argument("--min-dictionary", type=int, default=0, help="Cascade: minimum dictionary match %%.")
+    screen.add_argument("--min-combined", type=int, default=0, help="Cascade: minimum combined ATS/dictionary score.")
+    screen.add_argument("--top-k", type=int, default=None, help="Cascade: only the K best combined scores get a model call.")
+    screen.add_argument("--cascade-report", metavar="PATH", help="Write the cascade report (calls saved, histograms, recall) as JSON.")
+    screen.add_argument("--budget-tokens", type=int, help="Token budget for the whole run; records beyond it are skipped.")
+    screen.add_argument("--budget-tokens-per-hour", type=int, help="Rolling hourly token budget; records wait for room.")
+    screen.add_argument(
+        "--budget-max-wait",
+        type=float,
+        metavar="SECONDS",
+        help="Skip a record instead of waiting longer than this for hourly budget.",
+    )
+    screen.add_argument(
+        "--budget-order",
+        choices=["input", "cheapest"],
+        default="input",
+        help="With a budget, screen records in input order or smallest estimated token cost first.",
+    )
+    screen.add_argument(
+        "--usage-report",
+        metavar="PATH",
+        help="Write tokens and cost per requisition (and budget state) as JSON.",
+    )
+    screen.add_argument(
+        "--columnar",
+        metavar="PATH",
+        help="Also write results to a columnar store (.parquet, .feather or .npz; see 'results').",
+    )
+    screen.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="SQLite file recording per-item progress. Rerunning with the same file "
+        "skips finished items and retries failed or pending ones.",
+    )
+    screen.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write Prometheus text-format metrics here every 15s and at exit.",
+    )
+    screen.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Split the pages of PDFs with 16 or more pages across N pre-warmed processes (default: off).",
+    )
+    screen.add_argument(
+        "--mem-profile",
+        metavar="PATH",
+        help="Trace allocations and write per-stage peak/retained memory, RSS and top allocation sites "
+        "as JSON (slower; exact with --concurrency 1).",
+    )
+    screen.add_argument(
+        "--max-memory-mb",
+        type=float,
+        help="RSS ceiling: above it records run one at a time and --dedupe entries spill to disk.",
+    )
+    screen.set_defaults(func=cmd_screen)
+
+    serve = commands.add_parser("serve", help="Run the local HTTP screening service.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--workers", type=int, default=4, help="Concurrent analyses (default: 4).")
+    serve.add_argument("--queue", type=int, default=8, help="Analyses allowed to wait for a worker before 429 (default: 8).")
+    serve.add_argument(
+        "--dedupe",
+        type=float,
+        nargs="?",
+        const=0.85,
+        metavar="THRESHOLD",
+        help="Answer near-duplicate resumes for the same JD from earlier analyses.",
+    )
+    serve.set_defaults(func=cmd_serve)
+
+    queue = commands.add_parser("queue", help="Shared SQLite job queue for multi-process screening.")
+    queue_commands = queue.add_subparsers(dest="queue_command", required=True)
+
+    def queue_parser(name: str, help_text: str) -> argparse.ArgumentParser:
+        sub = queue_commands.add_parser(name, help=help_text)
+        sub.add_argument("db", help="SQLite queue file.")
+        sub.add_argument(
+            "--no-wal",
+            action="store_true",
+            help="Use rollback journaling, needed when workers on several hosts share the file over a network filesystem.",
+        )
+        return sub
+
+    enqueue = queue_parser("enqueue", "Add JSONL records to the queue.")
+    enqueue.add_argument("input", help="JSONL file of records, or - for stdin.")
+    enqueue.add_argument("--max-attempts", type=int, default=3, help="Tries per job before it is failed (default: 3).")
+    enqueue.set_defaults(func=cmd_queue_enqueue)
+
+    work = queue_parser("work", "Lease and screen jobs until the queue is drained.")
+    work.add_argument("--concurrency", type=int, default=4, help="Jobs in flight in this process (default: 4).")
+    work.add_argument("--fanout", action="store_true", help="Use concurrent section calls per record.")
+    work.add_argument("--focused", action="store_true", help="Send each prompt only the resume sections it needs.")
+    work.add_argument("--ats-only", action="store_true", help="Skip the model; ATS keyword analysis only.")
+    work.add_argument("--depth", choices=DEPTHS, default="full", help="Analysis depth: triage, standard or full (default).")
+    work.add_argument("--fuzzy-ats", action="store_true", help="Count keyword variants as ATS matches (see variants.py).")
+    work.add_argument("--dedupe", type=float, nargs="?", const=0.85, metavar="THRESHOLD", help="Reuse analyses of near-duplicate resumes seen by this worker.")
+    work.add_argument("--lease", type=float, default=300.0, help="Lease length in seconds, renewed while a job runs (default: 300).")
+    work.add_argument("--worker-id", help="Name in the stats table (default: host:pid).")
+    work.add_argument("--wait", action="store_true", help="Keep polling for new jobs instead of exiting when the queue is empty.")
+    work.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write Prometheus text-format metrics here every 15s and at exit.",
+    )
+    work.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Split the pages of PDFs with 16 or more pages across N pre-warmed processes (default: off).",
+    )
+    work.add_argument(
+        "--mem-profile",
+        metavar="PATH",
+        help="Trace allocations and write per-stage peak/retained memory, RSS and top allocation sites "
+        "as JSON (slower; exact with --concurrency 1).",
+    )
+    work.add_argument(
+        "--max-memory-mb",
+        type=float,
+        help="RSS ceiling: above it records run one at a time and --dedupe entries spill to disk.",
+    )
+    work.set_defaults(func=cmd_queue_work)
+
+    stats = queue_parser("stats", "Print job counts and per-worker throughput as JSON.")
+    stats.set_defaults(func=cmd_queue_stats)
+
+    export = queue_parser("export", "Write stored results as JSONL.")
+    export.add_argument("-o", "--output", default="-", help="JSONL file for results (default: stdout).")
+    export.add_argument("--done-only", action="store_true", help="Leave out jobs that failed every attempt.")
+    export.set_defaults(func=cmd_queue_export)
+
+    results = commands.add_parser("results", help="Columnar storage and queries for JSONL results.")
+    results_commands = results.add_subparsers(dest="results_command", required=True)
+
+    build = results_commands.add_parser("build", help="Convert JSONL results into a columnar store.")
+    build.add_argument("input", help="JSONL results file, or - for stdin.")
+    build.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help=".parquet or .feather (needs pandas and pyarrow, else falls back to .npz), or .npz.",
+    )
+    build.set_defaults(func=cmd_results_build)
+
+    summary = results_commands.add_parser("summary", help="Score histograms and top missing keywords from a store.")
+    summary.add_argument("store", help="File written by 'results build' or screen --columnar.")
+    summary.add_argument("--requisition", help="Only this requisition.")
+    summary.add_argument("--top", type=int, default=20, help="Keywords to list (default: 20).")
+    summary.set_defaults(func=cmd_results_summary)
+
+    variants = commands.add_parser("variants", help="Keyword variant index for --fuzzy-ats.")
+    variants_commands = variants.add_subparsers(dest="variants_command", required=True)
+
+    vbuild = variants_commands.add_parser("build", help="Build the index from a corpus of JSONL records.")
+    vbuild.add_argument("input", help="JSONL records (jd/resume text or paths), or - for stdin.")
+    vbuild.add_argument("-o", "--output", required=True, help="JSON file to write; point SCREENER_VARIANTS at it.")
+    vbuild.add_argument("--min-count", type=int, default=3, help="Corpus words seen this often join the vocabulary (default: 3).")
+    vbuild.add_argument(
+        "--typo-ratio",
+        type=int,
+        default=10,
+        help="A rare token is a misspelling of a word one edit away seen this many times as often (default: 10).",
+    )
+    vbuild.set_defaults(func=cmd_variants_build)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
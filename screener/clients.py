@@ -0,0 +1,199 @@
+"""
+clients.py
+
+Process-wide model client registry:
+- configures google.generativeai once per process
+- keeps one model object per (backend, model name), shared by all threads
+- provides an offline stub backend for benchmarks and local runs
+
+The Gemini SDK keeps its transport (gRPC channel / HTTP session) on the
+client behind a GenerativeModel, so reusing the model object keeps the
+connection alive between calls instead of renegotiating it per request.
+
+Backend selection:
+    SCREENER_BACKEND=gemini   (default) real model, needs GEMINI_API_KEY
+    SCREENER_BACKEND=stub     deterministic schema-valid JSON, no network
+    SCREENER_STUB_LATENCY_MS  simulated latency per stub call (default 0)
+    SCREENER_BACKEND=record   the real backend, recording every call to
+                              $SCREENER_CASSETTE (see cassette.py)
+    SCREENER_BACKEND=replay   recorded responses from $SCREENER_CASSETTE,
+                              no network
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from screener.config import MODEL_NAME, get_api_key
+
+BACKEND_ENV = "SCREENER_BACKEND"
+STUB_LATENCY_ENV = "SCREENER_STUB_LATENCY_MS"
+
+# Re-entrant: get_model() holds it while create_model() configures the SDK.
+_lock = threading.RLock()
+_clients: Dict[Tuple[str, str], Any] = {}
+_configured = False
+
+
+# ============================================================
+# 1. Registry
+# ============================================================
+
+def current_backend() -> str:
+    return os.getenv(BACKEND_ENV, "gemini").strip().lower() or "gemini"
+
+
+def get_model(model_name: str = MODEL_NAME, backend: Optional[str] = None):
+    """
+    Returns the shared model object for (backend, model_name), creating it
+    on first use. Safe to call from any thread.
+    """
+    backend = backend or current_backend()
+    key = (backend, model_name)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = create_model(model_name, backend)
+            _clients[key] = client
+    return client
+
+
+def create_model(model_name: str = MODEL_NAME, backend: Optional[str] = None):
+    """
+    Builds a new, unshared model object. Prefer get_model(); this exists for
+    the registry itself and for measuring cold setup cost.
+    """
+    backend = backend or current_backend()
+    if backend == "stub":
+        return StubModel(model_name)
+    if backend == "gemini":
+        return _genai().GenerativeModel(model_name)
+    if backend in ("record", "replay"):
+        from screener.cassette import RecordingModel, ReplayModel, open_cassette, record_backend
+
+        if backend == "record":
+            return RecordingModel(create_model(model_name, record_backend()), open_cassette(), model_name)
+        return ReplayModel(open_cassette(), model_name)
+    raise ValueError(f"Unknown {BACKEND_ENV}: {backend!r}")
+
+
+def reset_clients() -> None:
+    """
+    Drops every cached model object (e.g. after rotating the API key).
+    """
+    global _configured
+    with _lock:
+        _clients.clear()
+        _configured = False
+
+
+def _genai():
+    """
+    Imports and configures google.generativeai once per process.
+    """
+    global _configured
+    import google.generativeai as genai
+
+    if not _configured:
+        with _lock:
+            if not _configured:
+                api_key = get_api_key()
+                if not api_key:
+                    raise RuntimeError("GEMINI_API_KEY not found in environment. Check your .env file.")
+                genai.configure(api_key=api_key)
+                _configured = True
+    return genai
+
+
+# ============================================================
+# 2. Stub backend
+# ============================================================
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """
+    Offline stand-in for genai.GenerativeModel.
+
+    Returns deterministic, schema-valid JSON derived from the prompt: scores
+    come from a hash of the prompt, and the first resume lines are echoed
+    back as rewrite originals so guardrails have real work to do. Only the
+    fields of the prompt's schema are returned, as a real model would.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME, latency_ms: Optional[float] = None):
+        self.model_name = model_name
+        if latency_ms is None:
+            latency_ms = float(os.getenv(STUB_LATENCY_ENV, "0") or 0)
+        self.latency_ms = latency_ms
+
+    def generate_content(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> StubResponse:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        return StubResponse(json.dumps(stub_output(prompt)))
+
+
+def stub_output(prompt: str) -> Dict[str, Any]:
+    # Imported here to keep `import screener.clients` free of prompt text.
+    from screener.llm_prompts import empty_output
+
+    digest = hashlib.sha256(prompt.encode("utf-8", errors="ignore")).digest()
+    resume = prompt.rsplit("Resume:", 1)[-1].split("Return JSON only.", 1)[0]
+    lines = [line.strip() for line in resume.split("\n") if len(line.strip()) > 20]
+
+    output = empty_output()
+    analysis = output["analysis"]
+    for i, field in enumerate(
+        ["overall_score", "skills_score", "experience_score", "impact_score", "leadership_score"]
+    ):
+        analysis[field] = 40 + digest[i] % 56
+    analysis["summary"] = "Candidate shows relevant experience for the role."
+    analysis["recommendation"] = "Proceed to phone screen."
+    analysis["risk_flags"] = ["Unclear depth of experience with some required tools."]
+
+    output["gap_analysis"]["priority_gaps"] = ["Missing evidence for some required tools."]
+    output["gap_analysis_text"] = "Some required tools are missing from the resume."
+    output["validation_questions"] = [
+        "Walk me through your most relevant recent project.",
+        "Which of the listed tools have you used in production?",
+    ]
+    output["resume_rewrite_suggestions"] = [
+        {"original": line, "suggestion": line + " to improve delivery quality", "confidence": 0.8}
+        for line in lines[:3]
+    ]
+
+    schema = _prompt_schema(prompt)
+    if schema is None:
+        return output
+    trimmed = {}
+    for key, value in schema.items():
+        if key in output:
+            full = output[key]
+            trimmed[key] = {f: full[f] for f in value if f in full} if isinstance(value, dict) else full
+    return trimmed
+
+
+def _prompt_schema(prompt: str) -> Optional[Dict[str, Any]]:
+    """
+    The JSON schema block of an llm_prompts system prompt, or None.
+    """
+    start = prompt.find("JSON schema (all fields required):")
+    end = prompt.find("Follow the schema EXACTLY.", start)
+    if start < 0 or end < 0:
+        return None
+    try:
+        schema = json.loads(prompt[prompt.index("{", start):end])
+    except ValueError:
+        return None
+    return schema if isinstance(schema, dict) else None
@@ -0,0 +1,350 @@
+"""
+columnar.py
+
+Column-oriented storage for batch screening results, for analysis over
+thousands of screenings without loading piles of JSON:
+- ResultColumns: appends batch results (batch.screen_record output) into
+  compact typed buffers while a run streams; table() turns them into arrays
+- ResultTable: one NumPy array per column. Scores are int8 (-1 when there
+  is no analysis), status/source/requisition are dictionary-encoded codes,
+  and keyword lists are stored as a vocabulary plus flat codes and row
+  offsets. Queries (score histograms, top missing keywords, per-requisition
+  summaries) run vectorized over the codes.
+- save()/load(): Parquet or Feather through pandas + pyarrow when
+  installed, otherwise (or for .npz paths) a NumPy .npz archive
+
+    table = ResultTable.load("results.parquet")
+    table.keyword_counts("missing_keywords", requisition="backend-eng", top=10)
+"""
+
+import importlib.util
+import os
+import warnings
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# (column, array typecode, numpy dtype, missing value)
+SCORE_COLUMNS = ("overall_score", "skills_score", "experience_score", "impact_score", "leadership_score")
+SCALAR_COLUMNS: Tuple[Tuple[str, str, Any, Any], ...] = tuple(
+    (name, "b", np.int8, -1) for name in SCORE_COLUMNS
+) + (
+    ("ats_match", "b", np.int8, -1),
+    ("cascade_combined", "b", np.int8, -1),
+    ("cascade_dictionary", "b", np.int8, -1),
+    ("prompt_tokens", "i", np.int32, 0),
+    ("output_tokens", "i", np.int32, 0),
+    ("cost_usd", "d", np.float64, 0.0),
+    ("elapsed_ms", "f", np.float32, 0.0),
+)
+CATEGORY_COLUMNS = ("status", "source", "requisition")
+# column -> (output section, key)
+LIST_COLUMNS = {
+    "missing_keywords": ("ats_keyword_analysis", "missing_keywords"),
+    "matched_keywords": ("ats_keyword_analysis", "resume_keywords"),
+    "missing_skills": ("gap_analysis", "missing_skills"),
+    "missing_tools": ("gap_analysis", "missing_tools"),
+}
+
+FORMATS = {".parquet": "parquet", ".feather": "feather", ".npz": "npz"}
+
+
+def _source(result: Dict[str, Any]) -> str:
+    output = result.get("output") or {}
+    if result.get("duplicate_of"):
+        return "duplicate"
+    if "analysis" in output:
+        return "model"
+    return "ats" if output else "none"
+
+
+def _codes_dtype(size: int):
+    return np.int8 if size < 2 ** 7 else np.int16 if size < 2 ** 15 else np.int32
+
+
+# ============================================================
+# 1. Building
+# ============================================================
+
+class _Dictionary:
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ResultColumns:
+    """
+    Appends results one at a time. Per row it keeps a few bytes of scores
+    and codes (plus the id), so a run of any size can feed it as results
+    stream out. Not thread-safe; feed it from the consuming loop.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self._scalars = {name: array(code) for name, code, _, _ in SCALAR_COLUMNS}
+        self._categories = {name: (_Dictionary(), array("i")) for name in CATEGORY_COLUMNS}
+        self._lists = {name: (_Dictionary(), array("i"), array("q", [0])) for name in LIST_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, result: Dict[str, Any]) -> None:
+        output = result.get("output") or {}
+        analysis = output.get("analysis") or {}
+        ats = output.get("ats_keyword_analysis") or {}
+        scores = (result.get("cascade") or {}).get("scores") or {}
+        usage = result.get("usage") or {}
+
+        values = {name: analysis.get(name, -1) for name in SCORE_COLUMNS}
+        values["ats_match"] = ats.get("match_score", -1)
+        values["cascade_combined"] = scores.get("combined", -1)
+        values["cascade_dictionary"] = scores.get("dictionary", -1)
+        if not result.get("from_checkpoint"):
+            values["prompt_tokens"] = usage.get("prompt_tokens", 0)
+            values["output_tokens"] = usage.get("output_tokens", 0)
+            values["cost_usd"] = usage.get("cost_usd", 0.0)
+        values["elapsed_ms"] = result.get("elapsed_ms", 0.0)
+        for name, _, _, missing in SCALAR_COLUMNS:
+            value = values.get(name, missing)
+            self._scalars[name].append(missing if value is None else value)
+
+        self.ids.append("" if result.get("id") is None else str(result["id"]))
+        category_values = {
+            "status": result.get("status", ""),
+            "source": _source(result),
+            "requisition": result.get("requisition") or usage.get("requisition") or "",
+        }
+        for name, (dictionary, codes) in self._categories.items():
+            codes.append(dictionary.code(str(category_values[name])))
+
+        for name, (section, key) in LIST_COLUMNS.items():
+            dictionary, codes, offsets = self._lists[name]
+            items = (output.get(section) or {}).get(key) or ()
+            codes.extend(dictionary.code(str(item)) for item in items)
+            offsets.append(len(codes))
+
+    def table(self) -> "ResultTable":
+        arrays: Dict[str, np.ndarray] = {"id": np.array(self.ids, dtype=str)}
+        for name, _, dtype, _ in SCALAR_COLUMNS:
+            arrays[name] = np.frombuffer(self._scalars[name], dtype=dtype).copy()
+        for name, (dictionary, codes) in self._categories.items():
+            arrays[f"{name}.codes"] = np.frombuffer(codes, dtype=np.int32).astype(_codes_dtype(len(dictionary.values)))
+            arrays[f"{name}.categories"] = np.array(dictionary.values, dtype=str)
+        for name, (dictionary, codes, offsets) in self._lists.items():
+            arrays[f"{name}.codes"] = np.frombuffer(codes, dtype=np.int32).astype(_codes_dtype(len(dictionary.values)))
+            arrays[f"{name}.offsets"] = np.frombuffer(offsets, dtype=np.int64).copy()
+            arrays[f"{name}.vocab"] = np.array(dictionary.values, dtype=str)
+        return ResultTable(arrays)
+
+
+def build_table(results: Iterable[Dict[str, Any]]) -> "ResultTable":
+    columns = ResultColumns()
+    for result in results:
+        columns.add(result)
+    return columns.table()
+
+
+# ============================================================
+# 2. Table and queries
+# ============================================================
+
+class ResultTable:
+    """
+    Columns of N results, as a flat {name: ndarray} map:
+    - scalar columns by name (SCALAR_COLUMNS) plus "id"
+    - "<name>.codes" and "<name>.categories" for CATEGORY_COLUMNS
+    - "<name>.codes", "<name>.offsets" (N + 1) and "<name>.vocab" for
+      LIST_COLUMNS; row i's items are vocab[codes[offsets[i]:offsets[i + 1]]]
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+
+    def __len__(self) -> int:
+        return len(self.arrays["id"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.arrays.values())
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        A scalar column, or a category column decoded to strings.
+        """
+        if name in self.arrays:
+            return self.arrays[name]
+        return self.arrays[f"{name}.categories"][self.arrays[f"{name}.codes"]]
+
+    def row_items(self, name: str, row: int) -> List[str]:
+        offsets = self.arrays[f"{name}.offsets"]
+        codes = self.arrays[f"{name}.codes"][offsets[row]:offsets[row + 1]]
+        return self.arrays[f"{name}.vocab"][codes].tolist()
+
+    def mask(self, status: Optional[str] = None, requisition: Optional[str] = None) -> np.ndarray:
+        """
+        Boolean row mask for the given category values (all rows if none).
+        """
+        selected = np.ones(len(self), dtype=bool)
+        for name, value in (("status", status), ("requisition", requisition)):
+            if value is None:
+                continue
+            categories = self.arrays[f"{name}.categories"]
+            hits = np.flatnonzero(categories == value)
+            if not len(hits):
+                return np.zeros(len(self), dtype=bool)
+            selected &= self.arrays[f"{name}.codes"] == hits[0]
+        return selected
+
+    def score_histogram(self, column: str = "overall_score", width: int = 10, rows: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """
+        Counts per score bucket (same labels as the cascade report), over
+        rows that have the score.
+        """
+        values = self.arrays[column]
+        keep = values >= 0
+        if rows is not None:
+            keep &= rows
+        counts = np.bincount(np.minimum(values[keep].astype(np.int64), 100) // width, minlength=100 // width + 1)
+        return {f"{i * width}-{min(i * width + width - 1, 100)}": int(n) for i, n in enumerate(counts)}
+
+    def keyword_counts(
+        self,
+        column: str = "missing_keywords",
+        requisition: Optional[str] = None,
+        top: int = 20,
+        rows: Optional[np.ndarray] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        Most frequent items of a list column, optionally within one
+        requisition, as (item, candidates) pairs.
+        """
+        if requisition is not None:
+            rows = self.mask(requisition=requisition) if rows is None else rows & self.mask(requisition=requisition)
+        codes = self.arrays[f"{column}.codes"]
+        vocab = self.arrays[f"{column}.vocab"]
+        if rows is not None:
+            lengths = np.diff(self.arrays[f"{column}.offsets"])
+            codes = codes[np.repeat(rows, lengths)]
+        counts = np.bincount(codes.astype(np.int64), minlength=len(vocab))
+        order = np.lexsort((vocab, -counts))[:top]  # ties by item, so every format agrees
+        return [(str(vocab[i]), int(counts[i])) for i in order if counts[i]]
+
+    def requisition_summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per requisition: candidates, model analyses, mean overall and ATS
+        scores over rows that have them, and cost.
+        """
+        codes = self.arrays["requisition.codes"].astype(np.int64)
+        n = len(self.arrays["requisition.categories"])
+        overall = self.arrays["overall_score"]
+        ats = self.arrays["ats_match"]
+
+        def mean(values: np.ndarray) -> np.ndarray:
+            has = values >= 0
+            totals = np.bincount(codes[has], weights=values[has], minlength=n)
+            counts = np.bincount(codes[has], minlength=n)
+            return np.divide(totals, counts, out=np.full(n, np.nan), where=counts > 0)
+
+        candidates = np.bincount(codes, minlength=n)
+        analysed = np.bincount(codes[overall >= 0], minlength=n)
+        cost = np.bincount(codes, weights=self.arrays["cost_usd"], minlength=n)
+        mean_overall, mean_ats = mean(overall), mean(ats)
+        return {
+            str(name): {
+                "candidates": int(candidates[i]),
+                "analysed": int(analysed[i]),
+                "mean_overall": None if np.isnan(mean_overall[i]) else round(float(mean_overall[i]), 1),
+                "mean_ats": None if np.isnan(mean_ats[i]) else round(float(mean_ats[i]), 1),
+                "cost_usd": round(float(cost[i]), 6),
+            }
+            for i, name in enumerate(self.arrays["requisition.categories"])
+        }
+
+    # --- pandas ---
+
+    def to_frame(self):
+        """
+        A pandas DataFrame: categoricals for category columns, lists of
+        strings for list columns.
+        """
+        import pandas as pd
+
+        data: Dict[str, Any] = {"id": self.arrays["id"]}
+        for name, _, _, _ in SCALAR_COLUMNS:
+            data[name] = self.arrays[name]
+        for name in CATEGORY_COLUMNS:
+            data[name] = pd.Categorical.from_codes(
+                self.arrays[f"{name}.codes"].astype(np.int32), categories=pd.Index(self.arrays[f"{name}.categories"])
+            )
+        for name in LIST_COLUMNS:
+            vocab = self.arrays[f"{name}.vocab"][self.arrays[f"{name}.codes"]].tolist()
+            offsets = self.arrays[f"{name}.offsets"].tolist()
+            data[name] = [vocab[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+        return pd.DataFrame(data)
+
+    @classmethod
+    def from_frame(cls, frame) -> "ResultTable":
+        import pandas as pd
+
+        arrays: Dict[str, np.ndarray] = {"id": frame["id"].astype(str).to_numpy(dtype=str)}
+        for name, _, dtype, _ in SCALAR_COLUMNS:
+            arrays[name] = frame[name].to_numpy(dtype=dtype)
+        for name in CATEGORY_COLUMNS:
+            categorical = pd.Categorical(frame[name].astype(str))
+            arrays[f"{name}.codes"] = categorical.codes.astype(_codes_dtype(len(categorical.categories)))
+            arrays[f"{name}.categories"] = np.asarray(categorical.categories, dtype=str)
+        for name in LIST_COLUMNS:
+            rows = [list(items) if items is not None else [] for items in frame[name]]
+            lengths = np.fromiter((len(items) for items in rows), dtype=np.int64, count=len(rows))
+            flat = np.array([item for items in rows for item in items], dtype=str)
+            vocab, codes = np.unique(flat, return_inverse=True)
+            arrays[f"{name}.codes"] = codes.astype(_codes_dtype(len(vocab)))
+            arrays[f"{name}.offsets"] = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+            arrays[f"{name}.vocab"] = vocab.astype(str)
+        return cls(arrays)
+
+    # --- files ---
+
+    def save(self, path: str) -> str:
+        """
+        Writes by extension (.parquet, .feather or .npz). Without pandas and
+        pyarrow, Parquet/Feather paths fall back to .npz next to them, with
+        a warning. Returns the path written.
+        """
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower(), "npz")
+        if fmt != "npz" and not all(importlib.util.find_spec(name) for name in ("pandas", "pyarrow")):
+            path = os.path.splitext(path)[0] + ".npz"
+            warnings.warn(f"pandas/pyarrow not installed: writing {path} instead", stacklevel=2)
+            fmt = "npz"
+
+        if fmt == "parquet":
+            self.to_frame().to_parquet(path, index=False)
+        elif fmt == "feather":
+            self.to_frame().to_feather(path)
+        else:
+            if not path.endswith(".npz"):
+                path += ".npz"  # np.savez would add it anyway
+            np.savez_compressed(path, **self.arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "ResultTable":
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower(), "npz")
+        if fmt == "parquet":
+            import pandas as pd
+
+            return cls.from_frame(pd.read_parquet(path))
+        if fmt == "feather":
+            import pandas as pd
+
+            return cls.from_frame(pd.read_feather(path))
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
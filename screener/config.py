@@ -0,0 +1,76 @@
+"""
+config.py
+
+Shared configuration for the screening core:
+- model name, generation settings and token prices
+- score bounds and analysis field types
+- API key lookup
+
+Nothing in here imports Streamlit or the Gemini SDK.
+"""
+
+import os
+from typing import Dict, Optional
+
+
+# =========================
+# 1. Model
+# =========================
+
+MODEL_NAME = "gemini-3-flash-preview"
+
+MAX_OUTPUT_TOKENS = 4096
+TEMPERATURE = 0
+
+
+def generation_config(max_output_tokens: int = MAX_OUTPUT_TOKENS) -> Dict[str, int]:
+    return {
+        "temperature": TEMPERATURE,
+        "max_output_tokens": max_output_tokens,
+    }
+
+
+# List prices in USD per million tokens, used for cost estimates only.
+# Override with SCREENER_INPUT_COST_PER_MTOK / SCREENER_OUTPUT_COST_PER_MTOK
+# when the model or its pricing changes.
+INPUT_COST_PER_MTOK = float(os.getenv("SCREENER_INPUT_COST_PER_MTOK", "0.50"))
+OUTPUT_COST_PER_MTOK = float(os.getenv("SCREENER_OUTPUT_COST_PER_MTOK", "3.00"))
+
+
+# =========================
+# 2. Scores + Fields
+# =========================
+
+SCORE_MIN = 0
+SCORE_MAX = 100
+
+ANALYSIS_FIELDS: Dict[str, type] = {
+    "overall_score": int,
+    "skills_score": int,
+    "experience_score": int,
+    "impact_score": int,
+    "leadership_score": int,
+    "risk_flags": list,
+    "summary": str,
+    "recommendation": str,
+    "importance_of_gaps": str,
+    "resume_enhancement": str,
+}
+
+
+# =========================
+# 3. Environment
+# =========================
+
+def get_api_key() -> Optional[str]:
+    """
+    Returns GEMINI_API_KEY from the environment, loading a .env file first
+    when python-dotenv is installed.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
+    return os.getenv("GEMINI_API_KEY")
@@ -0,0 +1,291 @@
+"""
+dedupe.py
+
+Near-duplicate resume detection with MinHash + LSH:
+- word 3-gram shingles of the normalized text
+- 128-permutation MinHash signatures (NumPy when installed, pure Python otherwise)
+- 16 LSH bands of 8 rows, so only likely matches are compared at all
+
+A query is a handful of dict lookups plus a few signature comparisons and
+takes well under a millisecond. DedupeCache keeps one index per job
+description and lets batch runs reuse an earlier analysis for a resubmitted
+or lightly edited resume instead of calling the model again.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from screener.results import ScreenResult
+from screener.util import compute_ats_keyword_analysis, content_hash
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 31) - 1  # keeps a * h + b inside 64 bits for 32-bit shingle hashes
+_MASK = (1 << 32) - 1
+
+Signature = Tuple[int, ...]
+
+
+def _permutations() -> Tuple[List[int], List[int]]:
+    # Fixed coefficients so signatures are comparable across processes and runs.
+    a, b, state = [], [], 0x9E3779B9
+    for _ in range(NUM_PERM):
+        state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+        a.append((state >> 33) % (_PRIME - 1) + 1)
+        state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+        b.append((state >> 33) % _PRIME)
+    return a, b
+
+
+_A, _B = _permutations()
+
+
+# ============================================================
+# 1. Signatures
+# ============================================================
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> List[int]:
+    """
+    32-bit hashes of the distinct word k-grams of the lowercased text.
+    """
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) < k:
+        words = words + [""] * (k - len(words))
+    grams = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return [zlib.crc32(g.encode("utf-8")) & _MASK for g in grams]
+
+
+def minhash_signature(text: str) -> Signature:
+    hashes = shingles(text)
+    try:
+        import numpy as np
+    except ImportError:
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in zip(_A, _B))
+
+    h = np.asarray(hashes, dtype=np.uint64)
+    a = np.asarray(_A, dtype=np.uint64)[:, None]
+    b = np.asarray(_B, dtype=np.uint64)[:, None]
+    return tuple(int(v) for v in ((a * h + b) % np.uint64(_PRIME)).min(axis=1))
+
+
+def estimate_similarity(a: Signature, b: Signature) -> float:
+    """
+    Estimated Jaccard similarity of the two shingle sets.
+    """
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+# ============================================================
+# 2. LSH index
+# ============================================================
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures. Bounded: once max_entries is reached
+    the oldest entries are evicted. Thread-safe.
+    """
+
+    def __init__(self, threshold: float = 0.85, max_entries: int = 10000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Signature, Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = {}
+
+    @staticmethod
+    def _bands(signature: Signature):
+        for band in range(BANDS):
+            yield band, signature[band * ROWS:(band + 1) * ROWS]
+
+    def add(self, key: Hashable, signature: Signature, value: Any = None) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (signature, value)
+            for bucket in self._bands(signature):
+                self._buckets.setdefault(bucket, []).append(key)
+            while len(self._entries) > self.max_entries:
+                old_key, (old_signature, _) = self._entries.popitem(last=False)
+                for bucket in self._bands(old_signature):
+                    keys = self._buckets.get(bucket, [])
+                    if old_key in keys:
+                        keys.remove(old_key)
+                    if not keys:
+                        self._buckets.pop(bucket, None)
+
+    def query(self, signature: Signature) -> Optional[Tuple[Hashable, float, Any]]:
+        """
+        Best match at or above the threshold as (key, similarity, value), or None.
+        """
+        with self._lock:
+            candidates = set()
+            for bucket in self._bands(signature):
+                candidates.update(self._buckets.get(bucket, ()))
+
+            best = None
+            for key in candidates:
+                other, value = self._entries[key]
+                similarity = estimate_similarity(signature, other)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (key, similarity, value)
+            return best
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def values(self) -> List[Tuple[Hashable, Any]]:
+        """
+        (key, value) for every entry, oldest first.
+        """
+        with self._lock:
+            return [(key, value) for key, (_, value) in self._entries.items()]
+
+
+# ============================================================
+# 3. Reusing analyses
+# ============================================================
+
+class DedupeCache:
+    """
+    One NearDuplicateIndex per job description and analysis settings
+    (depth, fan-out, focused prompts), holding finished analyses.
+
+    lookup() finds an earlier analysis of a near-identical resume for the
+    same JD; reuse() turns it into an output for the new resume. Guardrails
+    are re-applied against the new text (so rewrite originals must still
+    exist) and ATS is recomputed, so only the model call is skipped.
+
+    In memory, outputs are kept as results.ScreenResult objects (a fraction
+    of the size of the dicts, and reuse() needs no deep copy). With a spool
+    (memory.DiskSpool), the stored outputs and resume lines live on disk and
+    only signatures stay in memory; spill() moves an in-memory cache there
+    later, e.g. when a memory ceiling is reached.
+    """
+
+    def __init__(self, threshold: float = 0.85, max_entries_per_jd: int = 10000, spool=None):
+        self.threshold = threshold
+        self.max_entries_per_jd = max_entries_per_jd
+        self.hits = 0
+        self.spool = spool
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, NearDuplicateIndex] = {}
+
+    @staticmethod
+    def _index_key(jd_text: str, depth: str, fanout: bool = False, focused: bool = False) -> str:
+        # A triage analysis cannot stand in for a full one, nor one made
+        # with other prompts, so each setting has its own indexes.
+        key = content_hash(jd_text)
+        if depth != "full":
+            key += f"/{depth}"
+        if fanout:
+            key += "/fanout"
+        if focused:
+            key += "/focused"
+        return key
+
+    def _index(
+        self, jd_text: str, depth: str = "full", fanout: bool = False, focused: bool = False
+    ) -> NearDuplicateIndex:
+        key = self._index_key(jd_text, depth, fanout, focused)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = NearDuplicateIndex(self.threshold, self.max_entries_per_jd)
+                self._indexes[key] = index
+            return index
+
+    def lookup(
+        self, jd_text: str, resume_text: str, depth: str = "full", fanout: bool = False, focused: bool = False
+    ) -> Optional[Tuple[Any, float, Dict[str, Any]]]:
+        """
+        Returns (record_id, similarity, earlier entry) or None.
+        """
+        match = self._index(jd_text, depth, fanout, focused).query(minhash_signature(resume_text))
+        if match is None:
+            return None
+        _, similarity, entry = match
+        return entry["id"], similarity, entry
+
+    def remember(
+        self,
+        jd_text: str,
+        resume_text: str,
+        record_id: Any,
+        output: Dict[str, Any],
+        depth: str = "full",
+        fanout: bool = False,
+        focused: bool = False,
+    ) -> None:
+        resume_hash = content_hash(resume_text)
+        with self._lock:
+            spool = self.spool
+        if spool is not None:
+            key = f"{self._index_key(jd_text, depth, fanout, focused)}:{resume_hash}"
+            spool.put(key, {"id": record_id, "output": output, "lines": _lines(resume_text)})
+            entry = {"id": record_id, "spooled": key}
+        else:
+            entry = {"id": record_id, "output": ScreenResult.from_dict(output), "lines": tuple(_lines(resume_text))}
+        self._index(jd_text, depth, fanout, focused).add(resume_hash, minhash_signature(resume_text), entry)
+
+    def spill(self, spool) -> int:
+        """
+        Moves every in-memory payload to spool and keeps using it for new
+        entries. Returns the number of entries moved.
+        """
+        moved = 0
+        with self._lock:
+            self.spool = spool
+            indexes = list(self._indexes.items())
+            for index_key, index in indexes:
+                for resume_hash, entry in index.values():
+                    if "spooled" in entry:
+                        continue
+                    key = f"{index_key}:{resume_hash}"
+                    spool.put(key, {"id": entry["id"], "output": entry.pop("output").to_dict(), "lines": entry.pop("lines")})
+                    entry["spooled"] = key
+                    moved += 1
+        return moved
+
+    def _payload(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            if "spooled" not in entry:
+                return {"output": entry["output"].to_dict(), "lines": entry["lines"]}
+            key = entry["spooled"]
+        return self.spool.get(key)
+
+    def reuse(
+        self, jd_text: str, resume_text: str, match, fuzzy_ats: bool = False
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Returns (output, duplicate_info) for resume_text from a lookup() match.
+        """
+        from screener.pipeline import finalize_output
+
+        record_id, similarity, entry = match
+        with self._lock:
+            self.hits += 1
+
+        payload = self._payload(entry)
+        output = finalize_output(jd_text, resume_text, payload["output"])
+        output["ats_keyword_analysis"] = compute_ats_keyword_analysis(jd_text, resume_text, fuzzy_ats)
+
+        new_lines = _lines(resume_text)
+        old_lines = payload["lines"]
+        old_set, new_set = set(old_lines), set(new_lines)
+        duplicate = {
+            "of": record_id,
+            "similarity": round(similarity, 3),
+            "added_lines": [line for line in new_lines if line not in old_set],
+            "removed_lines": [line for line in old_lines if line not in new_set],
+        }
+        return output, duplicate
+
+
+def _lines(text: str) -> List[str]:
+    return [line.strip() for line in text.split("\n") if line.strip()]
@@ -1,6 +1,34 @@
 # guardrails.py
 from typing import Dict, Any
 
+# Bump whenever a rule below changes. Part of every cache key for guarded output.
+# validator.py compiles the same rules; keep both in step.
+GUARDRAILS_VERSION = "1"
+
+RISK_FLAG_KEEP_WORDS = ("unclear", "missing", "ambiguous", "gap")
+GAP_SENTENCE_KEEP_WORDS = ("gap", "missing")
+ENHANCEMENT_KEEP_WORDS = ("clarify", "quantify", "expand", "rewrite", "tighten")
+GAP_ITEM_KEEP_WORDS = ("gap", "missing", "lack", "no ")
+EVIDENCE_GAP_KEYS = ("missing_skills", "missing_tools", "missing_experience_depth", "missing_domain_knowledge")
+
+MIN_REWRITE_CONFIDENCE = 0.7
+REWRITE_MATCH_THRESHOLD = 0.7
+MAX_FOREIGN_WORDS = 12
+REWRITE_ALLOWED_EXTRA_WORDS = frozenset({
+    "overall", "platform", "key", "impactful", "cross-functional",
+    "strategic", "operational", "technical", "business", "team",
+    "stakeholders", "process", "improvements", "delivery", "quality"
+})
+REWRITE_STOP_WORDS = ("and", "or", "the", "a", "an", "to", "for", "with", "of", "in", "on", "as", "by")
+REWRITE_ACTION_VERBS = ("led", "managed", "drove", "improved", "increased", "reduced", "delivered", "supported")
+
+FORBIDDEN_REASONING = (
+    "personality", "attitude", "motivation", "intent",
+    "race", "gender", "ethnicity", "religion", "political",
+    "mental", "psychological", "predict", "future",
+    "will succeed", "will fail"
+)
+
 # ============================================================
 # 1. Word-level fuzzy similarity
 # ============================================================
@@ -38,7 +66,7 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
         f = str(flag).lower()
         if f in jd_lower or f in resume_lower:
             validated_flags.append(flag)
-        elif any(k in f for k in ["unclear", "missing", "ambiguous", "gap"]):
+        elif any(k in f for k in RISK_FLAG_KEEP_WORDS):
             validated_flags.append(flag)
     analysis["risk_flags"] = validated_flags
 
@@ -52,7 +80,7 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
                 continue
             if any(word in jd_lower for word in s.split()):
                 cleaned.append(sentence)
-            elif "gap" in s or "missing" in s:
+            elif any(k in s for k in GAP_SENTENCE_KEEP_WORDS):
                 cleaned.append(sentence)
         analysis["importance_of_gaps"] = ". ".join(cleaned)
 
@@ -66,7 +94,7 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
                 continue
             if any(word in resume_lower for word in s.split()):
                 cleaned.append(sentence)
-            elif any(k in s for k in ["clarify", "quantify", "expand", "rewrite", "tighten"]):
+            elif any(k in s for k in ENHANCEMENT_KEEP_WORDS):
                 cleaned.append(sentence)
         analysis["resume_enhancement"] = ". ".join(cleaned)
 
@@ -75,7 +103,7 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
     # --- Gap analysis ---
     gap = model_output.get("gap_analysis", {})
     if isinstance(gap, dict):
-        for key in ["missing_skills", "missing_tools", "missing_experience_depth", "missing_domain_knowledge"]:
+        for key in EVIDENCE_GAP_KEYS:
             items = gap.get(key, [])
             validated = []
             for item in items:
@@ -84,7 +112,7 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
                     continue
                 if item_str.lower() in jd_lower:
                     validated.append(item_str)
-                elif any(w in item_str.lower() for w in ["gap", "missing", "lack", "no "]):
+                elif any(w in item_str.lower() for w in GAP_ITEM_KEEP_WORDS):
                     validated.append(item_str)
             gap[key] = validated
 
@@ -97,12 +125,6 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
     suggestions = model_output.get("resume_rewrite_suggestions", [])
     if isinstance(suggestions, list):
         validated = []
-        allowed_extra_words = {
-            "overall", "platform", "key", "impactful", "cross-functional",
-            "strategic", "operational", "technical", "business", "team",
-            "stakeholders", "process", "improvements", "delivery", "quality"
-        }
-
         for item in suggestions:
             if not isinstance(item, dict):
                 continue
@@ -114,10 +136,10 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
             except:
                 confidence = 0.0
 
-            if not original or not suggestion or confidence < 0.7:
+            if not original or not suggestion or confidence < MIN_REWRITE_CONFIDENCE:
                 continue
 
-            if not original_matches_resume(original, resume_text, threshold=0.7):
+            if not original_matches_resume(original, resume_text, threshold=REWRITE_MATCH_THRESHOLD):
                 continue
 
             suggestion_words = [w.strip(".,;:()").lower() for w in suggestion.split()]
@@ -128,15 +150,15 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
                     continue
                 if w in resume_lower or w in jd_lower:
                     continue
-                if w in allowed_extra_words:
+                if w in REWRITE_ALLOWED_EXTRA_WORDS:
                     continue
-                if w in ["and", "or", "the", "a", "an", "to", "for", "with", "of", "in", "on", "as", "by"]:
+                if w in REWRITE_STOP_WORDS:
                     continue
-                if w in ["led", "managed", "drove", "improved", "increased", "reduced", "delivered", "supported"]:
+                if w in REWRITE_ACTION_VERBS:
                     continue
                 foreign_count += 1
 
-            if foreign_count > 12:
+            if foreign_count > MAX_FOREIGN_WORDS:
                 continue
 
             validated.append({
@@ -156,13 +178,7 @@ def enforce_evidence_constraints(jd_text: str, resume_text: str, model_output: D
 
 def enforce_reasoning_policy(model_output: Dict[str, Any]) -> Dict[str, Any]:
     analysis = model_output.get("analysis", {})
-
-    forbidden = [
-        "personality", "attitude", "motivation", "intent",
-        "race", "gender", "ethnicity", "religion", "political",
-        "mental", "psychological", "predict", "future",
-        "will succeed", "will fail"
-    ]
+    forbidden = FORBIDDEN_REASONING
 
     for key, value in analysis.items():
         if isinstance(value, str):
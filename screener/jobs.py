@@ -0,0 +1,203 @@
+"""
+jobs.py
+
+Background job execution for screening work:
+- a bounded worker pool shared by every caller
+- per-job status, progress and partial results
+- cooperative cancellation
+
+Job functions run on worker threads and receive their Job as the first
+argument. They report partial results with job.update() and call
+job.raise_if_cancelled() between stages; a model call already in flight is
+allowed to finish, but nothing after it runs.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from screener.llm_prompts import merge_section_outputs
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# ============================================================
+# 1. Job
+# ============================================================
+
+class Job:
+    def __init__(self, job_id: str, label: str = "", total_steps: int = 1, meta: Optional[Dict[str, Any]] = None):
+        self.id = job_id
+        self.label = label
+        self.meta = meta or {}
+        self.status = QUEUED
+        self.total_steps = max(1, total_steps)
+        self.completed_steps = 0
+        self.partial: Dict[str, Any] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._future = None
+
+    @property
+    def progress(self) -> float:
+        if self.status == DONE:
+            return 1.0
+        return min(1.0, self.completed_steps / self.total_steps)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def update(self, key: str, value: Any = None, error: Optional[Exception] = None) -> None:
+        """
+        Records one finished step: a partial result, or the error that step hit.
+        """
+        with self._lock:
+            if error is not None:
+                self.errors[key] = error
+            else:
+                self.partial[key] = value
+            self.completed_steps += 1
+
+
+# ============================================================
+# 2. Manager
+# ============================================================
+
+class JobManager:
+    """
+    Runs jobs on a bounded thread pool. Finished jobs are kept for display
+    until more than max_finished have accumulated; the oldest go first.
+    """
+
+    def __init__(self, max_workers: int = 4, max_finished: int = 100):
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screener-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        label: str = "",
+        total_steps: int = 1,
+        meta: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Job:
+        job = Job(f"job-{next(self._ids)}", label=label, total_steps=total_steps, meta=meta)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs(self, job_ids: Iterable[str]) -> List[Job]:
+        return [job for job in (self._jobs.get(i) for i in job_ids) if job is not None]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Requests cancellation. Queued jobs are cancelled immediately; running
+        jobs stop at their next raise_if_cancelled() check.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+        return True
+
+    def active_count(self) -> int:
+        return sum(1 for job in list(self._jobs.values()) if not job.finished)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs) -> None:
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda j: j.created_at)[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+
+
+# ============================================================
+# 3. Screening jobs
+# ============================================================
+
+def run_sections_job(job: Job, sections) -> Dict[str, Any]:
+    """
+    Job body for an analysis: consumes an iter_sections-style iterator of
+    (section, output, error), recording each section on the job as it
+    arrives. Returns the merged output.
+
+    Fails with the first error only if every section failed; otherwise
+    failed sections stay in job.errors.
+    """
+    outputs: Dict[str, Dict[str, Any]] = {}
+    try:
+        job.raise_if_cancelled()
+        for section, output, error in sections:
+            job.update(section, output, error=error)
+            if error is None:
+                outputs[section] = output
+            job.raise_if_cancelled()
+    finally:
+        close = getattr(sections, "close", None)
+        if close is not None:
+            close()
+
+    if not outputs and job.errors:
+        raise next(iter(job.errors.values()))
+    return merge_section_outputs(outputs)
+
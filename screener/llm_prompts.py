@@ -0,0 +1,456 @@
+# llm_prompts.py
+
+import hashlib
+import json
+import re
+from collections.abc import Mapping
+from typing import Optional, Tuple
+
+from screener.config import MAX_OUTPUT_TOKENS
+from screener.segments import SEGMENTS_VERSION, focused_text
+
+SYSTEM_PROMPT = """
+You are a structured-output model. Your job is to analyze a job description and a resume and return a JSON object that EXACTLY matches the schema below.
+
+You MUST follow these rules:
+
+1. You MUST return valid JSON.
+2. You MUST include ALL fields in the schema, even if empty.
+3. You MUST NOT add any narrative text, explanations, apologies, or commentary.
+4. You MUST NOT add fields that are not in the schema.
+5. If information is missing, return empty strings, 0, or empty lists.
+6. Do NOT say things like “I could not parse the resume.” Just return empty fields.
+7. The field "gap_analysis_text" must be a detailed narrative (6–10 sentences) that explains the significance of the gaps, why they matter for this specific role, and how they relate to the job description. It should reference missing skills, tools, domain knowledge, and experience depth, and provide recruiter-style context about what these gaps imply for the candidate’s readiness. It should also rate each of these gaps anywhere from low priority to critical gaps.
+8. Return ONLY the JSON. No prose before or after.
+
+All scores are integers from 0 to 100.
+
+JSON schema (all fields required):
+
+{
+  "analysis": {
+    "overall_score": 0,
+    "skills_score": 0,
+    "experience_score": 0,
+    "impact_score": 0,
+    "leadership_score": 0,
+    "risk_flags": [],
+    "summary": "",
+    "recommendation": "",
+    "importance_of_gaps": "",
+    "resume_enhancement": ""
+  },
+  "validation_questions": [],
+  "gap_analysis": {
+    "missing_skills": [],
+    "missing_tools": [],
+    "missing_experience_depth": [],
+    "missing_domain_knowledge": [],
+    "priority_gaps": []
+  },
+"gap_analysis_text": "",
+  "resume_rewrite_suggestions": [
+    {
+      "original": "",
+      "suggestion": "",
+      "confidence": 0.0
+    }
+  ],
+  "ats_keyword_analysis": {
+    "jd_keywords": [],
+    "resume_keywords": [],
+    "missing_keywords": [],
+    "match_score": 0
+  }
+}
+
+Follow the schema EXACTLY.
+Return ONLY valid JSON.
+"""
+
+
+# ============================================================
+# User prompt
+# ============================================================
+
+USER_PROMPT_TEMPLATE = """
+Job Description:
+{jd_text}
+
+Resume:
+{resume_text}
+
+Return JSON only.
+"""
+
+
+_HSPACE = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def compact_text(text: str) -> str:
+    """
+    Collapses runs of spaces/tabs, trailing whitespace and stacked blank
+    lines, which extracted PDFs are full of. Words and line breaks are kept,
+    so rewrite originals still match the resume.
+    """
+    lines = [_HSPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+# ============================================================
+# Focused prompts
+# ============================================================
+#
+# With focused=True each prompt carries only the resume segments its
+# fields are about (segments.py): contact details never inform the
+# analysis, and rewrite suggestions only come from experience and summary
+# bullets. Resumes without recognisable headings are sent whole.
+
+_ANALYSIS_SEGMENTS = ("summary", "experience", "skills", "education", "certifications", "other")
+
+FOCUSED_SEGMENTS = {
+    "full": _ANALYSIS_SEGMENTS,
+    "scores": _ANALYSIS_SEGMENTS,
+    "gaps": _ANALYSIS_SEGMENTS,
+    "rewrites": ("summary", "experience", "other"),
+    "questions": ("summary", "experience", "skills", "certifications", "other"),
+}
+
+
+def prompt_resume_text(resume_text: str, section: str = "full", focused: bool = False) -> str:
+    """
+    The resume text a prompt for `section` ("full" for the single call)
+    carries, compacted.
+    """
+    if focused:
+        resume_text = focused_text(resume_text, FOCUSED_SEGMENTS[section])
+    return compact_text(resume_text)
+
+
+def build_prompt(jd_text: str, resume_text: str, focused: bool = False, depth: str = "full") -> str:
+    """
+    Single-call prompt: SYSTEM_PROMPT (or a trimmed depth's schema, see
+    DEPTHS) followed by the compacted JD and resume.
+    """
+    system = SYSTEM_PROMPT if depth == "full" else _depth_system(depth)
+    return system + "\n\n" + USER_PROMPT_TEMPLATE.format(
+        jd_text=compact_text(jd_text), resume_text=prompt_resume_text(resume_text, "full", focused)
+    )
+
+
+# ============================================================
+# Section prompts (fan-out mode)
+# ============================================================
+#
+# Fan-out mode splits the schema above into independent sub-requests that
+# run concurrently. Each section owns a disjoint set of top-level keys, so
+# the partial outputs merge back into exactly the SYSTEM_PROMPT shape.
+# "ats_keyword_analysis" is never requested here; the app computes it locally.
+
+SECTION_PROMPT_TEMPLATE = """
+You are a structured-output model. Your job is to analyze a job description and a resume and return a JSON object that EXACTLY matches the schema below.
+
+You MUST follow these rules:
+
+1. You MUST return valid JSON.
+2. You MUST include ALL fields in the schema, even if empty.
+3. You MUST NOT add any narrative text, explanations, apologies, or commentary.
+4. You MUST NOT add fields that are not in the schema.
+5. If information is missing, return empty strings, 0, or empty lists.
+6. Do NOT say things like “I could not parse the resume.” Just return empty fields.
+{extra_rules}8. Return ONLY the JSON. No prose before or after.
+
+JSON schema (all fields required):
+
+{schema}
+
+Follow the schema EXACTLY.
+Return ONLY valid JSON.
+"""
+
+SECTION_ORDER = ("scores", "gaps", "rewrites", "questions")
+
+SECTION_KEYS = {
+    "scores": ("analysis",),
+    "gaps": ("gap_analysis", "gap_analysis_text"),
+    "rewrites": ("resume_rewrite_suggestions",),
+    "questions": ("validation_questions",),
+}
+
+SECTION_SCHEMAS = {
+    "scores": """{
+  "analysis": {
+    "overall_score": 0,
+    "skills_score": 0,
+    "experience_score": 0,
+    "impact_score": 0,
+    "leadership_score": 0,
+    "risk_flags": [],
+    "summary": "",
+    "recommendation": "",
+    "importance_of_gaps": "",
+    "resume_enhancement": ""
+  }
+}""",
+    "gaps": """{
+  "gap_analysis": {
+    "missing_skills": [],
+    "missing_tools": [],
+    "missing_experience_depth": [],
+    "missing_domain_knowledge": [],
+    "priority_gaps": []
+  },
+  "gap_analysis_text": ""
+}""",
+    "rewrites": """{
+  "resume_rewrite_suggestions": [
+    {
+      "original": "",
+      "suggestion": "",
+      "confidence": 0.0
+    }
+  ]
+}""",
+    "questions": """{
+  "validation_questions": []
+}""",
+}
+
+SECTION_EXTRA_RULES = {
+    "scores": "7. All scores are integers from 0 to 100.\n",
+    "gaps": (
+        "7. The field \"gap_analysis_text\" must be a detailed narrative (6–10 sentences) that explains the significance of the gaps, "
+        "why they matter for this specific role, and how they relate to the job description. It should reference missing skills, tools, "
+        "domain knowledge, and experience depth, and provide recruiter-style context about what these gaps imply for the candidate’s readiness. "
+        "It should also rate each of these gaps anywhere from low priority to critical gaps.\n"
+    ),
+    "rewrites": (
+        "7. Every \"original\" must be copied verbatim from a line of the resume. "
+        "\"confidence\" is a number from 0.0 to 1.0.\n"
+    ),
+    "questions": "7. Questions must be answerable in a phone screen and grounded in the resume and job description.\n",
+}
+
+# Output caps per section. The narrative sections need the most room; the
+# sum stays under the 4096 tokens of the single-call mode.
+SECTION_MAX_OUTPUT_TOKENS = {
+    "scores": 1024,
+    "gaps": 1536,
+    "rewrites": 1024,
+    "questions": 512,
+}
+
+
+def build_section_prompt(
+    section: str, jd_text: str, resume_text: str, focused: bool = False, depth: str = "full"
+) -> str:
+    """
+    Prompt for a single fan-out section (one of SECTION_ORDER, or of
+    depth_sections(depth) for a trimmed depth).
+    """
+    if depth == "full":
+        system = SECTION_PROMPT_TEMPLATE.format(
+            extra_rules=SECTION_EXTRA_RULES[section],
+            schema=SECTION_SCHEMAS[section],
+        )
+    else:
+        system = _depth_system(depth, section)
+    return system + "\n\n" + USER_PROMPT_TEMPLATE.format(
+        jd_text=compact_text(jd_text), resume_text=prompt_resume_text(resume_text, section, focused)
+    )
+
+
+def empty_output() -> dict:
+    """
+    A fresh output object with every SYSTEM_PROMPT field set to its empty value.
+    """
+    return {
+        "analysis": {
+            "overall_score": 0,
+            "skills_score": 0,
+            "experience_score": 0,
+            "impact_score": 0,
+            "leadership_score": 0,
+            "risk_flags": [],
+            "summary": "",
+            "recommendation": "",
+            "importance_of_gaps": "",
+            "resume_enhancement": "",
+        },
+        "validation_questions": [],
+        "gap_analysis": {
+            "missing_skills": [],
+            "missing_tools": [],
+            "missing_experience_depth": [],
+            "missing_domain_knowledge": [],
+            "priority_gaps": [],
+        },
+        "gap_analysis_text": "",
+        "resume_rewrite_suggestions": [],
+        "ats_keyword_analysis": {
+            "jd_keywords": [],
+            "resume_keywords": [],
+            "missing_keywords": [],
+            "match_score": 0,
+        },
+    }
+
+
+def merge_section_outputs(section_outputs: dict) -> dict:
+    """
+    Merges {section: parsed_json} from fan-out calls into the full output shape.
+    Only the keys owned by each section are taken from its output; sections
+    that are missing or failed keep their empty defaults.
+    """
+    merged = empty_output()
+    for section, output in section_outputs.items():
+        if not isinstance(output, Mapping):
+            continue
+        for key in SECTION_KEYS.get(section, ()):
+            if key in output:
+                merged[key] = output[key]
+    return merged
+
+
+# ============================================================
+# Depth tiers
+# ============================================================
+#
+# Every analysis runs at one depth:
+# - triage: the five scores only, for high-volume first passes
+# - standard: scores, risk flags, a short summary and recommendation, the
+#   gap lists and validation questions; no narratives or rewrite suggestions
+# - full: the whole schema (the prompts above, unchanged)
+# The trimmed depths ask for fewer fields under smaller output caps, and
+# never for ats_keyword_analysis, which is computed locally. Their outputs
+# merge into the full shape with the other fields left empty.
+
+DEPTHS = ("triage", "standard", "full")
+DEFAULT_DEPTH = "full"
+
+_SCORE_FIELDS = ("overall_score", "skills_score", "experience_score", "impact_score", "leadership_score")
+
+# Top-level key -> the fields of it a trimmed depth asks for (None: all).
+DEPTH_FIELDS = {
+    "triage": {"analysis": _SCORE_FIELDS},
+    "standard": {
+        "analysis": _SCORE_FIELDS + ("risk_flags", "summary", "recommendation"),
+        "gap_analysis": None,
+        "validation_questions": None,
+    },
+}
+
+DEPTH_EXTRA_RULES = {
+    "triage": "7. All scores are integers from 0 to 100.\n",
+    "standard": (
+        "7. All scores are integers from 0 to 100. \"summary\" and \"recommendation\" are one or two sentences each. "
+        "List items are short phrases; validation questions are single questions grounded in the resume and job description.\n"
+    ),
+}
+
+# Output caps for the single call, and per fan-out section.
+DEPTH_MAX_OUTPUT_TOKENS = {"triage": 256, "standard": 1024, "full": MAX_OUTPUT_TOKENS}
+DEPTH_SECTION_MAX_OUTPUT_TOKENS = {
+    "triage": {"scores": 256},
+    "standard": {"scores": 384, "gaps": 512, "questions": 512},
+    "full": SECTION_MAX_OUTPUT_TOKENS,
+}
+
+
+def check_depth(depth: str) -> str:
+    if depth not in DEPTHS:
+        raise ValueError(f"Unknown depth {depth!r}; expected one of {', '.join(DEPTHS)}")
+    return depth
+
+
+def depth_sections(depth: str = DEFAULT_DEPTH) -> Tuple[str, ...]:
+    """
+    The fan-out sections a depth asks for, in SECTION_ORDER.
+    """
+    if check_depth(depth) == "full":
+        return SECTION_ORDER
+    keys = DEPTH_FIELDS[depth]
+    return tuple(section for section in SECTION_ORDER if any(key in keys for key in SECTION_KEYS[section]))
+
+
+def depth_schema(depth: str, section: Optional[str] = None) -> dict:
+    """
+    The schema a trimmed depth asks for, as an empty output; only the keys
+    of `section` when given.
+    """
+    empty = empty_output()
+    schema = {}
+    for key, fields in DEPTH_FIELDS[depth].items():
+        if section is not None and key not in SECTION_KEYS[section]:
+            continue
+        schema[key] = empty[key] if fields is None else {field: empty[key][field] for field in fields}
+    return schema
+
+
+def output_token_cap(depth: str = DEFAULT_DEPTH, section: Optional[str] = None) -> int:
+    """
+    Output cap for the single call (section=None) or a fan-out section.
+    """
+    if section is None:
+        return DEPTH_MAX_OUTPUT_TOKENS[check_depth(depth)]
+    return DEPTH_SECTION_MAX_OUTPUT_TOKENS[check_depth(depth)][section]
+
+
+# System prompts of the trimmed depths: (depth, None) for the single call,
+# (depth, section) per fan-out section.
+_DEPTH_SYSTEM = {
+    (depth, section): SECTION_PROMPT_TEMPLATE.format(
+        extra_rules=DEPTH_EXTRA_RULES[depth],
+        schema=json.dumps(depth_schema(depth, section), indent=2, ensure_ascii=False),
+    )
+    for depth in DEPTH_FIELDS
+    for section in (None,) + depth_sections(depth)
+}
+
+
+def _depth_system(depth: str, section: Optional[str] = None) -> str:
+    return _DEPTH_SYSTEM[check_depth(depth), section]
+
+
+# ============================================================
+# Version
+# ============================================================
+
+# Derived from every prompt template and schema above, so it changes
+# whenever the prompt does. Part of every cache key for model outputs.
+PROMPT_VERSION = hashlib.sha256(
+    "\0".join(
+        [SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, SECTION_PROMPT_TEMPLATE, "compact_text v1"]
+        + [SECTION_SCHEMAS[s] + SECTION_EXTRA_RULES[s] for s in SECTION_ORDER]
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+# Cache key for focused prompts: also covers which segments each prompt
+# carries and how resumes are segmented.
+FOCUSED_PROMPT_VERSION = hashlib.sha256(
+    "\0".join(
+        [PROMPT_VERSION, "segments v" + SEGMENTS_VERSION]
+        + [f"{key}={','.join(names)}" for key, names in sorted(FOCUSED_SEGMENTS.items())]
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+# Covers the trimmed depths' prompts and output caps.
+DEPTH_PROMPT_VERSION = hashlib.sha256(
+    "\0".join(
+        [f"{depth}/{section}={text}" for (depth, section), text in sorted(_DEPTH_SYSTEM.items(), key=str)]
+        + [json.dumps(DEPTH_MAX_OUTPUT_TOKENS, sort_keys=True), json.dumps(DEPTH_SECTION_MAX_OUTPUT_TOKENS, sort_keys=True)]
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+def prompt_version(focused: bool = False, depth: str = DEFAULT_DEPTH) -> str:
+    """
+    Cache key part for model outputs of one prompt variant. Full-depth
+    versions are PROMPT_VERSION and FOCUSED_PROMPT_VERSION as before.
+    """
+    base = FOCUSED_PROMPT_VERSION if focused else PROMPT_VERSION
+    if check_depth(depth) == "full":
+        return base
+    return hashlib.sha256(f"{base}\0{depth}\0{DEPTH_PROMPT_VERSION}".encode("utf-8")).hexdigest()[:12]
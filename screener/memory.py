@@ -0,0 +1,312 @@
+"""
+memory.py
+
+Memory tooling for large batch runs:
+- rss_bytes() / peak_rss_bytes(): process memory, standard library only
+- MemoryProfiler: opt-in tracemalloc + RSS accounting per pipeline stage,
+  hooked into metrics.span, with allocation-site snapshots
+- MemoryCeiling: an RSS limit the batch runner checks before admitting
+  work; above it, work runs one record at a time and registered release
+  callbacks (e.g. spilling caches) are invoked
+- DiskSpool: small SQLite-backed key/value spill file for finished results
+
+Per-stage tracemalloc figures are exact with --concurrency 1. With several
+records in flight they include allocations made by other threads during the
+stage, so treat them as upper bounds.
+"""
+
+import gc
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from screener import metrics
+
+
+# ============================================================
+# 1. Process memory
+# ============================================================
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size. Reads /proc on Linux; elsewhere falls back
+    to the peak, which is a safe over-estimate for a ceiling check.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def _mb(n: float) -> float:
+    return round(n / (1024 * 1024), 2)
+
+
+# ============================================================
+# 2. Profiler
+# ============================================================
+
+class MemoryProfiler:
+    """
+    Records, for every metrics.span stage: calls, the largest tracemalloc
+    peak above the stage's starting point, net bytes still allocated when
+    it ended, and the highest RSS seen at its end.
+
+    Snapshots are taken at start, whenever traced memory has grown by
+    snapshot_step_mb since the previous one, and for the final report; each
+    growth snapshot lists the allocation sites that grew the most.
+    """
+
+    def __init__(self, frames: int = 1, top: int = 10, snapshot_step_mb: float = 64.0):
+        self.frames = frames
+        self.top = top
+        self.snapshot_step = int(snapshot_step_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self._snapshots: List[Dict[str, Any]] = []
+        self._baseline = None
+        self._last = None
+        self._last_traced = 0
+        self._started_tracing = False
+
+    def start(self) -> "MemoryProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = self._last = self._snapshot()
+        self._last_traced = tracemalloc.get_traced_memory()[0]
+        metrics.SPAN_HOOKS.append(self)
+        return self
+
+    def stop(self) -> None:
+        if self in metrics.SPAN_HOOKS:
+            metrics.SPAN_HOOKS.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- span hooks ---
+
+    def enter(self, stage: str) -> List[int]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # The reset below hides the parent's peak so far; carry it over.
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        stack.append(frame)
+        return frame
+
+    def exit(self, stage: str, frame: List[int]) -> None:
+        stack = self._local.stack
+        current, peak = tracemalloc.get_traced_memory()
+        stage_peak = max(peak, frame[1])
+        if stack and stack[-1] is frame:
+            stack.pop()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], stage_peak)
+
+        peak_delta = stage_peak - frame[0]
+        rss = rss_bytes()
+        with self._lock:
+            stats = self._stages.setdefault(stage, {"calls": 0, "peak_bytes": 0, "retained_bytes": 0, "rss_bytes": 0})
+            stats["calls"] += 1
+            stats["retained_bytes"] = max(stats["retained_bytes"], current - frame[0])
+            stats["rss_bytes"] = max(stats["rss_bytes"], rss)
+            stats["peak_bytes"] = max(stats["peak_bytes"], peak_delta)
+            grown = current - self._last_traced >= self.snapshot_step
+            if grown:
+                self._last_traced = current
+        if grown:
+            self._record_growth(stage)
+
+    # --- snapshots ---
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+
+    def _growth(self, snapshot, since, limit: int) -> List[Dict[str, Any]]:
+        return [
+            {"site": str(stat.traceback[0]), "size_diff_mb": _mb(stat.size_diff), "count_diff": stat.count_diff}
+            for stat in snapshot.compare_to(since, "lineno")[:limit]
+        ]
+
+    def _record_growth(self, stage: str) -> None:
+        snapshot = self._snapshot()
+        with self._lock:
+            previous, self._last = self._last, snapshot
+        entry = {
+            "after_stage": stage,
+            "traced_mb": _mb(tracemalloc.get_traced_memory()[0]),
+            "rss_mb": _mb(rss_bytes()),
+            "top_growth": self._growth(snapshot, previous, 5),
+        }
+        with self._lock:
+            self._snapshots.append(entry)
+
+    # --- reporting ---
+
+    def report(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self._snapshot()
+
+        with self._lock:
+            stages = {
+                name: {
+                    "calls": s["calls"],
+                    "peak_mb": _mb(s["peak_bytes"]),
+                    "retained_mb": _mb(s["retained_bytes"]),
+                    "rss_mb": _mb(s["rss_bytes"]),
+                }
+                for name, s in sorted(self._stages.items())
+            }
+            snapshots = list(self._snapshots)
+        return {
+            "rss_mb": _mb(rss_bytes()),
+            "peak_rss_mb": _mb(peak_rss_bytes()),
+            "traced_mb": _mb(current),
+            "traced_peak_mb": _mb(peak),
+            "stages": stages,
+            "top_sites": [
+                {"site": str(stat.traceback[0]), "size_mb": _mb(stat.size), "count": stat.count}
+                for stat in snapshot.statistics("lineno")[: self.top]
+            ],
+            "growth_since_start": self._growth(snapshot, self._baseline, self.top) if self._baseline else [],
+            "growth_snapshots": snapshots,
+        }
+
+    def write_report(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+# ============================================================
+# 3. Ceiling
+# ============================================================
+
+class MemoryCeiling:
+    """
+    RSS limit for the batch runner. over() is a cheap /proc read. relieve()
+    runs the registered release callbacks and a GC pass, at most once per
+    min_interval_s, so a run hovering at the limit does not thrash.
+    """
+
+    def __init__(self, limit_mb: float, min_interval_s: float = 1.0):
+        self.limit_bytes = int(limit_mb * 1024 * 1024)
+        self.min_interval_s = min_interval_s
+        self.times_over = 0
+        self._lock = threading.Lock()
+        self._last_relief = 0.0
+        self._release: List[Callable[[], None]] = []
+        metrics.REGISTRY.register_collector("memory", "Process memory against the batch ceiling.", self._samples)
+
+    def on_pressure(self, release: Callable[[], None]) -> None:
+        self._release.append(release)
+
+    def over(self) -> bool:
+        if rss_bytes() <= self.limit_bytes:
+            return False
+        with self._lock:
+            self.times_over += 1
+        return True
+
+    def relieve(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_relief < self.min_interval_s:
+                return
+            self._last_relief = now
+        for release in self._release:
+            release()
+        gc.collect()
+
+    def _samples(self):
+        yield "screener_process_resident_bytes", {}, rss_bytes()
+        yield "screener_memory_ceiling_bytes", {}, self.limit_bytes
+        yield "screener_memory_ceiling_exceeded", {}, self.times_over
+
+
+# ============================================================
+# 4. Spill file
+# ============================================================
+
+class DiskSpool:
+    """
+    JSON values keyed by string in a temporary SQLite file, removed on
+    close(). Used to keep finished results out of the heap.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="screener-spool-", suffix=".db")
+            os.close(fd)
+            self._owned = True
+        else:
+            self._owned = False
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS spool (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO spool (key, value) VALUES (?, ?)", (key, data))
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM spool WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM spool WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        if self._owned:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,316 @@
+"""
+metrics.py
+
+Per-stage timing spans and counters for the screening core, exposed in the
+Prometheus text format.
+
+    with span("guardrails"):
+        guarded = apply_guardrails(...)
+
+Every span feeds the screener_stage_seconds histogram for its stage and,
+when the block raises, screener_stage_errors_total. Recording costs two
+perf_counter calls and a short lock; text is only built by render(), so
+nothing is paid for formatting unless something scrapes or writes the
+metrics file.
+
+Exposure:
+- render() / write_textfile(path) (node_exporter textfile collector style)
+- start_metrics_server(port) for processes without their own HTTP server
+- GET /metrics on the screening service (service.py)
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# ============================================================
+# 1. Metric types
+# ============================================================
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(_labels(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        self.observe_key(_labels(labels), value)
+
+    def observe_key(self, key: Labels, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def series(self) -> Dict[Labels, Dict[str, float]]:
+        with self._lock:
+            return {key: {"count": s[2], "sum": s[1]} for key, s in self._series.items()}
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(s[0]), s[1], s[2])) for k, s in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(round(total, 6))}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Holds metrics plus collectors: callables that return gauge samples
+    (name, labels, value) computed at render time, e.g. cache hit rates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: Dict[str, Tuple[str, Callable[[], Iterable[Sample]]]] = {}
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def register_collector(self, key: str, help_text: str, collect: Callable[[], Iterable[Sample]]) -> None:
+        """
+        Adds (or replaces, by key) a gauge collector.
+        """
+        with self._lock:
+            self._collectors[key] = (help_text, collect)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+
+        gauges: Dict[str, Tuple[str, List[Tuple[Dict[str, str], float]]]] = {}
+        for help_text, collect in collectors:
+            try:
+                samples = list(collect())
+            except Exception:
+                continue
+            for name, labels, value in samples:
+                gauges.setdefault(name, (help_text, []))[1].append((labels, value))
+        for name, (help_text, samples) in sorted(gauges.items()):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{_format_labels(sorted(labels.items()))} {_format_value(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram("screener_stage_seconds", "Wall time per pipeline stage.")
+STAGE_ERRORS = REGISTRY.counter("screener_stage_errors_total", "Stages that raised, by stage.")
+MODEL_CALLS = REGISTRY.counter("screener_model_calls_total", "Model calls, by status.")
+MODEL_TOKENS = REGISTRY.counter("screener_model_tokens_total", "Model tokens, by kind and source (reported or estimated).")
+RECORDS = REGISTRY.counter("screener_records_total", "Screened records, by outcome.")
+
+
+# ============================================================
+# 2. Recording
+# ============================================================
+
+# Objects with enter(stage) -> token and exit(stage, token), called around
+# every span (e.g. memory.MemoryProfiler). Empty unless a profiler is on.
+SPAN_HOOKS: List[Any] = []
+
+
+class span:
+    """
+    Context manager timing one stage. A plain class rather than
+    @contextmanager: it is entered on every stage of every record.
+    """
+
+    __slots__ = ("stage", "key", "start", "tokens")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.key = (("stage", stage),)
+        self.tokens = None
+
+    def __enter__(self) -> "span":
+        if SPAN_HOOKS:
+            self.tokens = [(hook, hook.enter(self.stage)) for hook in SPAN_HOOKS]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        STAGE_SECONDS.observe_key(self.key, time.perf_counter() - self.start)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(stage=self.stage)
+        if self.tokens:
+            for hook, token in reversed(self.tokens):
+                hook.exit(self.stage, token)
+
+
+def cache_samples(caches: Dict[str, Any]) -> Iterator[Sample]:
+    """
+    Gauge samples for a {name: CacheStats | LRUCache} map, for use in a collector.
+    """
+    for name, cache in caches.items():
+        stats = getattr(cache, "stats", cache)
+        yield "screener_cache_hits", {"cache": name}, stats.hits
+        yield "screener_cache_misses", {"cache": name}, stats.misses
+        yield "screener_cache_hit_ratio", {"cache": name}, round(stats.hit_rate, 4)
+
+
+# ============================================================
+# 3. Exposure
+# ============================================================
+
+def stage_summary() -> List[Dict[str, Any]]:
+    """
+    Per-stage call count, mean latency and error count, for debug views.
+    """
+    rows = []
+    for key, stats in STAGE_SECONDS.series().items():
+        stage = dict(key).get("stage", "")
+        rows.append({
+            "stage": stage,
+            "calls": stats["count"],
+            "mean_ms": round(stats["sum"] / stats["count"] * 1000, 2) if stats["count"] else 0.0,
+            "errors": int(STAGE_ERRORS.value(stage=stage)),
+        })
+    return sorted(rows, key=lambda row: row["stage"])
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def write_textfile(path: str) -> None:
+    """
+    Writes the current metrics atomically (temp file + rename), so a
+    collector never reads a half-written file.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """
+    Serves GET /metrics on a daemon thread. Idempotent per process.
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="screener-metrics", daemon=True).start()
+        return _server
+
+
+class MetricsFileWriter:
+    """
+    Rewrites a metrics textfile every interval_s on a daemon thread, and
+    once more on close().
+    """
+
+    def __init__(self, path: str, interval_s: float = 15.0):
+        self.path = path
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(interval_s,), name="screener-metrics-file", daemon=True)
+        self._thread.start()
+
+    def _run(self, interval_s: float) -> None:
+        while not self._stop.wait(interval_s):
+            write_textfile(self.path)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        write_textfile(self.path)
@@ -0,0 +1,281 @@
+"""
+pipeline.py
+
+This module orchestrates the full LLM pipeline:
+- prompt construction
+- model call
+- JSON extraction
+- guardrails enforcement and sanitization (one pass, see validator.py)
+- final output assembly
+
+It has no Streamlit dependency and imports google.generativeai only on the
+first model call (see clients.py), so it can be used from workers, CLIs and
+tests.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from screener.clients import get_model
+from screener.config import (
+    ANALYSIS_FIELDS,
+    MAX_OUTPUT_TOKENS,
+    MODEL_NAME,
+    SCORE_MAX,
+    SCORE_MIN,
+    generation_config,
+)
+from screener.guardrails import apply_guardrails
+from screener.validator import validate_output
+from screener.llm_prompts import (
+    DEFAULT_DEPTH,
+    build_prompt,
+    build_section_prompt,
+    depth_sections,
+    output_token_cap,
+    merge_section_outputs,
+)
+from screener.metrics import MODEL_CALLS, span
+from screener.usage import TokenUsage
+from screener.util import (
+    compute_ats_keyword_analysis,
+    extract_json_from_model_text,
+    sanitize_analysis,
+    sanitize_gap_analysis,
+    sanitize_rewrite_suggestions,
+    sanitize_validation_questions,
+)
+
+
+class ModelOutputError(ValueError):
+    """
+    The model returned text that is not valid JSON. The raw text is kept
+    so callers can show it.
+    """
+
+    def __init__(self, raw_text: str):
+        super().__init__("Model returned invalid JSON.")
+        self.raw_text = raw_text
+
+
+# ============================================================
+# 1. Model call
+# ============================================================
+
+def call_model(
+    prompt: str,
+    max_output_tokens: int = MAX_OUTPUT_TOKENS,
+    usage: Optional[TokenUsage] = None,
+) -> Dict[str, Any]:
+    """
+    Calls the LLM and returns parsed JSON.
+    Raises ModelOutputError if the response is not valid JSON.
+
+    The model object comes from the process-wide registry, so configuration
+    and connections are reused across calls and threads. Token usage is
+    added to `usage` when one is given.
+    """
+    model = get_model(MODEL_NAME)
+    try:
+        with span("model_call"):
+            response = model.generate_content(
+                prompt,
+                generation_config=generation_config(max_output_tokens),
+            )
+    except Exception:
+        MODEL_CALLS.inc(status="error")
+        raise
+    MODEL_CALLS.inc(status="ok")
+
+    raw_text = (response.text or "").strip()
+    (usage if usage is not None else TokenUsage()).record(response, prompt, raw_text)
+    try:
+        with span("parse"):
+            parsed = extract_json_from_model_text(raw_text)
+    except ValueError as e:
+        raise ModelOutputError(raw_text) from e
+
+    return parsed
+
+
+# ============================================================
+# 2. Guardrails + sanitization
+# ============================================================
+
+def finalize_output(jd_text: str, resume_text: str, raw_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Applies guardrails and sanitizes every section of the output, in one
+    pass (validator.validate_output). The result always has the full
+    SYSTEM_PROMPT shape; raw_output is not modified.
+    """
+    with span("validate"):
+        return validate_output(jd_text, resume_text, raw_output)
+
+
+def finalize_output_chain(jd_text: str, resume_text: str, raw_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The reference implementation of finalize_output: guardrails, then each
+    sanitize_* function. Edits raw_output in place. Kept for equivalence
+    checks and benchmarks (benchmarks/validator.py).
+    """
+    return _sanitize_output(apply_guardrails(jd_text, resume_text, raw_output))
+
+
+def _sanitize_output(guarded_output: Dict[str, Any]) -> Dict[str, Any]:
+    output = merge_section_outputs({})
+    output["analysis"] = sanitize_analysis(
+        guarded_output.get("analysis", {}) or {}, ANALYSIS_FIELDS, SCORE_MIN, SCORE_MAX
+    )
+    output["validation_questions"] = sanitize_validation_questions(
+        guarded_output.get("validation_questions", [])
+    )
+    output["gap_analysis"] = sanitize_gap_analysis(guarded_output.get("gap_analysis", {}))
+    output["gap_analysis_text"] = str(guarded_output.get("gap_analysis_text", "") or "")
+    output["resume_rewrite_suggestions"] = sanitize_rewrite_suggestions(
+        guarded_output.get("resume_rewrite_suggestions", [])
+    )
+    if isinstance(guarded_output.get("ats_keyword_analysis"), dict):
+        output["ats_keyword_analysis"] = guarded_output["ats_keyword_analysis"]
+
+    return output
+
+
+# ============================================================
+# 3. Pipeline Orchestration
+# ============================================================
+
+def iter_raw_sections(
+    jd_text: str,
+    resume_text: str,
+    fanout: bool = False,
+    sections: Optional[Sequence[str]] = None,
+    usage: Optional[TokenUsage] = None,
+    focused: bool = False,
+    depth: str = DEFAULT_DEPTH,
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Yields (section, raw_output, error) for each requested section (default:
+    every section of the depth), before guardrails.
+
+    - Single mode: one model call; every section is yielded from the same output.
+    - Fan-out mode: one call per section, run concurrently and yielded in
+      completion order.
+
+    focused=True sends each prompt only the resume segments it needs
+    (llm_prompts.FOCUSED_SEGMENTS); depth picks the schema and output caps
+    (llm_prompts.DEPTHS).
+    """
+    if sections is None:
+        sections = depth_sections(depth)
+    if not fanout:
+        try:
+            with span("prompt"):
+                prompt = build_prompt(jd_text, resume_text, focused, depth)
+            raw_output = call_model(prompt, output_token_cap(depth), usage=usage)
+        except Exception as e:
+            for section in sections:
+                yield section, None, e
+            return
+        for section in sections:
+            yield section, raw_output, None
+        return
+
+    with span("prompt"):
+        prompts = {
+            section: build_section_prompt(section, jd_text, resume_text, focused, depth) for section in sections
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, len(sections))) as executor:
+        futures = {
+            executor.submit(call_model, prompts[section], output_token_cap(depth, section), usage): section
+            for section in sections
+        }
+        for future in as_completed(futures):
+            section = futures[future]
+            try:
+                raw_output = future.result()
+            except Exception as e:
+                yield section, None, e
+                continue
+            yield section, raw_output, None
+
+
+def finalize_section(jd_text: str, resume_text: str, section: str, raw_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Guards and sanitizes the keys of raw_output owned by one section.
+    Guardrails checks are per-section, so this gives exactly what finalizing
+    the full merged output would contain for those keys.
+
+    raw_output is left untouched, so callers can cache it and finalize it
+    again later.
+    """
+    return finalize_output(jd_text, resume_text, merge_section_outputs({section: raw_output}))
+
+
+def iter_sections(
+    jd_text: str,
+    resume_text: str,
+    fanout: bool = False,
+    usage: Optional[TokenUsage] = None,
+    focused: bool = False,
+    depth: str = DEFAULT_DEPTH,
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Yields (section, output, error) for each section of the depth, in
+    SECTION_ORDER for a single call.
+
+    Each output is guarded and sanitized and has the full output shape; only
+    the keys owned by its section are meaningful. Iteration happens on the
+    caller's thread, so callers can render as sections arrive.
+    """
+    for section, raw_output, error in iter_raw_sections(
+        jd_text, resume_text, fanout=fanout, usage=usage, focused=focused, depth=depth
+    ):
+        if error is not None:
+            yield section, None, error
+        else:
+            yield section, finalize_section(jd_text, resume_text, section, raw_output), None
+
+
+def run_pipeline(
+    jd_text: str,
+    resume_text: str,
+    fanout: bool = False,
+    usage: Optional[TokenUsage] = None,
+    focused: bool = False,
+    fuzzy_ats: bool = False,
+    depth: str = DEFAULT_DEPTH,
+) -> Dict[str, Any]:
+    """
+    Full pipeline:
+    - Build prompt(s)
+    - Call model
+    - Apply guardrails
+    - Sanitize output
+    - Return the full output object, with ATS keyword analysis computed locally
+
+    Raises the first model error if any section failed. Pass a TokenUsage
+    to collect the tokens of every model call; focused=True trims the resume
+    in each prompt to the segments it needs; fuzzy_ats counts keyword
+    variants in the ATS analysis. depth ("triage", "standard" or "full")
+    picks how much of the schema the model is asked for; the output always
+    has the full shape.
+    """
+    section_outputs: Dict[str, Dict[str, Any]] = {}
+    first_error: Optional[Exception] = None
+
+    for section, output, error in iter_sections(
+        jd_text, resume_text, fanout=fanout, usage=usage, focused=focused, depth=depth
+    ):
+        if error is not None:
+            first_error = first_error or error
+            continue
+        section_outputs[section] = output
+
+    if first_error is not None:
+        raise first_error
+
+    merged = merge_section_outputs(section_outputs)
+    with span("ats"):
+        merged["ats_keyword_analysis"] = compute_ats_keyword_analysis(jd_text, resume_text, fuzzy_ats)
+    return merged
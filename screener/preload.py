@@ -0,0 +1,11 @@
+"""
+preload.py
+
+Importing this module warms the process for batch work (workers.preload).
+The forkserver behind workers.warm_pool imports it once, so every worker
+forked from it starts warm.
+"""
+
+from screener.workers import preload
+
+preload()
@@ -0,0 +1,405 @@
+"""
+results.py
+
+Compact result types for code that holds many analyses at once (the
+dedupe cache, the app's stage caches, large batch runs):
+- Analysis, GapAnalysis, RewriteSuggestion, AtsResult and ScreenResult:
+  __slots__ classes with tuple fields and the same field names as the
+  output dict
+- from_dict(): one pass over parsed JSON with the same coercions as the
+  util.sanitize_* functions; strings are shared with the source, not copied
+- to_dict(): back to the plain output shape, with fresh lists (safe to
+  mutate, e.g. by guardrails)
+- view(): a read-only Mapping over an object, so code written against
+  output dicts (the app's render functions) reads it without a copy;
+  small string mappings (the ATS variant matches and keyword segments)
+  are kept as pairs and viewed as read-only dicts
+
+Objects are treated as immutable. Pipeline, JSONL and HTTP formats stay
+plain dicts.
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from screener.config import SCORE_MAX, SCORE_MIN
+from screener.util import clamp_score
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return value if type(value) is str else str(value)
+
+
+def _strings(value: Any) -> Tuple[str, ...]:
+    return tuple(map(str, value)) if isinstance(value, list) else ()
+
+
+class _Pairs(tuple):
+    # (key, value) items of a small mapping.
+    __slots__ = ()
+
+
+def _pairs(value: Any, convert) -> Optional[_Pairs]:
+    # None when the key is absent (or not a dict), so to_dict leaves it out.
+    if not isinstance(value, dict):
+        return None
+    return _Pairs((str(k), convert(v)) for k, v in value.items())
+
+
+# ============================================================
+# 1. Base
+# ============================================================
+
+class _Record:
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def view(self) -> "ResultView":
+        return ResultView(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.FIELDS)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, f) for f in self.FIELDS)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for field, value in zip(self.FIELDS, state):
+            object.__setattr__(self, field, value)
+
+
+class ResultView(Mapping):
+    """
+    Mapping over a result object's fields. Nested objects come back as
+    views, tuples as tuples; nothing is copied.
+    """
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: _Record):
+        self._record = record
+
+    def __getitem__(self, key: str) -> Any:
+        record = self._record
+        if key not in record._FIELD_SET:
+            raise KeyError(key)
+        return _viewed(getattr(record, key))
+
+    # Overridden for speed: Mapping's versions go through __getitem__ and
+    # exception handling, and render code calls get() on every field.
+    def get(self, key: str, default: Any = None) -> Any:
+        record = self._record
+        if key not in record._FIELD_SET:
+            return default
+        return _viewed(getattr(record, key))
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._record._FIELD_SET
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._record.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self._record.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"ResultView({self._record!r})"
+
+
+def _viewed(value: Any) -> Any:
+    if isinstance(value, _Record):
+        return ResultView(value)
+    if type(value) is _Pairs:
+        return MappingProxyType(dict(value))
+    if type(value) is tuple and value and isinstance(value[0], _Record):
+        return tuple(ResultView(item) for item in value)
+    return value
+
+
+def _fields(cls):
+    cls._FIELD_SET = frozenset(cls.FIELDS)
+    return cls
+
+
+# ============================================================
+# 2. Result types
+# ============================================================
+
+@_fields
+class Analysis(_Record):
+    __slots__ = (
+        "overall_score", "skills_score", "experience_score", "impact_score", "leadership_score",
+        "risk_flags", "summary", "recommendation", "importance_of_gaps", "resume_enhancement",
+    )
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        overall_score: int = 0,
+        skills_score: int = 0,
+        experience_score: int = 0,
+        impact_score: int = 0,
+        leadership_score: int = 0,
+        risk_flags: Tuple[str, ...] = (),
+        summary: str = "",
+        recommendation: str = "",
+        importance_of_gaps: str = "",
+        resume_enhancement: str = "",
+    ):
+        self.overall_score = overall_score
+        self.skills_score = skills_score
+        self.experience_score = experience_score
+        self.impact_score = impact_score
+        self.leadership_score = leadership_score
+        self.risk_flags = risk_flags
+        self.summary = summary
+        self.recommendation = recommendation
+        self.importance_of_gaps = importance_of_gaps
+        self.resume_enhancement = resume_enhancement
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "Analysis":
+        """
+        Same result as util.sanitize_analysis with config.ANALYSIS_FIELDS.
+        """
+        if not isinstance(raw, dict):
+            return cls()
+        get = raw.get
+        return cls(
+            clamp_score(get("overall_score"), SCORE_MIN, SCORE_MAX),
+            clamp_score(get("skills_score"), SCORE_MIN, SCORE_MAX),
+            clamp_score(get("experience_score"), SCORE_MIN, SCORE_MAX),
+            clamp_score(get("impact_score"), SCORE_MIN, SCORE_MAX),
+            clamp_score(get("leadership_score"), SCORE_MIN, SCORE_MAX),
+            _strings(get("risk_flags")),
+            _text(get("summary")),
+            _text(get("recommendation")),
+            _text(get("importance_of_gaps")),
+            _text(get("resume_enhancement")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "overall_score": self.overall_score,
+            "skills_score": self.skills_score,
+            "experience_score": self.experience_score,
+            "impact_score": self.impact_score,
+            "leadership_score": self.leadership_score,
+            "risk_flags": list(self.risk_flags),
+            "summary": self.summary,
+            "recommendation": self.recommendation,
+            "importance_of_gaps": self.importance_of_gaps,
+            "resume_enhancement": self.resume_enhancement,
+        }
+
+
+@_fields
+class GapAnalysis(_Record):
+    __slots__ = ("missing_skills", "missing_tools", "missing_experience_depth", "missing_domain_knowledge", "priority_gaps")
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        missing_skills: Tuple[str, ...] = (),
+        missing_tools: Tuple[str, ...] = (),
+        missing_experience_depth: Tuple[str, ...] = (),
+        missing_domain_knowledge: Tuple[str, ...] = (),
+        priority_gaps: Tuple[str, ...] = (),
+    ):
+        self.missing_skills = missing_skills
+        self.missing_tools = missing_tools
+        self.missing_experience_depth = missing_experience_depth
+        self.missing_domain_knowledge = missing_domain_knowledge
+        self.priority_gaps = priority_gaps
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "GapAnalysis":
+        """
+        Same result as util.sanitize_gap_analysis.
+        """
+        if not isinstance(raw, dict):
+            return cls()
+        get = raw.get
+        return cls(
+            _strings(get("missing_skills")),
+            _strings(get("missing_tools")),
+            _strings(get("missing_experience_depth")),
+            _strings(get("missing_domain_knowledge")),
+            _strings(get("priority_gaps")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "missing_skills": list(self.missing_skills),
+            "missing_tools": list(self.missing_tools),
+            "missing_experience_depth": list(self.missing_experience_depth),
+            "missing_domain_knowledge": list(self.missing_domain_knowledge),
+            "priority_gaps": list(self.priority_gaps),
+        }
+
+
+@_fields
+class RewriteSuggestion(_Record):
+    __slots__ = ("original", "suggestion", "confidence")
+    FIELDS = __slots__
+
+    def __init__(self, original: str, suggestion: str, confidence: float):
+        self.original = original
+        self.suggestion = suggestion
+        self.confidence = confidence
+
+    @classmethod
+    def from_dict(cls, raw: Any, min_confidence: float = 0.7) -> Optional["RewriteSuggestion"]:
+        """
+        None for entries util.sanitize_rewrite_suggestions would drop.
+        """
+        if not isinstance(raw, dict):
+            return None
+        original = str(raw.get("original", "")).strip()
+        suggestion = str(raw.get("suggestion", "")).strip()
+        try:
+            confidence = float(raw.get("confidence", 0.0))
+        except Exception:
+            confidence = 0.0
+        if not original or not suggestion or confidence < min_confidence:
+            return None
+        return cls(original, suggestion, confidence)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"original": self.original, "suggestion": self.suggestion, "confidence": self.confidence}
+
+    @classmethod
+    def tuple_from(cls, raw: Any, min_confidence: float = 0.7) -> Tuple["RewriteSuggestion", ...]:
+        if not isinstance(raw, list):
+            return ()
+        items = (cls.from_dict(item, min_confidence) for item in raw)
+        return tuple(item for item in items if item is not None)
+
+
+@_fields
+class AtsResult(_Record):
+    """
+    variant_matches (fuzzy ATS) and keyword_segments (the app's per-section
+    hits) are None when the output has no such key.
+    """
+
+    __slots__ = (
+        "jd_keywords", "resume_keywords", "missing_keywords", "match_score", "variant_matches", "keyword_segments",
+    )
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        jd_keywords: Tuple[str, ...] = (),
+        resume_keywords: Tuple[str, ...] = (),
+        missing_keywords: Tuple[str, ...] = (),
+        match_score: int = 0,
+        variant_matches: Optional[_Pairs] = None,
+        keyword_segments: Optional[_Pairs] = None,
+    ):
+        self.jd_keywords = jd_keywords
+        self.resume_keywords = resume_keywords
+        self.missing_keywords = missing_keywords
+        self.match_score = match_score
+        self.variant_matches = variant_matches
+        self.keyword_segments = keyword_segments
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "AtsResult":
+        """
+        From compute_ats_keyword_analysis output.
+        """
+        if not isinstance(raw, dict):
+            return cls()
+        get = raw.get
+        return cls(
+            _strings(get("jd_keywords")),
+            _strings(get("resume_keywords")),
+            _strings(get("missing_keywords")),
+            clamp_score(get("match_score"), 0, 100),
+            _pairs(get("variant_matches"), _text),
+            _pairs(get("keyword_segments"), _strings),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "jd_keywords": list(self.jd_keywords),
+            "resume_keywords": list(self.resume_keywords),
+            "missing_keywords": list(self.missing_keywords),
+            "match_score": self.match_score,
+        }
+        if self.variant_matches is not None:
+            out["variant_matches"] = dict(self.variant_matches)
+        if self.keyword_segments is not None:
+            out["keyword_segments"] = {segment: list(keywords) for segment, keywords in self.keyword_segments}
+        return out
+
+
+@_fields
+class ScreenResult(_Record):
+    """
+    The full output shape (llm_prompts.empty_output) as one object.
+    """
+
+    __slots__ = (
+        "analysis", "validation_questions", "gap_analysis", "gap_analysis_text",
+        "resume_rewrite_suggestions", "ats_keyword_analysis",
+    )
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        analysis: Optional[Analysis] = None,
+        validation_questions: Tuple[str, ...] = (),
+        gap_analysis: Optional[GapAnalysis] = None,
+        gap_analysis_text: str = "",
+        resume_rewrite_suggestions: Tuple[RewriteSuggestion, ...] = (),
+        ats_keyword_analysis: Optional[AtsResult] = None,
+    ):
+        self.analysis = analysis if analysis is not None else Analysis()
+        self.validation_questions = validation_questions
+        self.gap_analysis = gap_analysis if gap_analysis is not None else GapAnalysis()
+        self.gap_analysis_text = gap_analysis_text
+        self.resume_rewrite_suggestions = resume_rewrite_suggestions
+        self.ats_keyword_analysis = ats_keyword_analysis if ats_keyword_analysis is not None else AtsResult()
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "ScreenResult":
+        """
+        From a parsed model output or a finalized output dict. Gives the same
+        fields as pipeline's sanitization step, so to_dict() of a finalized
+        output round-trips exactly.
+        """
+        if not isinstance(raw, dict):
+            return cls()
+        get = raw.get
+        return cls(
+            Analysis.from_dict(get("analysis")),
+            _strings(get("validation_questions")),
+            GapAnalysis.from_dict(get("gap_analysis")),
+            _text(get("gap_analysis_text") or ""),
+            RewriteSuggestion.tuple_from(get("resume_rewrite_suggestions")),
+            AtsResult.from_dict(get("ats_keyword_analysis")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analysis": self.analysis.to_dict(),
+            "validation_questions": list(self.validation_questions),
+            "gap_analysis": self.gap_analysis.to_dict(),
+            "gap_analysis_text": self.gap_analysis_text,
+            "resume_rewrite_suggestions": [item.to_dict() for item in self.resume_rewrite_suggestions],
+            "ats_keyword_analysis": self.ats_keyword_analysis.to_dict(),
+        }
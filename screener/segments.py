@@ -0,0 +1,232 @@
+"""
+segments.py
+
+Resume segmentation: splits a resume into the sections recruiters and the
+model care about, by their heading lines.
+
+    segments = segment_resume(resume_text)
+    segments.text("experience", "skills")
+
+Segments (SEGMENT_NAMES):
+- contact: everything before the first heading (name, email, phone, links)
+- summary, experience, skills, education, certifications
+- other: sections under headings it does not map (awards, languages, ...),
+  or the whole resume when it has no recognisable headings at all
+
+Each line belongs to exactly one segment, heading lines included, and
+segments keep their lines verbatim. Results are cached per content hash, so
+the ATS view, the validator and the prompt builder share one segmentation
+per resume. Used for:
+- keyword_segments(): which sections each ATS keyword was found in
+- ResumeSegments.search_lines: resume lines, experience first, for the
+  rewrite-original check (validator.py)
+- focused prompts: only the segments a prompt needs (llm_prompts.py)
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from screener.cache import MISSING, LRUCache
+from screener.metrics import span
+from screener.util import content_hash
+
+# Changes whenever the heading table or the splitting rules do; part of the
+# cache key of every focused prompt (llm_prompts.FOCUSED_PROMPT_VERSION).
+SEGMENTS_VERSION = "1"
+
+SEGMENT_NAMES = ("contact", "summary", "experience", "skills", "education", "certifications", "other")
+
+HEADINGS = {
+    "summary": (
+        "summary", "professional summary", "career summary", "executive summary", "profile",
+        "professional profile", "objective", "career objective", "about", "about me", "overview",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "projects",
+        "selected projects", "key projects",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "skills and tools", "tools",
+        "technologies", "tools and technologies", "core competencies", "competencies",
+        "technical proficiencies", "areas of expertise", "expertise",
+    ),
+    "education": (
+        "education", "academic background", "education and training", "qualifications",
+    ),
+    "certifications": (
+        "certifications", "certification", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses", "courses", "training",
+    ),
+    "other": (
+        "awards", "honors", "honors and awards", "achievements", "publications", "patents",
+        "languages", "interests", "hobbies", "volunteering", "volunteer experience",
+        "affiliations", "memberships", "references", "additional information",
+    ),
+}
+
+# Headings are short; a longer line only counts when a heading starts it
+# ("Skills: Python, SQL").
+MAX_HEADING_CHARS = 40
+
+_HEADING_KEYS = {alias: name for name, aliases in HEADINGS.items() for alias in aliases}
+_HEADING_STRIP = " \t#*-=_:|>•·"
+_ATS_WORDS = re.compile(r"[a-zA-Z]{3,}")
+
+# Rewrite originals are almost always bullets, so the validator searches
+# these segments first.
+SEARCH_ORDER = ("experience", "summary", "other", "skills", "certifications", "education", "contact")
+
+
+def heading_segment(line: str) -> Optional[str]:
+    """
+    The segment a heading line opens, or None for any other line.
+    """
+    head = line.strip()
+    if len(head) > MAX_HEADING_CHARS:
+        colon = head.find(":", 0, MAX_HEADING_CHARS)
+        if colon < 0:
+            return None
+        head = head[:colon]
+    else:
+        head = head.split(":", 1)[0]
+    key = " ".join(head.strip(_HEADING_STRIP).lower().replace("&", "and").split())
+    return _HEADING_KEYS.get(key)
+
+
+def word_tokens(text: str) -> set:
+    """
+    guardrails.word_level_similarity's token set. Lowercasing the text once
+    gives the same tokens: the stripped characters have no case.
+    """
+    return {w.strip(".,;:()") for w in text.lower().split()}
+
+
+# ============================================================
+# 1. Segmentation
+# ============================================================
+
+class ResumeSegments:
+    """
+    One resume's lines (resume_text.split("\\n")) and its segments as
+    (name, first line, end line) spans in resume order. A name can have
+    several spans. Treated as immutable; shared through the cache.
+    """
+
+    __slots__ = ("lines", "spans", "_search_lines")
+
+    def __init__(self, lines: Tuple[str, ...], spans: Tuple[Tuple[str, int, int], ...]):
+        self.lines = lines
+        self.spans = spans
+        self._search_lines: Optional[Tuple[str, ...]] = None
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """
+        Segment names present, in SEGMENT_NAMES order.
+        """
+        present = {name for name, _, _ in self.spans}
+        return tuple(name for name in SEGMENT_NAMES if name in present)
+
+    @property
+    def has_headings(self) -> bool:
+        return any(name != "other" for name, _, _ in self.spans)
+
+    def text(self, *names: str) -> str:
+        """
+        The lines of the named segments, in resume order.
+        """
+        wanted = set(names)
+        parts = [
+            "\n".join(self.lines[start:end]) for name, start, end in self.spans if name in wanted
+        ]
+        return "\n".join(parts)
+
+    def as_dict(self) -> Dict[str, str]:
+        return {name: self.text(name) for name in self.names}
+
+    @property
+    def search_lines(self) -> Tuple[str, ...]:
+        """
+        Every non-blank line, stripped, ordered by SEARCH_ORDER and then by
+        position. The same lines guardrails.original_matches_resume scans.
+        """
+        if self._search_lines is None:
+            rank = {name: i for i, name in enumerate(SEARCH_ORDER)}
+            ordered = sorted(self.spans, key=lambda span: rank[span[0]])
+            self._search_lines = tuple(
+                stripped
+                for _, start, end in ordered
+                for stripped in (line.strip() for line in self.lines[start:end])
+                if stripped
+            )
+        return self._search_lines
+
+
+def split_segments(resume_text: str) -> ResumeSegments:
+    """
+    Segments a resume without the cache.
+    """
+    lines = tuple(resume_text.split("\n"))
+    spans: List[Tuple[str, int, int]] = []
+    current, start = "contact", 0
+    for i, line in enumerate(lines):
+        name = heading_segment(line)
+        if name is None:
+            continue
+        if i > start:
+            spans.append((current, start, i))
+        current, start = name, i
+    if start < len(lines):
+        spans.append((current, start, len(lines)))
+    if len(spans) == 1 and spans[0][0] == "contact":
+        # No headings: nothing says which part is contact details.
+        spans = [("other", 0, len(lines))]
+    return ResumeSegments(lines, tuple(spans))
+
+
+SEGMENT_CACHE = LRUCache(max_entries=256)
+
+
+def segment_resume(resume_text: str) -> ResumeSegments:
+    """
+    Segments a resume, cached by content hash.
+    """
+    key = content_hash(resume_text)
+    segments = SEGMENT_CACHE.get(key)
+    if segments is MISSING:
+        with span("segment"):
+            segments = split_segments(resume_text)
+        SEGMENT_CACHE.put(key, segments)
+    return segments
+
+
+# ============================================================
+# 2. Uses
+# ============================================================
+
+def keyword_segments(keywords: Iterable[str], segments: ResumeSegments) -> Dict[str, List[str]]:
+    """
+    {segment: keywords found in it} for ATS keywords, using the ATS
+    tokenization (util.compute_ats_keyword_analysis). Segments without hits
+    are left out; a keyword can appear under several segments.
+    """
+    keywords = list(keywords)
+    hits: Dict[str, List[str]] = {}
+    for name in segments.names:
+        words = set(_ATS_WORDS.findall(segments.text(name).lower()))
+        found = [kw for kw in keywords if kw in words]
+        if found:
+            hits[name] = found
+    return hits
+
+
+def focused_text(resume_text: str, names: Iterable[str]) -> str:
+    """
+    Only the named segments of a resume, for a focused prompt. Resumes
+    without recognisable headings are returned whole.
+    """
+    segments = segment_resume(resume_text)
+    if not segments.has_headings:
+        return resume_text
+    return segments.text(*names)
@@ -0,0 +1,245 @@
+"""
+service.py
+
+Local HTTP screening service built on the standard library:
+
+    python -m screener serve --port 8080 --workers 4
+
+Endpoints (JSON in, JSON out):
+- GET  /healthz   liveness plus pool usage
+- GET  /metrics   Prometheus text format: stage latencies, model calls, pool usage
+- POST /ats       {"jd_text", "resume_text", "fuzzy_ats"?}                         -> ATS keyword analysis
+- POST /analyze   {"jd_text", "resume_text", "fanout"?, "focused"?, "fuzzy_ats"?, "depth"?} -> full pipeline output
+
+"depth" is "triage", "standard" or "full" (default; see llm_prompts.DEPTHS).
+
+Full analyses run on a bounded worker pool. When every worker is busy and
+the wait queue is full, /analyze answers 429 with Retry-After instead of
+piling up; an analysis that takes longer than the service timeout answers
+504. Concurrent identical requests (same JD, resume and mode) are
+coalesced onto one in-flight model call. With --dedupe, near-duplicates of
+an already analysed resume are answered without a model call and carry a
+"duplicate_of" field.
+"""
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from screener import metrics
+from screener.dedupe import DedupeCache
+from screener.llm_prompts import DEFAULT_DEPTH, check_depth
+from screener.pipeline import ModelOutputError, run_pipeline
+from screener.util import compute_ats_keyword_analysis, content_hash
+
+
+HTTP_REQUESTS = metrics.REGISTRY.counter("screener_http_requests_total", "HTTP requests, by path and status.")
+
+
+class Saturated(Exception):
+    pass
+
+
+# ============================================================
+# 1. Bounded, coalescing executor
+# ============================================================
+
+class CoalescingPool:
+    """
+    Thread pool with admission control and request coalescing.
+
+    At most max_workers + max_queued distinct calls are admitted at once;
+    submit() raises Saturated beyond that. A call whose key is already in
+    flight joins the existing Future instead of taking a slot.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queued: int = 8):
+        self.capacity = max_workers + max_queued
+        self.coalesced = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screener-http")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+
+            if not self._slots.acquire(blocking=False):
+                self.rejected += 1
+                raise Saturated()
+
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda _f: self._finish(key))
+        return future
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+        self._slots.release()
+
+
+# ============================================================
+# 2. Service
+# ============================================================
+
+class ScreeningService:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queued: int = 8,
+        timeout: float = 300.0,
+        dedupe: Optional[DedupeCache] = None,
+    ):
+        self.pool = CoalescingPool(max_workers=max_workers, max_queued=max_queued)
+        self.timeout = timeout
+        self.dedupe = dedupe
+        metrics.REGISTRY.register_collector("service", "Screening service pool state.", self._samples)
+
+    def ats(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        jd_text, resume_text = _texts(payload)
+        return compute_ats_keyword_analysis(jd_text, resume_text, bool(payload.get("fuzzy_ats", False)))
+
+    def analyze(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        jd_text, resume_text = _texts(payload)
+        fanout = bool(payload.get("fanout", False))
+        focused = bool(payload.get("focused", False))
+        fuzzy_ats = bool(payload.get("fuzzy_ats", False))
+        depth = check_depth(payload.get("depth") or DEFAULT_DEPTH)
+
+        if self.dedupe is not None:
+            match = self.dedupe.lookup(jd_text, resume_text, depth, fanout, focused)
+            if match is not None:
+                output, duplicate = self.dedupe.reuse(jd_text, resume_text, match, fuzzy_ats)
+                output["duplicate_of"] = duplicate
+                return output
+
+        key = (content_hash(jd_text), content_hash(resume_text), fanout, focused, fuzzy_ats, depth)
+        future = self.pool.submit(key, self._analyze, jd_text, resume_text, fanout, focused, fuzzy_ats, depth)
+        return future.result(timeout=self.timeout)
+
+    def _analyze(
+        self, jd_text: str, resume_text: str, fanout: bool, focused: bool, fuzzy_ats: bool, depth: str
+    ) -> Dict[str, Any]:
+        output = run_pipeline(
+            jd_text, resume_text, fanout=fanout, focused=focused, fuzzy_ats=fuzzy_ats, depth=depth
+        )
+        if self.dedupe is not None:
+            self.dedupe.remember(
+                jd_text, resume_text, content_hash(resume_text)[:12], output, depth, fanout, focused
+            )
+        return output
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "in_flight": self.pool.in_flight(),
+            "capacity": self.pool.capacity,
+            "coalesced": self.pool.coalesced,
+            "rejected": self.pool.rejected,
+            "deduplicated": self.dedupe.hits if self.dedupe is not None else 0,
+        }
+
+    def _samples(self):
+        for name, value in self.health().items():
+            if name != "status":
+                yield f"screener_service_{name}", {}, value
+
+
+def _texts(payload: Dict[str, Any]) -> Tuple[str, str]:
+    jd_text = payload.get("jd_text")
+    resume_text = payload.get("resume_text")
+    if not isinstance(jd_text, str) or not jd_text.strip():
+        raise ValueError("jd_text is required")
+    if not isinstance(resume_text, str) or not resume_text.strip():
+        raise ValueError("resume_text is required")
+    return jd_text, resume_text
+
+
+# ============================================================
+# 3. HTTP
+# ============================================================
+
+class ScreeningHandler(BaseHTTPRequestHandler):
+    service: ScreeningService  # set by make_server()
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send(200, self.service.health())
+        elif self.path == "/metrics":
+            self._send_raw(200, metrics.render().encode("utf-8"), metrics.CONTENT_TYPE)
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        routes = {"/ats": self.service.ats, "/analyze": self.service.analyze}
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("body must be a JSON object")
+        except ValueError as e:
+            self._send(400, {"error": f"invalid JSON body: {e}"})
+            return
+
+        try:
+            self._send(200, handler(payload))
+        except Saturated:
+            self._send(429, {"error": "screener is at capacity, retry later"}, {"Retry-After": "5"})
+        except FutureTimeout:
+            # The analysis keeps running, and a retry is coalesced onto it.
+            self._send(504, {"error": f"analysis did not finish within {self.service.timeout:g}s"})
+        except ModelOutputError as e:
+            self._send(502, {"error": str(e), "raw_text": e.raw_text})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        # Keep stderr quiet; the CLI prints its own startup line.
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        self._send_raw(status, json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+    def _send_raw(self, status: int, data: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        HTTP_REQUESTS.inc(path=self.path if self.path in ROUTES else "other", status=status)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+ROUTES = ("/healthz", "/metrics", "/ats", "/analyze")
+
+
+def make_server(host: str, port: int, service: ScreeningService) -> ThreadingHTTPServer:
+    handler = type("BoundScreeningHandler", (ScreeningHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
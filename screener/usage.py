@@ -0,0 +1,218 @@
+"""
+usage.py
+
+Token and cost accounting for model calls:
+- TokenUsage: per-analysis accumulator filled by pipeline.call_model, from
+  the API's usage_metadata when present, else from a len/4 estimate
+- estimate_analysis_tokens(): worst-case tokens of an analysis before any
+  call is made (compacted prompt estimate + output caps)
+- TokenBudget: per-run and/or per-hour token budget that batch runs
+  reserve against before each analysis and settle afterwards
+- UsageReport: tokens and cost per candidate, rolled up per requisition
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from screener.config import INPUT_COST_PER_MTOK, OUTPUT_COST_PER_MTOK
+from screener.metrics import MODEL_TOKENS
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def cost_usd(prompt_tokens: int, output_tokens: int) -> float:
+    return (prompt_tokens * INPUT_COST_PER_MTOK + output_tokens * OUTPUT_COST_PER_MTOK) / 1_000_000
+
+
+# ============================================================
+# 1. Per-analysis usage
+# ============================================================
+
+class TokenUsage:
+    """
+    Thread-safe: fan-out section calls add to the same instance.
+    "estimated" is True if any call lacked API-reported counts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.estimated = False
+
+    def record(self, response: Any, prompt: str, raw_text: str) -> None:
+        meta = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(meta, "prompt_token_count", None)
+        output_tokens = getattr(meta, "candidates_token_count", None)
+        estimated = not prompt_tokens or output_tokens is None
+        if estimated:
+            prompt_tokens = estimate_tokens(prompt)
+            output_tokens = estimate_tokens(raw_text)
+
+        source = "estimated" if estimated else "reported"
+        MODEL_TOKENS.inc(prompt_tokens, kind="prompt", source=source)
+        MODEL_TOKENS.inc(output_tokens, kind="output", source=source)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+            self.estimated = self.estimated or estimated
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+                "estimated": self.estimated,
+                "cost_usd": round(cost_usd(self.prompt_tokens, self.output_tokens), 6),
+            }
+
+
+def estimate_analysis_tokens(
+    jd_text: str, resume_text: str, fanout: bool = False, focused: bool = False, depth: str = "full"
+) -> int:
+    """
+    Upper bound on the tokens one analysis can use: the estimated size of
+    every prompt it sends plus each call's max_output_tokens.
+    """
+    from screener.llm_prompts import build_prompt, build_section_prompt, depth_sections, output_token_cap
+
+    if not fanout:
+        return estimate_tokens(build_prompt(jd_text, resume_text, focused, depth)) + output_token_cap(depth)
+    return sum(
+        estimate_tokens(build_section_prompt(section, jd_text, resume_text, focused, depth))
+        + output_token_cap(depth, section)
+        for section in depth_sections(depth)
+    )
+
+
+# ============================================================
+# 2. Budget
+# ============================================================
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class TokenBudget:
+    """
+    reserve() takes a worst-case estimate before an analysis; settle()
+    replaces it with the tokens actually used. Over the per-run budget,
+    reserve() raises BudgetExhausted. Over the per-hour budget it waits
+    until enough usage has left the sliding one-hour window (raising only
+    if the estimate could never fit, or after max_wait_s).
+    """
+
+    WINDOW_S = 3600.0
+
+    def __init__(self, per_run: Optional[int] = None, per_hour: Optional[int] = None, max_wait_s: Optional[float] = None):
+        self.per_run = per_run
+        self.per_hour = per_hour
+        self.max_wait_s = max_wait_s
+        self.spent = 0
+        self.reserved = 0
+        self.skipped = 0
+        self._cond = threading.Condition()
+        self._window: Deque[Tuple[float, int]] = deque()
+
+    def _window_total(self, now: float) -> int:
+        while self._window and now - self._window[0][0] >= self.WINDOW_S:
+            self._window.popleft()
+        return sum(tokens for _, tokens in self._window)
+
+    def reserve(self, tokens: int) -> int:
+        deadline = None if self.max_wait_s is None else time.monotonic() + self.max_wait_s
+        with self._cond:
+            if self.per_run is not None and self.spent + self.reserved + tokens > self.per_run:
+                self.skipped += 1
+                raise BudgetExhausted(f"per-run budget of {self.per_run} tokens reached")
+            if self.per_hour is not None:
+                if tokens > self.per_hour:
+                    self.skipped += 1
+                    raise BudgetExhausted(f"estimate of {tokens} tokens exceeds the hourly budget")
+                while True:
+                    now = time.monotonic()
+                    if self._window_total(now) + self.reserved + tokens <= self.per_hour:
+                        break
+                    wait_s = self.WINDOW_S - (now - self._window[0][0]) if self._window else 1.0
+                    if deadline is not None:
+                        if now >= deadline:
+                            self.skipped += 1
+                            raise BudgetExhausted(f"hourly budget of {self.per_hour} tokens reached")
+                        wait_s = min(wait_s, deadline - now)
+                    self._cond.wait(max(wait_s, 0.05))
+            self.reserved += tokens
+            return tokens
+
+    def settle(self, reservation: int, used: int) -> None:
+        with self._cond:
+            self.reserved -= reservation
+            self.spent += used
+            if used:
+                self._window.append((time.monotonic(), used))
+            self._cond.notify_all()
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "per_run": self.per_run,
+                "per_hour": self.per_hour,
+                "spent_tokens": self.spent,
+                "skipped": self.skipped,
+            }
+
+
+# ============================================================
+# 3. Report
+# ============================================================
+
+class UsageReport:
+    """
+    Aggregates result["usage"] entries by requisition (the record's
+    "requisition" field, else a hash of its JD). Results served from a
+    checkpoint cost nothing in this run and are left out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requisitions: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        usage = result.get("usage")
+        if not usage or result.get("from_checkpoint"):
+            return
+        with self._lock:
+            row = self._requisitions.setdefault(
+                usage.get("requisition", ""),
+                {"candidates": 0, "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "estimated": False},
+            )
+            row["candidates"] += 1
+            row["prompt_tokens"] += usage["prompt_tokens"]
+            row["output_tokens"] += usage["output_tokens"]
+            row["cost_usd"] += usage["cost_usd"]
+            row["estimated"] = row["estimated"] or usage["estimated"]
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = {key: dict(row) for key, row in self._requisitions.items()}
+        totals = {"candidates": 0, "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+        for row in rows.values():
+            for field in totals:
+                totals[field] += row[field]
+            row["cost_usd"] = round(row["cost_usd"], 6)
+            row["cost_per_candidate_usd"] = round(row["cost_usd"] / row["candidates"], 6) if row["candidates"] else 0.0
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        totals["cost_per_candidate_usd"] = round(totals["cost_usd"] / totals["candidates"], 6) if totals["candidates"] else 0.0
+        return {"totals": totals, "requisitions": rows}
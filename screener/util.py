@@ -3,15 +3,21 @@ util.py
 
 Utility functions for:
 - file extraction
+- content hashing
 - JSON extraction
 - score clamping
 - sanitization (analysis, questions, gap analysis, rewrite suggestions)
 """
 
+import hashlib
+import io
 import json
-from typing import Any, Dict, List
-from pypdf import PdfReader
-from docx import Document
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+# pypdf and python-docx are imported inside extract_text_from_uploaded_file
+# so that ATS scoring and sanitization stay cheap to import.
 
 
 # =========================
@@ -44,6 +50,8 @@ def extract_text_from_uploaded_file(uploaded_file) -> str:
 
     # PDF files
     if uploaded_file.type == "application/pdf":
+        from pypdf import PdfReader
+
         try:
             reader = PdfReader(uploaded_file)
             text = []
@@ -58,6 +66,8 @@ def extract_text_from_uploaded_file(uploaded_file) -> str:
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         "application/msword",
     ]:
+        from docx import Document
+
         try:
             doc = Document(uploaded_file)
             paragraphs = [p.text for p in doc.paragraphs]
@@ -68,6 +78,67 @@ def extract_text_from_uploaded_file(uploaded_file) -> str:
     return ""
 
 
+def _parallel_pdf_text(source: Any) -> Optional[str]:
+    # Large PDFs go to the page pool when this process has one (see
+    # workers.set_page_pool). Only that module sets one, so when it is not
+    # loaded there is nothing to check and nothing is imported.
+    workers = sys.modules.get("screener.workers")
+    pool = workers.page_pool() if workers is not None else None
+    if pool is None:
+        return None
+    return workers.extract_pdf_parallel(source, *pool)
+
+
+def extract_text_from_bytes(data: bytes, mime_type: str) -> str:
+    """
+    Same as extract_text_from_uploaded_file, for raw bytes plus a MIME type.
+    """
+    if mime_type == "application/pdf":
+        text = _parallel_pdf_text(data)
+        if text is not None:
+            return text
+    return _extract_in_process(data, mime_type)
+
+
+def _extract_in_process(data: bytes, mime_type: str) -> str:
+    buffer = io.BytesIO(data)
+    buffer.type = mime_type
+    return extract_text_from_uploaded_file(buffer)
+
+
+MIME_TYPES = {
+    ".txt": "text/plain",
+    ".md": "text/plain",
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def extract_text_from_path(path: str) -> str:
+    """
+    Same as extract_text_from_uploaded_file, for a file on disk. The type
+    comes from the extension; unknown extensions are read as plain text.
+    Large PDFs are split across the page pool when one is set.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        text = _parallel_pdf_text(path)
+        if text is not None:
+            return text
+    # No page pool (or not a PDF): read it here, without asking again.
+    with open(path, "rb") as f:
+        return _extract_in_process(f.read(), MIME_TYPES.get(ext, "text/plain"))
+
+
+def content_hash(data: Any) -> str:
+    """
+    Stable SHA-256 hex digest of text or bytes, used as a cache/idempotency key.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="ignore")
+    return hashlib.sha256(data).hexdigest()
+
+
 # =========================
 # 2. JSON Extraction
 # =========================
@@ -206,21 +277,28 @@ def sanitize_rewrite_suggestions(raw_suggestions: Any, min_confidence: float = 0
 import re
 from collections import Counter
 
-def compute_ats_keyword_analysis(jd_text: str, resume_text: str) -> dict:
+def compute_ats_keyword_analysis(jd_text: str, resume_text: str, fuzzy: bool = False) -> dict:
     """
     Simple ATS-style keyword extractor:
     - Extracts keywords from JD (nouns + verbs)
     - Counts occurrences in resume
     - Computes match score
+
+    With fuzzy=True, keywords the resume only has as a variant (stem,
+    abbreviation or typo, see variants.py) also count as present, and
+    "variant_matches" maps each of them to the resume's spelling.
     """
 
     if not jd_text or not resume_text:
-        return {
+        empty = {
             "jd_keywords": [],
             "resume_keywords": [],
             "missing_keywords": [],
             "match_score": 0,
         }
+        if fuzzy:
+            empty["variant_matches"] = {}
+        return empty
 
     # Normalize
     jd = jd_text.lower()
@@ -241,11 +319,18 @@ def compute_ats_keyword_analysis(jd_text: str, resume_text: str) -> dict:
     if len(jd_keywords) < 10:
         jd_keywords = list(jd_counts.keys())[:15]
 
+    # Variant hits for keywords the resume lacks verbatim
+    variants = {}
+    if fuzzy:
+        from screener.variants import variant_matches
+
+        variants = variant_matches([kw for kw in jd_keywords if kw not in resume_counts], resume, counts=resume_counts)
+
     # Resume keyword hits
-    resume_keywords = [kw for kw in jd_keywords if kw in resume_counts]
+    resume_keywords = [kw for kw in jd_keywords if kw in resume_counts or kw in variants]
 
     # Missing keywords
-    missing_keywords = [kw for kw in jd_keywords if kw not in resume_counts]
+    missing_keywords = [kw for kw in jd_keywords if kw not in resume_counts and kw not in variants]
 
     # Match score
     if jd_keywords:
@@ -253,9 +338,12 @@ def compute_ats_keyword_analysis(jd_text: str, resume_text: str) -> dict:
     else:
         match_score = 0
 
-    return {
+    analysis = {
         "jd_keywords": jd_keywords,
         "resume_keywords": resume_keywords,
         "missing_keywords": missing_keywords,
         "match_score": match_score,
     }
+    if fuzzy:
+        analysis["variant_matches"] = variants
+    return analysis
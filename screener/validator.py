@@ -0,0 +1,309 @@
+"""
+validator.py
+
+Single-pass validation of a model output: the guardrails rules
+(guardrails.py) and the sanitization rules (util.sanitize_*), compiled
+once from the output schema (llm_prompts.empty_output and
+config.ANALYSIS_FIELDS) into one handler per field.
+
+    validate_output(jd_text, resume_text, raw_output)
+
+returns exactly what
+
+    sanitize(apply_guardrails(jd_text, resume_text, raw_output))
+
+returned (pipeline's previous finalize_output), including key order, but
+walks every field once, checks confidence and coercions once, matches
+keyword lists with precompiled patterns and tokenizes resume lines at most
+once per call instead of once per rewrite suggestion. Originals are looked
+up experience section first (segments.py), so a matching original usually
+stops long before the rest of the resume is tokenized. raw_output is not
+modified, so callers no longer need to deep-copy it first.
+
+The rules themselves live in guardrails.py (constants and the reference
+implementation) and GUARDRAILS_VERSION covers both.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from screener.config import ANALYSIS_FIELDS, SCORE_MAX, SCORE_MIN
+from screener.guardrails import (
+    ENHANCEMENT_KEEP_WORDS,
+    EVIDENCE_GAP_KEYS,
+    FORBIDDEN_REASONING,
+    GAP_ITEM_KEEP_WORDS,
+    GAP_SENTENCE_KEEP_WORDS,
+    MAX_FOREIGN_WORDS,
+    MIN_REWRITE_CONFIDENCE,
+    REWRITE_ACTION_VERBS,
+    REWRITE_ALLOWED_EXTRA_WORDS,
+    REWRITE_MATCH_THRESHOLD,
+    REWRITE_STOP_WORDS,
+    RISK_FLAG_KEEP_WORDS,
+)
+from screener.llm_prompts import empty_output
+from screener.segments import segment_resume, word_tokens
+from screener.util import clamp_score
+
+_STRIP = ".,;:()"
+
+
+def _contains_any(words) -> Callable[[str], bool]:
+    """
+    Same as any(w in text for w in words), as one regex scan.
+    """
+    if not words:
+        return lambda text: False
+    search = re.compile("|".join(re.escape(w) for w in words)).search
+    return lambda text: search(text) is not None
+
+
+_forbidden = _contains_any(FORBIDDEN_REASONING)
+_risk_keep = _contains_any(RISK_FLAG_KEEP_WORDS)
+_gap_item_keep = _contains_any(GAP_ITEM_KEEP_WORDS)
+_common_words = frozenset(REWRITE_ALLOWED_EXTRA_WORDS) | frozenset(REWRITE_STOP_WORDS) | frozenset(REWRITE_ACTION_VERBS)
+
+
+class _Context:
+    """
+    Per-call evidence: lowercased texts, and resume line tokens built as
+    the rewrite check reaches them (only outputs with rewrite suggestions
+    need any).
+    """
+
+    __slots__ = ("jd_lower", "resume_lower", "resume_text", "_lines", "_line_tokens")
+
+    def __init__(self, jd_text: str, resume_text: str):
+        self.jd_lower = jd_text.lower()
+        self.resume_lower = resume_text.lower()
+        self.resume_text = resume_text
+        self._lines: Optional[Tuple[str, ...]] = None
+        self._line_tokens: List[set] = []
+
+    def matches_resume(self, original: str) -> bool:
+        """
+        guardrails.original_matches_resume at REWRITE_MATCH_THRESHOLD. The
+        answer does not depend on the order lines are tried in.
+        """
+        tokens = word_tokens(original)
+        if not tokens:
+            return False
+        size = len(tokens)
+        line_tokens = self._line_tokens
+        for line in line_tokens:
+            if len(tokens.intersection(line)) / size >= REWRITE_MATCH_THRESHOLD:
+                return True
+        if self._lines is None:
+            self._lines = segment_resume(self.resume_text).search_lines
+        lines = self._lines
+        while len(line_tokens) < len(lines):
+            line = word_tokens(lines[len(line_tokens)])
+            line_tokens.append(line)
+            if len(tokens.intersection(line)) / size >= REWRITE_MATCH_THRESHOLD:
+                return True
+        return False
+
+    def foreign_words(self, suggestion: str) -> int:
+        count = 0
+        for word in suggestion.split():
+            w = word.strip(_STRIP).lower()
+            if not w or w in _common_words or w in self.resume_lower or w in self.jd_lower:
+                continue
+            count += 1
+        return count
+
+
+# ============================================================
+# 1. Field handlers
+# ============================================================
+#
+# Each handler takes (raw value, context) and returns the final value.
+# Where the guardrails iterate a value without a type check (risk flags,
+# gap items), so do these, so malformed outputs behave the same way.
+
+def _score(value: Any, ctx: _Context) -> int:
+    # A string containing a forbidden word is blanked by the reasoning
+    # policy, but could never parse as an int anyway.
+    return clamp_score(value, SCORE_MIN, SCORE_MAX)
+
+
+def _risk_flags(value: Any, ctx: _Context) -> List[str]:
+    flags = []
+    for flag in value:
+        text = str(flag)
+        lower = text.lower()
+        if (lower in ctx.jd_lower or lower in ctx.resume_lower or _risk_keep(lower)) and not _forbidden(lower):
+            flags.append(text)
+    return flags
+
+
+def _policy_text(value: Any) -> str:
+    if isinstance(value, str):
+        return "" if _forbidden(value.lower()) else value
+    if isinstance(value, list):
+        value = [item for item in value if not _forbidden(str(item).lower())]
+    return "" if value is None else str(value)
+
+
+def _sentence_filter(evidence: str, keep_words) -> Callable[[Any, _Context], str]:
+    keep = _contains_any(keep_words)
+
+    def handle(value: Any, ctx: _Context) -> str:
+        if isinstance(value, str) and value:
+            against = getattr(ctx, evidence)
+            cleaned = []
+            for sentence in value.split("."):
+                s = sentence.strip().lower()
+                if not s:
+                    continue
+                if any(word in against for word in s.split()) or keep(s):
+                    cleaned.append(sentence)
+            value = ". ".join(cleaned)
+        return _policy_text(value)
+
+    return handle
+
+
+def _text(value: Any, ctx: _Context) -> str:
+    return _policy_text(value)
+
+
+# Analysis text fields with an evidence rule before the reasoning policy.
+_ANALYSIS_TEXT_RULES = {
+    "importance_of_gaps": _sentence_filter("jd_lower", GAP_SENTENCE_KEEP_WORDS),
+    "resume_enhancement": _sentence_filter("resume_lower", ENHANCEMENT_KEEP_WORDS),
+}
+
+
+def _gap_items(value: Any, ctx: _Context) -> List[str]:
+    validated = []
+    for item in value:
+        text = str(item).strip()
+        if not text:
+            continue
+        lower = text.lower()
+        if lower in ctx.jd_lower or _gap_item_keep(lower):
+            validated.append(text)
+    return validated
+
+
+def _plain_strings(value: Any, ctx: _Context) -> List[str]:
+    return [str(x) for x in value] if isinstance(value, list) else []
+
+
+def _rewrite_suggestions(value: Any, ctx: _Context) -> List[Dict[str, Any]]:
+    if not isinstance(value, list):
+        return []
+    validated = []
+    for item in value:
+        if not isinstance(item, dict):
+            continue
+        original = str(item.get("original", "")).strip()
+        suggestion = str(item.get("suggestion", "")).strip()
+        try:
+            confidence = float(item.get("confidence", 0.0))
+        except Exception:
+            confidence = 0.0
+        if not original or not suggestion or confidence < MIN_REWRITE_CONFIDENCE:
+            continue
+        if not ctx.matches_resume(original):
+            continue
+        if ctx.foreign_words(suggestion) > MAX_FOREIGN_WORDS:
+            continue
+        validated.append({"original": original, "suggestion": suggestion, "confidence": confidence})
+    return validated
+
+
+# ============================================================
+# 2. Compilation
+# ============================================================
+
+Handler = Callable[[Any, _Context], Any]
+
+
+def _compile_analysis(fields: Dict[str, type]) -> Handler:
+    # (field, default when absent, handler); fields of other types are
+    # dropped, as sanitize_analysis does.
+    steps: List[Tuple[str, Any, Handler]] = []
+    for field, expected in fields.items():
+        if field.endswith("_score"):
+            steps.append((field, None, _score))
+        elif field == "risk_flags":
+            steps.append((field, [], _risk_flags))
+        elif expected is str:
+            steps.append((field, None, _ANALYSIS_TEXT_RULES.get(field, _text)))
+
+    def handle(analysis: Any, ctx: _Context) -> Dict[str, Any]:
+        get = analysis.get
+        return {field: fn(get(field, default), ctx) for field, default, fn in steps}
+
+    return handle
+
+
+def _compile_gap_analysis(keys) -> Handler:
+    steps = [(key, _gap_items if key in EVIDENCE_GAP_KEYS else _plain_strings) for key in keys]
+
+    def handle(gap: Any, ctx: _Context) -> Dict[str, List[str]]:
+        if not isinstance(gap, dict):
+            return {key: [] for key, _ in steps}
+        get = gap.get
+        return {key: fn(get(key, []), ctx) for key, fn in steps}
+
+    return handle
+
+
+def _compile_dict(default: Dict[str, Any]) -> Handler:
+    # Passed through when it is a dict (e.g. ats_keyword_analysis).
+    def handle(value: Any, ctx: _Context) -> Dict[str, Any]:
+        if isinstance(value, dict):
+            return value
+        return {key: list(v) if isinstance(v, list) else v for key, v in default.items()}
+
+    return handle
+
+
+def _gap_text(value: Any, ctx: _Context) -> str:
+    return str(value or "")
+
+
+def compile_validator(
+    schema: Optional[Dict[str, Any]] = None,
+    analysis_fields: Optional[Dict[str, type]] = None,
+) -> Callable[[str, str, Dict[str, Any]], Dict[str, Any]]:
+    """
+    Builds validate(jd_text, resume_text, raw_output) for an output schema
+    (default: llm_prompts.empty_output()). Top-level keys are handled in
+    schema order; unknown keys in raw_output are dropped.
+    """
+    schema = schema if schema is not None else empty_output()
+    analysis_fields = analysis_fields if analysis_fields is not None else ANALYSIS_FIELDS
+
+    steps: List[Tuple[str, Any, Handler]] = []
+    for key, default in schema.items():
+        if key == "analysis":
+            handler = _compile_analysis(analysis_fields)
+            # The guardrails read analysis with .get() before any type check.
+            steps.append((key, {}, handler))
+        elif key == "gap_analysis":
+            steps.append((key, {}, _compile_gap_analysis(default)))
+        elif key == "resume_rewrite_suggestions":
+            steps.append((key, [], _rewrite_suggestions))
+        elif isinstance(default, dict):
+            steps.append((key, None, _compile_dict(default)))
+        elif isinstance(default, list):
+            steps.append((key, [], _plain_strings))
+        elif isinstance(default, str):
+            steps.append((key, "", _gap_text))
+        else:
+            raise ValueError(f"no validation rule for schema key {key!r}")
+
+    def validate(jd_text: str, resume_text: str, raw_output: Dict[str, Any]) -> Dict[str, Any]:
+        ctx = _Context(jd_text, resume_text)
+        get = raw_output.get
+        return {key: fn(get(key, default), ctx) for key, default, fn in steps}
+
+    return validate
+
+
+validate_output = compile_validator()
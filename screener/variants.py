@@ -0,0 +1,406 @@
+"""
+variants.py
+
+Keyword variant index for fuzzy ATS matching
+(util.compute_ats_keyword_analysis(..., fuzzy=True)). Exact token equality
+misses "managed"/"management", "k8s"/"kubernetes" and
+"postgres"/"postgresql"; this index maps every token to a match key:
+
+- aliases: abbreviations and spellings of ats_dictionary terms (ALIASES,
+  plus run-together multi-word tools such as "nodejs" and "powerbi")
+- stems: a light suffix stemmer (managed, manages, management -> "manag")
+- typos: tokens one insertion, deletion or swap away from a known word of
+  six or more letters, found through a character-trigram index
+
+Keys for the whole vocabulary, every alias and (with a corpus) common
+misspellings are precomputed into one dict, so a lookup at match time is
+a dict hit; tokens outside it are resolved once and memoized. Keywords
+the index does not know are typo targets at match time as well. The default
+index is built on first use from ats_dictionary. A corpus adds its
+frequent words to the vocabulary and its misspellings to the table:
+
+    python -m screener variants build records.jsonl -o variants.json
+    SCREENER_VARIANTS=variants.json python -m screener screen ... --fuzzy-ats
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from screener.ats_dictionary import ACTION_VERBS, CERTIFICATIONS, SENIORITY, SKILLS, TOOLS
+from screener.util import content_hash
+
+VARIANTS_ENV = "SCREENER_VARIANTS"
+FORMAT_VERSION = 1
+
+# Abbreviations and alternative spellings -> the word an ATS keyword would
+# use. Multi-word dictionary terms written as one word are added by
+# dictionary_aliases().
+ALIASES = {
+    "k8s": "kubernetes",
+    "kube": "kubernetes",
+    "postgres": "postgresql",
+    "postgre": "postgresql",
+    "psql": "postgresql",
+    "pgsql": "postgresql",
+    "mongo": "mongodb",
+    "elastic": "elasticsearch",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "sklearn": "scikit",
+    "mgmt": "management",
+    "mgr": "manager",
+    "dev": "development",
+    "eng": "engineering",
+    "ops": "operations",
+    "admin": "administration",
+    "infra": "infrastructure",
+    "config": "configuration",
+    "db": "database",
+    "dbs": "databases",
+    "sr": "senior",
+    "jr": "junior",
+}
+
+# Typos are only looked for in words this long, and only towards
+# vocabulary words this long: shorter words are too often real words one
+# edit apart.
+MIN_TYPO_CHARS = 6
+MEMO_LIMIT = 100_000
+
+# Resume tokens for fuzzy matching keep digits, so "k8s" survives.
+TOKEN = re.compile(r"[a-z0-9+#]{2,}")
+_WORD = re.compile(r"[a-z]{3,}")
+
+# (suffix, replacement), longest first. "es" only after s/x/z/ch/sh and "s"
+# never after "s", so "processes" and "process" meet at "process".
+_SUFFIXES = (
+    ("ations", "ate"), ("ation", "ate"), ("ments", ""), ("ment", ""), ("ings", ""), ("ing", ""),
+    ("ers", ""), ("er", ""), ("ies", "y"), ("ied", "y"), ("ed", ""),
+)
+MIN_STEM_CHARS = 3
+
+
+def _strip_suffix(word: str) -> str:
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_CHARS:
+            return word[: -len(suffix)] + replacement
+    if word.endswith("es") and word[-3:-2] in ("s", "x", "z", "h") and len(word) - 2 >= MIN_STEM_CHARS:
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss") and len(word) - 1 >= MIN_STEM_CHARS:
+        return word[:-1]
+    return word
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix stemmer, two rounds ("engineering" -> "engineer" ->
+    "engin"), then a final silent "e" ("manage" -> "manag").
+    """
+    word = _strip_suffix(_strip_suffix(word))
+    if word.endswith("e") and len(word) > MIN_STEM_CHARS + 1:
+        word = word[:-1]
+    return word
+
+
+def _trigrams(word: str) -> List[str]:
+    padded = f"${word}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def one_edit(a: str, b: str) -> bool:
+    """
+    True if b is a with one character inserted or deleted, or two adjacent
+    characters swapped. Substitutions do not count: they mostly join real
+    words ("spring"/"sprint").
+    """
+    if a == b:
+        return False
+    if len(a) == len(b):
+        diff = [i for i in range(len(a)) if a[i] != b[i]]
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if abs(len(a) - len(b)) != 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+def dictionary_words() -> List[str]:
+    """
+    Every word of three or more letters in the ATS dictionary terms.
+    """
+    words = set()
+    for term in SKILLS + TOOLS + CERTIFICATIONS + SENIORITY + ACTION_VERBS:
+        words.update(_WORD.findall(term))
+    return sorted(words)
+
+
+def dictionary_aliases() -> Dict[str, str]:
+    """
+    ALIASES plus multi-word dictionary terms run together ("node js" ->
+    "nodejs" -> "node"), which the ATS tokenizer cannot split.
+    """
+    aliases = {}
+    for term in SKILLS + TOOLS + CERTIFICATIONS:
+        parts = term.split()
+        if len(parts) > 1 and all(part.isalpha() for part in parts) and len(parts[0]) >= 3:
+            aliases["".join(parts)] = parts[0]
+    aliases.update(ALIASES)
+    return aliases
+
+
+# ============================================================
+# 1. Index
+# ============================================================
+
+class VariantIndex:
+    """
+    table: token -> match key, precomputed. vocabulary: the known words;
+    those of MIN_TYPO_CHARS or more are typo targets, through a trigram
+    index built on construction. Every token resolved so far is also kept
+    by key (variants()), so matching looks keywords up rather than
+    scanning the resume's tokens. Safe to use from any thread.
+    """
+
+    def __init__(self, table: Dict[str, str], vocabulary: Iterable[str]):
+        self.table = table
+        self.vocabulary = sorted(set(vocabulary))
+        self._trigrams: Dict[str, List[str]] = {}
+        for word in self.vocabulary:
+            if len(word) >= MIN_TYPO_CHARS:
+                for gram in set(_trigrams(word)):
+                    self._trigrams.setdefault(gram, []).append(word)
+        # Table tokens the ATS tokenizer ([a-z]{3,}) never yields, by key;
+        # variant_matches scans for them only when their key is wanted.
+        self.short_aliases: Dict[str, List[str]] = {}
+        for token, key in table.items():
+            if not _WORD.fullmatch(token):
+                self.short_aliases.setdefault(key, []).append(token)
+        self._memo: Dict[str, str] = {}
+        self._variants = self._table_variants()
+        self._lock = threading.Lock()
+
+    def _table_variants(self) -> Dict[str, Tuple[str, ...]]:
+        by_key: Dict[str, List[str]] = {}
+        for token, key in self.table.items():
+            by_key.setdefault(key, []).append(token)
+        return {key: tuple(tokens) for key, tokens in by_key.items()}
+
+    def key(self, token: str) -> str:
+        key = self.table.get(token)
+        if key is not None:
+            return key
+        key = self._memo.get(token)
+        if key is None:
+            key = self.resolve(token)
+            with self._lock:
+                if len(self._memo) >= MEMO_LIMIT:
+                    self._memo.clear()
+                    self._variants = self._table_variants()
+                if token not in self._memo:
+                    self._memo[token] = key
+                    # Replaced, not appended to, so readers never see a
+                    # tuple change under them.
+                    self._variants[key] = self._variants.get(key, ()) + (token,)
+        return key
+
+    def variants(self, key: str) -> Tuple[str, ...]:
+        """
+        Every token with this match key: table entries, and tokens
+        resolved since the memo was last cleared.
+        """
+        return self._variants.get(key, ())
+
+    def resolve(self, token: str) -> str:
+        """
+        Key of a token outside the table: a known typo target's key, else
+        its stem.
+        """
+        target = self.closest(token)
+        if target is not None:
+            return self.table.get(target) or stem(target)
+        return stem(token)
+
+    def closest(self, word: str) -> Optional[str]:
+        """
+        The vocabulary word one edit away from `word` that shares the most
+        trigrams with it (ties alphabetical), or None.
+        """
+        if len(word) < MIN_TYPO_CHARS - 1 or word in self.table:
+            return None
+        grams = _trigrams(word)
+        shared: Counter = Counter()
+        for gram in set(grams):
+            shared.update(self._trigrams.get(gram, ()))
+        # One edit changes at most four trigrams (a swap).
+        need = max(1, len(grams) - 4)
+        for candidate, count in sorted(shared.items(), key=lambda item: (-item[1], item[0])):
+            if count < need:
+                break
+            if candidate[0] == word[0] and one_edit(word, candidate):
+                return candidate
+        return None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"format": FORMAT_VERSION, "table": self.table, "vocabulary": self.vocabulary}
+
+
+def build_index(
+    counts: Optional[Counter] = None,
+    min_count: int = 3,
+    typo_ratio: int = 10,
+) -> VariantIndex:
+    """
+    Index over the ATS dictionary words, plus, from corpus token counts,
+    every word seen at least min_count times. Rarer corpus tokens one edit
+    away from a word typo_ratio times as frequent (dictionary words always
+    qualify) are stored as misspellings of it.
+    """
+    dictionary = dictionary_words()
+    vocabulary = set(dictionary)
+    if counts:
+        vocabulary.update(w for w, c in counts.items() if c >= min_count and _WORD.fullmatch(w))
+    table = {word: stem(word) for word in vocabulary}
+    for alias, target in dictionary_aliases().items():
+        table[alias] = table.get(target) or stem(target)
+    index = VariantIndex(table, vocabulary)
+
+    if counts:
+        frequent = set(dictionary)
+        for word, count in counts.items():
+            if word in table or len(word) < MIN_TYPO_CHARS - 1:
+                continue
+            target = index.closest(word)
+            if target is not None and (target in frequent or counts.get(target, 0) >= typo_ratio * count):
+                table[word] = table[target]
+    return index
+
+
+def corpus_counts(texts: Iterable[str]) -> Counter:
+    counts: Counter = Counter()
+    for text in texts:
+        counts.update(TOKEN.findall(text.lower()))
+    return counts
+
+
+def save_index(index: VariantIndex, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index.as_dict(), f, sort_keys=True)
+
+
+def load_index(path: str) -> VariantIndex:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported variant index format {data.get('format')!r}")
+    return VariantIndex(data["table"], data["vocabulary"])
+
+
+_default: Optional[VariantIndex] = None
+_default_lock = threading.Lock()
+
+
+def default_index() -> VariantIndex:
+    """
+    The process-wide index: loaded from $SCREENER_VARIANTS when set, else
+    built from ats_dictionary. Built once, on first use.
+    """
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                path = os.getenv(VARIANTS_ENV)
+                _default = load_index(path) if path else build_index()
+    return _default
+
+
+def default_index_source() -> str:
+    """
+    Identifies the index default_index() uses, for checkpoint keys: the
+    content hash of $SCREENER_VARIANTS, or "dictionary" when it is unset.
+    """
+    path = os.getenv(VARIANTS_ENV)
+    if not path:
+        return "dictionary"
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+
+# ============================================================
+# 2. Matching
+# ============================================================
+
+def variant_matches(
+    keywords: Iterable[str],
+    resume_text: str,
+    index: Optional[VariantIndex] = None,
+    counts: Optional[Mapping[str, int]] = None,
+) -> Dict[str, str]:
+    """
+    {keyword: resume token} for each keyword with a resume token of the same
+    match key or, for keywords of MIN_TYPO_CHARS or more, a token one edit
+    away from it. The most frequent such token wins (ties alphabetical).
+
+    counts: the resume's lowercased ATS token counts, when the caller
+    already has them; only aliases the ATS tokenizer cannot produce
+    ("k8s", "js") are then scanned for in resume_text. Resume tokens are
+    resolved once per index, so the cost after that is per keyword.
+    """
+    index = index or default_index()
+    key = index.key
+    keywords = list(keywords)
+    wanted: Dict[str, List[str]] = {}
+    for keyword in keywords:
+        wanted.setdefault(key(keyword), []).append(keyword)
+    if not wanted:
+        return {}
+
+    if counts is None:
+        counts = Counter(TOKEN.findall(resume_text.lower()))
+    else:
+        short = [alias for k in wanted for alias in index.short_aliases.get(k, ())]
+        if short:
+            pattern = r"(?<![a-z0-9+#])(?:%s)(?![a-z0-9+#])" % "|".join(map(re.escape, short))
+            found = Counter(re.findall(pattern, resume_text.lower()))
+            if found:
+                counts = {**counts, **found}
+
+    # Tokens outside the table; the ones not resolved before are resolved
+    # now, so variants() below knows them.
+    outside = set(counts).difference(index.table)
+    for token in outside.difference(index._memo):
+        key(token)
+
+    hits: Dict[str, List[str]] = {}
+    for k, group in wanted.items():
+        tokens = [token for token in index.variants(k) if token in counts]
+        if tokens:
+            for keyword in group:
+                hits[keyword] = tokens
+
+    # Typos of the keywords themselves, by (first letter, length): a token
+    # one edit away is within one character of the keyword's length.
+    typo_targets: Dict[tuple, List[str]] = {}
+    for keyword in keywords:
+        if len(keyword) >= MIN_TYPO_CHARS and keyword not in hits:
+            for length in (len(keyword) - 1, len(keyword), len(keyword) + 1):
+                typo_targets.setdefault((keyword[0], length), []).append(keyword)
+    if typo_targets:
+        for token in [t for t in outside if (t[0], len(t)) in typo_targets]:
+            for keyword in typo_targets[token[0], len(token)]:
+                if one_edit(token, keyword):
+                    hits.setdefault(keyword, []).append(token)
+
+    return {
+        keyword: min(hits[keyword], key=lambda token: (-counts[token], token))
+        for keyword in keywords
+        if keyword in hits
+    }
@@ -0,0 +1,277 @@
+"""
+workers.py
+
+Pre-warmed process pools for batch extraction and scoring.
+
+A "spawn" worker is a fresh interpreter. Its first task pays for
+importing pypdf, python-docx and numpy (MinHash signatures; about a third
+of a second together) and the screening modules, which build their
+read-only tables on import (the cascade's dictionary terms, MinHash
+permutations, prompt schemas), plus the fuzzy variant index on first use;
+and every worker holds its own copy of all of it.
+
+warm_pool() starts workers from a "forkserver" that has done that work
+once: the server process imports screener.preload, which runs preload(),
+and each worker is a fork of it that shares those pages copy-on-write and
+starts on its first task straight away. The forkserver is a separate
+single-threaded process, so like spawn this is safe to use from a
+multi-threaded host such as the Streamlit server. Where forkserver is not
+available (Windows) the pool falls back to spawn, with preload() as the
+worker initializer.
+
+The forkserver is started once per host process, by the first pool that
+needs it, and serves every warm pool after that.
+
+A pool can also be set as this process's page pool (set_page_pool), which
+splits the pages of large PDFs across it (section 2).
+
+Compare worker startup and memory against cold spawn, and page-parallel
+against serial PDF extraction, with:
+    python -m benchmarks.workers
+    python -m benchmarks.pdf_pages
+"""
+
+import atexit
+import importlib
+import io
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+
+# ============================================================
+# 1. Warm pools
+# ============================================================
+
+# Imported by preload(); any that are not installed are skipped.
+PRELOAD_IMPORTS = ("pypdf", "docx", "numpy", "google.generativeai", "screener.batch", "screener.pipeline")
+PRELOAD_MODULE = "screener.preload"
+
+_preloaded: Optional[Dict[str, float]] = None
+_preload_lock = threading.Lock()
+
+
+def preload() -> Dict[str, float]:
+    """
+    Imports PRELOAD_IMPORTS and builds the default variant index. Runs once
+    per process; returns the milliseconds each step took (imports that
+    were already loaded cost ~0).
+    """
+    global _preloaded
+    with _preload_lock:
+        if _preloaded is not None:
+            return _preloaded
+        timings: Dict[str, float] = {}
+        for name in PRELOAD_IMPORTS:
+            start = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                continue
+            timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+        from screener.variants import default_index
+
+        start = time.perf_counter()
+        default_index()
+        timings["variant_index"] = round((time.perf_counter() - start) * 1000, 1)
+        _preloaded = timings
+        return timings
+
+
+def pool_context() -> Tuple[multiprocessing.context.BaseContext, Optional[Callable[[], object]]]:
+    """
+    (mp context, worker initializer) for a warm pool: forkserver preloading
+    PRELOAD_MODULE and no initializer, else spawn with preload().
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # Only read when the forkserver starts; later calls change nothing.
+        context.set_forkserver_preload([PRELOAD_MODULE])
+        return context, None
+    return multiprocessing.get_context("spawn"), preload
+
+
+def warm_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool whose workers start with everything preload() loads.
+    """
+    context, initializer = pool_context()
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        mp_context=context,
+        initializer=initializer,
+    )
+
+
+_shared: Optional[ProcessPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def _unusable(pool: ProcessPoolExecutor) -> bool:
+    # Broken (a worker died) or shut down; ProcessPoolExecutor has no
+    # public accessor for either.
+    return bool(getattr(pool, "_broken", False) or getattr(pool, "_shutdown_thread", False))
+
+
+def shared_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    The process-wide warm pool, started on first use, for hosts such as
+    the app that want one pool for every session. A pool that broke or was
+    shut down is replaced, and the old one is shut down first.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is not None and _unusable(_shared):
+            _shared.shutdown(wait=False, cancel_futures=True)
+            _shared = None
+        if _shared is None:
+            _shared = warm_pool(max_workers)
+        return _shared
+
+
+@atexit.register
+def close_shared_pool() -> None:
+    """
+    Shuts down the shared pool, if one was started. Runs at exit.
+    """
+    global _shared
+    with _shared_lock:
+        pool, _shared = _shared, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ============================================================
+# 2. Page-parallel PDF extraction
+# ============================================================
+#
+# Extraction otherwise walks reader.pages serially in one process, which
+# dominates for portfolios, publication lists and long scanned CVs. With a
+# page pool set, a PDF of at least PARALLEL_PDF_MIN_PAGES pages has its
+# page range split into contiguous chunks, one pool task each. Every task
+# maps the file read-only and parses it itself, and the chunks are joined
+# in page order, so the text is the same as serial extraction. PDFs given
+# as bytes are written to a temporary file first, so tasks receive a path
+# rather than a copy of the document.
+#
+# Only the process that set the page pool splits documents; its workers
+# extract serially, so rank_resumes tasks never nest.
+
+PARALLEL_PDF_MIN_PAGES = 16
+CHUNKS_PER_WORKER = 2
+
+PagePool = Union[Executor, Callable[[], Executor]]
+
+_page_pool: Optional[Tuple[PagePool, int]] = None
+
+
+def set_page_pool(executor: Optional[PagePool], workers: int = 1) -> None:
+    """
+    Splits large PDFs extracted by this process (util.extract_text_from_path
+    and extract_text_from_bytes) across `executor`, which has `workers`
+    processes. `executor` may also be a function returning the pool (such
+    as shared_pool), called only when a PDF is split, so no pool starts
+    until one is needed. None, or a single worker, turns it off.
+    """
+    global _page_pool
+    _page_pool = (executor, workers) if executor is not None and workers > 1 else None
+
+
+def page_pool() -> Optional[Tuple[PagePool, int]]:
+    return _page_pool
+
+
+@contextmanager
+def _mapped(path: str) -> Iterator[mmap.mmap]:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield buffer
+
+
+def extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """
+    Text of pages [start, stop) of the PDF at `path`. A pool task.
+    """
+    from pypdf import PdfReader
+
+    with _mapped(path) as buffer:
+        reader = PdfReader(buffer)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def page_ranges(pages: int, chunks: int) -> List[Tuple[int, int]]:
+    """
+    [start, stop) bounds of `chunks` contiguous, near-equal page ranges.
+    """
+    chunks = max(1, min(chunks, pages))
+    bounds = [pages * i // chunks for i in range(chunks + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _split_pages(path: str, pages: int, executor: PagePool, workers: int) -> str:
+    if not isinstance(executor, Executor):
+        executor = executor()
+    futures = [
+        executor.submit(extract_pdf_pages, path, start, stop)
+        for start, stop in page_ranges(pages, workers * CHUNKS_PER_WORKER)
+    ]
+    return "\n".join(text for future in futures for text in future.result())
+
+
+def _serial_text(source: Union[str, bytes], min_pages: int = 0) -> Tuple[Optional[str], int]:
+    # (text, pages) read in this process; text is None when the PDF has
+    # min_pages or more pages and is left for the pool.
+    from pypdf import PdfReader
+
+    def read(reader: "PdfReader") -> Tuple[Optional[str], int]:
+        pages = len(reader.pages)
+        if min_pages and pages >= min_pages:
+            return None, pages
+        return "\n".join(page.extract_text() or "" for page in reader.pages), pages
+
+    if isinstance(source, str):
+        with _mapped(source) as buffer:
+            return read(PdfReader(buffer))
+    return read(PdfReader(io.BytesIO(source)))
+
+
+def extract_pdf_parallel(
+    source: Union[str, bytes],
+    executor: PagePool,
+    workers: int,
+    min_pages: int = PARALLEL_PDF_MIN_PAGES,
+) -> str:
+    """
+    Text of a PDF (a path, or its bytes), exactly as
+    util.extract_text_from_uploaded_file returns it: pages joined by
+    newlines, "" if it cannot be read. PDFs under min_pages pages are read
+    in this process, and so is any PDF whose split fails because the pool
+    is broken or shut down.
+    """
+    try:
+        text, pages = _serial_text(source, min_pages)
+        if text is not None:
+            return text
+        if isinstance(source, str):
+            return _split_pages(source, pages, executor, workers)
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(source)
+        try:
+            return _split_pages(f.name, pages, executor, workers)
+        finally:
+            os.unlink(f.name)
+    except (BrokenExecutor, RuntimeError):
+        # A worker died (e.g. OOM-killed) or the pool was shut down; that
+        # says nothing about the document, so read it here.
+        try:
+            return _serial_text(source)[0] or ""
+        except Exception:
+            return ""
+    except Exception:
+        return ""
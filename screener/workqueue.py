@@ -0,0 +1,410 @@
+"""
+workqueue.py
+
+Durable job queue for spreading batch screening over several processes or
+hosts, stored in one local SQLite file.
+
+Records are enqueued once; any number of workers lease jobs from the same
+file, run them through extraction, ATS and the model, and write the result
+back. A lease expires if its worker stops renewing it (crash, kill, lost
+host), and the job is handed to another worker, up to max_attempts tries.
+Each worker also keeps throughput counters in the file.
+
+On a shared (network) filesystem, open the queue with wal=False: WAL needs
+shared memory between processes, which only works on one host. File locking
+on network filesystems must itself be reliable (NFSv4 or SMB with locking).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, IO, Iterable, List, Optional
+
+from screener.checkpoint import record_key
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+LEASE_EXPIRED = "lease expired"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    key           TEXT UNIQUE NOT NULL,
+    record_id     TEXT,
+    payload       TEXT NOT NULL,
+    status        TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    enqueued_at   REAL NOT NULL,
+    updated_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id   TEXT PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    done        INTEGER NOT NULL DEFAULT 0,
+    failed      INTEGER NOT NULL DEFAULT 0,
+    busy_ms     REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def _expired_result(payload: str) -> Dict[str, Any]:
+    return {"id": json.loads(payload).get("id"), "status": "error", "error": LEASE_EXPIRED}
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ============================================================
+# 1. Queue
+# ============================================================
+
+class JobQueue:
+    """
+    SQLite-backed job table. Leasing runs in an IMMEDIATE transaction, so two
+    workers never take the same job; completions are fenced on the lease
+    owner, so a worker whose lease expired cannot overwrite a newer attempt.
+    """
+
+    def __init__(self, path: str, wal: bool = True, busy_timeout_s: float = 30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=busy_timeout_s)
+        self._conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    # --- producers ---
+
+    def enqueue(self, records: Iterable[Dict[str, Any]], max_attempts: int = 3, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Adds records, skipping any whose idempotency key (see checkpoint.py)
+        is already queued. Returns {"added": n, "skipped": n}.
+        """
+        counts = {"added": 0, "skipped": 0}
+
+        def insert(rows: List[tuple]) -> None:
+            def run(conn: sqlite3.Connection) -> None:
+                for row in rows:
+                    cursor = conn.execute(
+                        """
+                        INSERT OR IGNORE INTO jobs
+                            (key, record_id, payload, status, max_attempts, enqueued_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        row,
+                    )
+                    counts["added" if cursor.rowcount else "skipped"] += 1
+
+            self._transaction(run)
+
+        batch: List[tuple] = []
+        for record in records:
+            now = time.time()
+            # Malformed lines fail the same way every time; one attempt is enough.
+            invalid = "_invalid" in record
+            key = f"invalid:{record.get('id')}" if invalid else record_key(record)
+            attempts = 1 if invalid else max_attempts
+            batch.append((key, str(record.get("id")), json.dumps(record, ensure_ascii=False), QUEUED, attempts, now, now))
+            if len(batch) >= batch_size:
+                insert(batch)
+                batch = []
+        if batch:
+            insert(batch)
+        return counts
+
+    # --- workers ---
+
+    def lease(self, worker_id: str, lease_s: float) -> Optional[Dict[str, Any]]:
+        """
+        Takes the oldest queued job, or one whose lease has expired, and
+        returns {"id", "attempt", "record"}; None when nothing is available.
+        Expired jobs that have used all their attempts are failed here, with
+        an error result so that export still lists them.
+        """
+
+        def run(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+            now = time.time()
+            expired = conn.execute(
+                "SELECT id, payload FROM jobs WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (LEASED, now),
+            ).fetchall()
+            conn.executemany(
+                """
+                UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, result = ?, error = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                [(FAILED, json.dumps(_expired_result(payload), ensure_ascii=False), LEASE_EXPIRED, now, job_id)
+                 for job_id, payload in expired],
+            )
+            row = conn.execute(
+                """
+                SELECT id, attempts, payload FROM jobs
+                WHERE status = ? OR (status = ? AND lease_expires < ?)
+                ORDER BY id LIMIT 1
+                """,
+                (QUEUED, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (LEASED, worker_id, now + lease_s, now, row[0]),
+            )
+            return {"id": row[0], "attempt": row[1] + 1, "record": json.loads(row[2])}
+
+        return self._transaction(run)
+
+    def renew(self, job_ids: List[int], worker_id: str, lease_s: float) -> None:
+        if not job_ids:
+            return
+        now = time.time()
+
+        def run(conn: sqlite3.Connection) -> None:
+            conn.executemany(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                [(now + lease_s, job_id, LEASED, worker_id) for job_id in job_ids],
+            )
+            conn.execute("UPDATE workers SET last_seen = ? WHERE worker_id = ?", (now, worker_id))
+
+        self._transaction(run)
+
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """
+        Records a job's result. Errors go back to the queue until the job
+        runs out of attempts. Returns False if the lease was lost meanwhile.
+        """
+
+        def run(conn: sqlite3.Connection) -> bool:
+            now = time.time()
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, LEASED, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+
+            ok = result.get("status") == "ok"
+            status = DONE if ok else FAILED if row[0] >= row[1] else QUEUED
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, result = ?, error = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (status, json.dumps(result, ensure_ascii=False), result.get("error"), now, job_id),
+            )
+            conn.execute(
+                """
+                INSERT INTO workers (worker_id, started_at, last_seen, done, failed, busy_ms) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(worker_id) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    done = done + excluded.done,
+                    failed = failed + excluded.failed,
+                    busy_ms = busy_ms + excluded.busy_ms
+                """,
+                (worker_id, now, now, int(ok), int(not ok), float(result.get("elapsed_ms") or 0)),
+            )
+            return True
+
+        return self._transaction(run)
+
+    def register_worker(self, worker_id: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO workers (worker_id, started_at, last_seen) VALUES (?, ?, ?)
+                ON CONFLICT(worker_id) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                (worker_id, now, now),
+            )
+
+    # --- reporting ---
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: n for status, n in rows}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Job counts by status plus per-worker throughput (jobs per minute over
+        the worker's lifetime, and mean time per job).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT worker_id, started_at, last_seen, done, failed, busy_ms FROM workers ORDER BY worker_id"
+            ).fetchall()
+            retried = self._conn.execute("SELECT COUNT(*) FROM jobs WHERE attempts > 1").fetchone()[0]
+
+        workers = []
+        for worker_id, started_at, last_seen, done, failed, busy_ms in rows:
+            finished = done + failed
+            minutes = max(last_seen - started_at, 1e-9) / 60
+            workers.append({
+                "worker_id": worker_id,
+                "done": done,
+                "failed": failed,
+                "jobs_per_min": round(finished / minutes, 1) if finished else 0.0,
+                "mean_ms": round(busy_ms / finished, 1) if finished else 0.0,
+                "last_seen": round(last_seen, 1),
+            })
+        return {"jobs": self.counts(), "retried": retried, "workers": workers}
+
+    def export(self, fp: IO[str], include_failed: bool = True) -> int:
+        """
+        Writes stored results as JSONL in enqueue order; returns the count.
+        """
+        statuses = (DONE, FAILED) if include_failed else (DONE,)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT result FROM jobs WHERE status IN ({','.join('?' * len(statuses))}) AND result IS NOT NULL ORDER BY id",
+                statuses,
+            ).fetchall()
+        for (result,) in rows:
+            fp.write(result + "\n")
+        return len(rows)
+
+
+# ============================================================
+# 2. Worker
+# ============================================================
+
+def run_worker(
+    queue: JobQueue,
+    screen: Callable[[Dict[str, Any]], Dict[str, Any]],
+    concurrency: int = 4,
+    worker_id: Optional[str] = None,
+    lease_s: float = 300.0,
+    poll_s: float = 2.0,
+    wait: bool = False,
+    ceiling=None,
+) -> Dict[str, int]:
+    """
+    Leases and screens jobs on `concurrency` threads until the queue has
+    nothing queued or leased (or, with wait=True, until interrupted). A
+    thread that finds nothing to lease while jobs are still leased, here or
+    by another worker, looks again as soon as one of this worker's jobs
+    finishes, or after poll_s: a failed job may go back to the queue, and an
+    expired lease makes its job leasable again. A heartbeat
+    thread renews the leases of in-flight jobs every lease_s / 3.
+    While a memory.MemoryCeiling is exceeded, only the first thread takes
+    new jobs.
+    """
+    worker_id = worker_id or default_worker_id()
+    queue.register_worker(worker_id)
+
+    in_flight: Dict[int, float] = {}
+    in_flight_lock = threading.Lock()
+    # Notified when a job of this worker finishes, or the run ends.
+    changed = threading.Condition(in_flight_lock)
+    finished = [0]
+    totals = {"done": 0, "failed": 0, "lost": 0}
+    stop = threading.Event()
+    drained = threading.Event()
+
+    def heartbeat() -> None:
+        while not stop.wait(lease_s / 3):
+            with in_flight_lock:
+                job_ids = list(in_flight)
+            queue.renew(job_ids, worker_id, lease_s)
+
+    def is_drained() -> bool:
+        # A job stays in in_flight until its completion is written, so a
+        # retry it puts back in the queue is visible before it leaves.
+        with in_flight_lock:
+            if in_flight:
+                return False
+        counts = queue.counts()
+        return not counts.get(QUEUED) and not counts.get(LEASED)
+
+    def pause(seen: int) -> None:
+        with changed:
+            if finished[0] == seen and not stop.is_set() and not drained.is_set():
+                changed.wait(poll_s)
+
+    def end(event: threading.Event) -> None:
+        event.set()
+        with changed:
+            changed.notify_all()
+
+    def loop(index: int) -> None:
+        while not stop.is_set() and not drained.is_set():
+            if ceiling is not None and index > 0 and ceiling.over():
+                ceiling.relieve()
+                stop.wait(0.5)
+                continue
+            with in_flight_lock:
+                seen = finished[0]
+            job = queue.lease(worker_id, lease_s)
+            if job is None:
+                if not wait and is_drained():
+                    end(drained)
+                    return
+                pause(seen)
+                continue
+
+            with in_flight_lock:
+                in_flight[job["id"]] = time.time()
+            try:
+                result = screen(job["record"])
+                recorded = queue.complete(job["id"], worker_id, result)
+            finally:
+                with changed:
+                    in_flight.pop(job["id"], None)
+                    finished[0] += 1
+                    changed.notify_all()
+
+            with in_flight_lock:
+                if not recorded:
+                    totals["lost"] += 1
+                else:
+                    totals["done" if result.get("status") == "ok" else "failed"] += 1
+
+    beat = threading.Thread(target=heartbeat, name="screener-lease", daemon=True)
+    beat.start()
+    threads = [threading.Thread(target=loop, args=(i,), name=f"screener-worker-{i}") for i in range(max(1, concurrency))]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        end(stop)
+        for thread in threads:
+            thread.join()
+    finally:
+        end(stop)
+    return totals
@@ -0,0 +1,46 @@
+from screener.cascade import Cascade
+from screener.checkpoint import CheckpointStore
+from screener.cli import replay_cascade
+
+
+def _scores(record):
+    return {"ats": record["ats"], "dictionary": 0, "combined": record["ats"]}
+
+
+def _screen(cascade):
+    def screen(record):
+        scores = _scores(record)
+        admitted = cascade.admit(record["id"], scores)
+        return {"id": record["id"], "status": "ok", "cascade": {"scores": scores, "admitted": admitted}}
+
+    return screen
+
+
+def test_checkpoint_rerun_keeps_report_and_redecides_top_k(tmp_path):
+    records = [
+        {"id": f"r{i}", "jd_text": "jd", "resume_text": f"resume {i}", "ats": ats}
+        for i, ats in enumerate((10, 50, 60, 70))
+    ]
+    path = str(tmp_path / "run.sqlite")
+
+    def run(batch):
+        cascade = Cascade(min_ats=20, top_k=2)
+        cascade.set_top_k_ids(cascade.rank_top_k((r["id"], _scores(r)) for r in batch))
+        store = CheckpointStore(path)
+        screen = replay_cascade(store.wrap(_screen(cascade), keep=cascade.is_final), cascade)
+        results = {r["id"]: screen(r) for r in batch}
+        store.close()
+        return results, cascade.report.as_dict()
+
+    first, report = run(records)
+    assert [r for r in first if first[r]["cascade"]["admitted"]] == ["r2", "r3"]
+    assert report["rejected_by"] == {"min_ats": 1, "top_k": 1}
+
+    again, report = run(records)
+    assert all(again[r].get("from_checkpoint") for r in ("r0", "r2", "r3"))
+    assert "from_checkpoint" not in again["r1"]
+    assert (report["candidates"], report["model_calls_saved"]) == (4, 2)
+
+    # Without r3, r1 is in the top 2 now.
+    subset, _ = run(records[:3])
+    assert subset["r1"]["cascade"]["admitted"]
@@ -0,0 +1,47 @@
+from screener.checkpoint import CheckpointStore, record_key
+from screener.clients import BACKEND_ENV, current_backend
+
+
+def test_record_key_follows_content_and_mode(tmp_path):
+    resume = tmp_path / "resume.txt"
+    resume.write_text("Python engineer")
+    by_path = {"jd_text": "Python role", "resume_path": str(resume)}
+    by_text = {"jd_text": "Python role", "resume_text": "Python engineer", "id": "other"}
+
+    assert record_key(by_path, "single") == record_key(by_text, "single")
+    assert record_key(by_text, "single") != record_key(by_text, "single:dedupe=0.85")
+    assert record_key(by_text, "single:fuzzy-ats=dictionary") != record_key(by_text, "single")
+    assert record_key({**by_text, "resume_text": "Java engineer"}, "single") != record_key(by_text, "single")
+
+
+def test_stub_backend_results_are_not_reused_by_another_backend(tmp_path, monkeypatch):
+    store = CheckpointStore(str(tmp_path / "run.sqlite"))
+    calls = []
+
+    def screen(record):
+        calls.append(current_backend())
+        return {"id": record["id"], "status": "ok", "backend": current_backend()}
+
+    checkpointed = store.wrap(screen, mode="single")
+    record = {"id": "r1", "jd_text": "Python role", "resume_text": "Python engineer"}
+
+    monkeypatch.setenv(BACKEND_ENV, "stub")
+    assert checkpointed(record)["backend"] == "stub"
+    assert checkpointed(record)["from_checkpoint"]
+
+    monkeypatch.setenv(BACKEND_ENV, "gemini")
+    result = checkpointed(record)
+    assert result["backend"] == "gemini" and "from_checkpoint" not in result
+    assert calls == ["stub", "gemini"]
+    store.close()
+
+
+def test_results_are_not_reused_across_requisitions(tmp_path):
+    store = CheckpointStore(str(tmp_path / "run.sqlite"))
+    checkpointed = store.wrap(lambda record: {"status": "ok", "requisition": record["requisition"]})
+    record = {"id": "r1", "jd_text": "Python role", "resume_text": "Python engineer", "requisition": "backend"}
+
+    assert checkpointed(record)["requisition"] == "backend"
+    assert checkpointed({**record, "id": "r2"})["from_checkpoint"]
+    assert checkpointed({**record, "requisition": "platform"}) == {"status": "ok", "requisition": "platform"}
+    store.close()
@@ -0,0 +1,18 @@
+import importlib.util
+
+import pytest
+
+from screener.columnar import ResultColumns, ResultTable
+
+
+def test_parquet_falls_back_to_npz_with_a_warning(tmp_path, monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None if name == "pyarrow" else find_spec(name))
+    columns = ResultColumns()
+    columns.add({"id": "r1", "status": "ok", "requisition": "backend", "output": {"analysis": {"overall_score": 7}}})
+
+    with pytest.warns(UserWarning, match="writing .*results.npz instead"):
+        path = columns.table().save(str(tmp_path / "results.parquet"))
+    assert path == str(tmp_path / "results.npz")
+    table = ResultTable.load(path)
+    assert len(table) == 1 and list(table.arrays["id"]) == ["r1"]
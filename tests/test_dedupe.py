@@ -0,0 +1,16 @@
+from screener.dedupe import DedupeCache
+
+JD = "Senior Python engineer with Kubernetes and PostgreSQL."
+RESUME = "Led a team of five engineers.\nBuilt Python services on Kubernetes.\nTuned PostgreSQL queries for reporting."
+EDITED = RESUME + "\nMentored two interns."
+
+
+def test_lookup_is_per_depth_and_prompt_settings():
+    cache = DedupeCache(threshold=0.5)
+    cache.remember(JD, RESUME, "r1", {"analysis": {"overall_score": 80}}, depth="full", fanout=True)
+
+    assert cache.lookup(JD, EDITED, depth="full", fanout=True)[0] == "r1"
+    assert cache.lookup(JD, EDITED, depth="full") is None
+    assert cache.lookup(JD, EDITED, depth="full", fanout=True, focused=True) is None
+    assert cache.lookup(JD, EDITED, depth="triage", fanout=True) is None
+    assert cache.lookup("Java developer", EDITED, depth="full", fanout=True) is None
@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("pypdf")
+
+from benchmarks.corpus import to_pdf
+from screener.util import extract_text_from_bytes
+from screener.workers import extract_pdf_parallel, page_ranges, warm_pool
+
+
+def _pdf(pages):
+    text = "\n".join(f"page {p} line {i} python kubernetes" for p in range(pages) for i in range(5))
+    return to_pdf(text, lines_per_page=5)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    executor = warm_pool(2)
+    yield executor
+    executor.shutdown()
+
+
+def test_page_ranges_cover_every_page_in_order():
+    for pages in (1, 5, 16, 17, 203):
+        for chunks in (1, 2, 4, 300):
+            ranges = page_ranges(pages, chunks)
+            assert ranges[0][0] == 0 and ranges[-1][1] == pages
+            assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+            assert all(start < stop for start, stop in ranges)
+
+
+def test_parallel_matches_serial(pool, tmp_path):
+    data = _pdf(24)
+    serial = extract_text_from_bytes(data, "application/pdf")
+    path = tmp_path / "big.pdf"
+    path.write_bytes(data)
+
+    assert "page 23 line 4" in serial
+    assert extract_pdf_parallel(data, pool, 2, min_pages=4) == serial
+    assert extract_pdf_parallel(str(path), pool, 2, min_pages=4) == serial
+
+
+def test_shut_down_pool_falls_back_to_serial():
+    data = _pdf(8)
+    executor = warm_pool(2)
+    executor.shutdown()
+    assert extract_pdf_parallel(data, executor, 2, min_pages=4) == extract_text_from_bytes(data, "application/pdf")
+
+
+def test_unreadable_pdf_is_empty(pool):
+    assert extract_pdf_parallel(b"%PDF-1.4 not really", pool, 2, min_pages=1) == ""
+
+
+def test_page_pool_factory_is_called_only_to_split(pool):
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return pool
+
+    small, large = _pdf(2), _pdf(8)
+    assert extract_pdf_parallel(small, factory, 2, min_pages=4) == extract_text_from_bytes(small, "application/pdf")
+    assert not calls
+    assert extract_pdf_parallel(large, factory, 2, min_pages=4) == extract_text_from_bytes(large, "application/pdf")
+    assert calls
+
+
+def test_path_without_page_pool_is_checked_once(tmp_path, monkeypatch):
+    from screener import util
+
+    data = _pdf(2)
+    expected = extract_text_from_bytes(data, "application/pdf")
+    path = tmp_path / "small.pdf"
+    path.write_bytes(data)
+    calls = []
+    monkeypatch.setattr(util, "_parallel_pdf_text", lambda source: calls.append(source))
+
+    assert util.extract_text_from_path(str(path)) == expected
+    assert calls == [str(path)]
@@ -0,0 +1,29 @@
+from screener.results import AtsResult, ScreenResult
+from screener.segments import keyword_segments, segment_resume
+from screener.util import compute_ats_keyword_analysis
+
+JD = "Senior engineer: Kubernetes, PostgreSQL, JavaScript, Python, deployment automation."
+RESUME = "Experience\nRan k8s clusters and postgres.\nWrote js and Pyhton tooling.\n\nSkills\nPython, automation"
+
+
+def _ats():
+    ats = compute_ats_keyword_analysis(JD, RESUME, fuzzy=True)
+    ats["keyword_segments"] = keyword_segments(ats["resume_keywords"], segment_resume(RESUME))
+    return ats
+
+
+def test_fuzzy_segmented_ats_round_trips():
+    ats = _ats()
+    assert ats["variant_matches"] and ats["keyword_segments"]
+    assert AtsResult.from_dict(ats).to_dict() == ats
+
+    plain = compute_ats_keyword_analysis(JD, RESUME)
+    assert AtsResult.from_dict(plain).to_dict() == plain
+
+
+def test_view_reads_like_the_dict():
+    ats = _ats()
+    view = ScreenResult.from_dict({"ats_keyword_analysis": ats}).view()["ats_keyword_analysis"]
+    assert dict(view["variant_matches"]) == ats["variant_matches"]
+    assert {segment: list(keywords) for segment, keywords in view["keyword_segments"].items()} == ats["keyword_segments"]
+    assert view.get("match_score") == ats["match_score"]
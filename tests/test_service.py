@@ -0,0 +1,29 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from screener.service import ScreeningService, make_server
+
+
+def test_analysis_timeout_answers_504():
+    service = ScreeningService(max_workers=1, timeout=0.05)
+    service._analyze = lambda *args: time.sleep(0.5) or {}
+    server = make_server("127.0.0.1", 0, service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/analyze",
+            data=json.dumps({"jd_text": "Python role", "resume_text": "Python engineer"}).encode("utf-8"),
+            method="POST",
+        )
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(request, timeout=5)
+        assert raised.value.code == 504
+        assert json.loads(raised.value.read()) == {"error": "analysis did not finish within 0.05s"}
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from screener.llm_prompts import SECTION_ORDER, merge_section_outputs
+from screener.pipeline import finalize_output_chain
+from screener.validator import validate_output
+
+JD = "Senior Python engineer: Kubernetes, PostgreSQL, leading teams."
+RESUME = "Led a team of 5 engineers.\nBuilt Python services on Kubernetes.\nTuned PostgreSQL queries."
+
+MALFORMED = [
+    {},
+    {"validation_questions": "nope", "gap_analysis": None, "resume_rewrite_suggestions": None},
+    {
+        "analysis": {"overall_score": 140, "skills_score": "7", "experience_score": None, "risk_flags": "one"},
+        "resume_rewrite_suggestions": [
+            {"original": "Built Python services on Kubernetes.", "suggestion": "Ran Python services.", "confidence": 0.9},
+            {"original": "Won a Nobel prize.", "suggestion": "Won two.", "confidence": 0.9},
+            {"original": "Tuned PostgreSQL queries.", "suggestion": "Tuned them.", "confidence": "low"},
+            "not a dict",
+        ],
+        "gap_analysis": {"missing_skills": ["Go", 3], "weak_areas": "all"},
+        "gap_analysis_text": None,
+        "validation_questions": [{"question": "Why Kubernetes?"}, None],
+    },
+]
+
+
+def _check(jd_text, resume_text, raw_output):
+    before = copy.deepcopy(raw_output)
+    expected = finalize_output_chain(jd_text, resume_text, copy.deepcopy(raw_output))
+    assert validate_output(jd_text, resume_text, raw_output) == expected
+    assert raw_output == before
+
+
+@pytest.mark.parametrize("raw_output", MALFORMED)
+def test_malformed_outputs_match_the_chain(raw_output):
+    _check(JD, RESUME, raw_output)
+
+
+def test_corpus_outputs_and_sections_match_the_chain():
+    for case in generate_corpus(seed=5, count=40, formats=["txt"]):
+        _check(case["jd_text"], case["resume_text"], case["raw_output"])
+        for section in SECTION_ORDER:
+            _check(case["jd_text"], case["resume_text"], merge_section_outputs({section: case["raw_output"]}))
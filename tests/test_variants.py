@@ -0,0 +1,33 @@
+import random
+from collections import Counter
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.variants import perturb
+from screener.variants import TOKEN, one_edit, variant_matches
+
+
+def test_aliases_inflections_and_typos_match():
+    matches = variant_matches(
+        ["kubernetes", "javascript", "deployment", "python", "golang"],
+        "Ran k8s clusters, wrote js, deployed services in Pyhton.",
+    )
+    assert matches == {"kubernetes": "k8s", "javascript": "js", "deployment": "deployed", "python": "pyhton"}
+
+
+def test_short_words_and_substitutions_are_not_typos():
+    assert variant_matches(["react", "java"], "raect jave") == {}
+    assert not one_edit("postgresq1", "postgresql")
+    assert one_edit("kubernetse", "kubernetes")
+
+
+def test_most_frequent_token_wins():
+    assert variant_matches(["kubernetes"], "kubernetse kubernetse kubernetes") == {"kubernetes": "kubernetse"}
+
+
+def test_counts_give_the_same_matches_as_text():
+    rng = random.Random(3)
+    for case in generate_corpus(seed=3, count=30, formats=["txt"]):
+        resume_text = perturb(case["resume_text"], rng)
+        keywords = sorted(set(TOKEN.findall(case["jd_text"].lower())))
+        counts = Counter(TOKEN.findall(resume_text.lower()))
+        assert variant_matches(keywords, resume_text, counts=counts) == variant_matches(keywords, resume_text)
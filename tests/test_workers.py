@@ -0,0 +1,15 @@
+from screener.workers import close_shared_pool, shared_pool
+
+
+def test_shared_pool_is_reused_and_replaced_when_shut_down():
+    try:
+        pool = shared_pool(1)
+        assert shared_pool(1) is pool
+        assert pool.submit(sum, [1, 2]).result() == 3
+
+        pool.shutdown()
+        replacement = shared_pool(1)
+        assert replacement is not pool
+        assert replacement.submit(sum, [3, 4]).result() == 7
+    finally:
+        close_shared_pool()
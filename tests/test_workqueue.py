@@ -0,0 +1,132 @@
+import io
+import json
+import threading
+import time
+
+from screener.workqueue import DONE, FAILED, QUEUED, JobQueue, run_worker
+
+
+def _records(n):
+    return [{"id": f"r{i}", "jd_text": "python engineer", "resume_text": f"resume {i}"} for i in range(n)]
+
+
+def test_lease_is_fenced_on_owner(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(1))
+
+    job = queue.lease("a", lease_s=0.05)
+    assert job["attempt"] == 1
+    assert queue.lease("b", lease_s=10) is None
+
+    time.sleep(0.1)
+    retry = queue.lease("b", lease_s=10)
+    assert retry["id"] == job["id"] and retry["attempt"] == 2
+
+    # a's lease expired and was taken over: its result is dropped.
+    assert not queue.complete(job["id"], "a", {"status": "ok"})
+    assert queue.complete(job["id"], "b", {"status": "ok"})
+    assert queue.counts() == {DONE: 1}
+    queue.close()
+
+
+def test_expired_last_attempt_is_exported_as_an_error(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(2), max_attempts=1)
+
+    queue.lease("a", lease_s=0.05)
+    time.sleep(0.1)
+    second = queue.lease("b", lease_s=10)
+    assert second["record"]["id"] == "r1"
+    assert queue.complete(second["id"], "b", {"id": "r1", "status": "ok"})
+    assert queue.counts() == {FAILED: 1, DONE: 1}
+
+    out = io.StringIO()
+    assert queue.export(out) == 2
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        {"id": "r0", "status": "error", "error": "lease expired"},
+        {"id": "r1", "status": "ok"},
+    ]
+    queue.close()
+
+
+def test_renew_keeps_the_lease(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(1))
+
+    job = queue.lease("a", lease_s=0.1)
+    queue.renew([job["id"]], "a", lease_s=10)
+    time.sleep(0.2)
+    assert queue.lease("b", lease_s=10) is None
+    assert queue.complete(job["id"], "a", {"status": "ok"})
+    queue.close()
+
+
+def test_failed_job_goes_back_to_the_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(1), max_attempts=2)
+
+    job = queue.lease("a", lease_s=10)
+    assert queue.complete(job["id"], "a", {"status": "error", "error": "boom"})
+    assert queue.counts() == {QUEUED: 1}
+    job = queue.lease("a", lease_s=10)
+    assert job["attempt"] == 2
+    assert queue.complete(job["id"], "a", {"status": "error", "error": "boom"})
+    assert queue.counts() == {"failed": 1}
+    queue.close()
+
+
+def test_run_worker_retries_requeued_job_with_concurrency(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(3))
+    seen = {}
+    lock = threading.Lock()
+
+    def screen(record):
+        with lock:
+            seen[record["id"]] = seen.get(record["id"], 0) + 1
+            first = seen[record["id"]] == 1
+        if record["id"] == "r0" and first:
+            # Slow failure: the other threads run out of jobs meanwhile.
+            time.sleep(0.3)
+            return {"id": record["id"], "status": "error", "error": "transient"}
+        return {"id": record["id"], "status": "ok"}
+
+    totals = run_worker(queue, screen, concurrency=4, worker_id="w", poll_s=0.05)
+    assert totals == {"done": 3, "failed": 1, "lost": 0}
+    assert seen["r0"] == 2
+    assert queue.counts() == {DONE: 3}
+    queue.close()
+
+
+def test_run_worker_waits_for_other_workers_leases(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(2))
+    # Another worker holds a short lease and dies without completing it.
+    queue.lease("dead", lease_s=0.3)
+
+    totals = run_worker(
+        queue, lambda record: {"id": record["id"], "status": "ok"}, concurrency=2, worker_id="w", poll_s=0.05
+    )
+    assert totals["done"] == 2
+    assert queue.counts() == {DONE: 2}
+    queue.close()
+
+
+def test_run_worker_does_not_sit_out_poll_interval(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(_records(22), max_attempts=2)
+    failed_once = set()
+
+    def screen(record):
+        time.sleep(0.01)
+        if record["id"] == "r21" and record["id"] not in failed_once:
+            failed_once.add(record["id"])
+            return {"id": record["id"], "status": "error", "error": "transient"}
+        return {"id": record["id"], "status": "ok"}
+
+    start = time.perf_counter()
+    totals = run_worker(queue, screen, concurrency=4, worker_id="w", poll_s=5.0)
+    assert time.perf_counter() - start < 2.0
+    assert totals == {"done": 22, "failed": 1, "lost": 0}
+    assert queue.counts() == {DONE: 22}
+    queue.close()